@@ -1,6 +1,50 @@
 import argparse
+import os
+import sys
+import time
+from classCacheLogs import CacheLogs
+from classCinematica import Cinematica
+from classExportacao import Exportacao
+from classFicheiroLog import FicheiroLog
+from classInterpolacaoArco import InterpolacaoArco
+from classLeituraFluxo import LeituraFluxo
+from classLeitorLogPose import LeitorLogPose
+from classLeitorLogTemperatura import LeitorLogTemperatura
+from classPerfilador import Perfilador
+from classResumoFluxo import ResumoFluxo
+from classSeguidorLog import SeguidorLog
+from classSincronizacao import Sincronizacao
 from classTrajetoria import Trajetoria
 from classTemperatura import Temperatura
+from classVistaAoVivo import VistaAoVivo
+
+def ImprimirResumo(resumo):
+    """
+    Imprime o resumo cinemático de uma trajetória.
+
+    Parâmetros:
+        resumo (dict): Resumo devolvido por Cinematica.Resumo ou por ResumoFluxo.Resumo (este sem as
+            reduções que precisam da trajetória inteira, mas com as das temperaturas).
+    """
+    print(f"Número de pontos: {resumo['numeroPontos']}")
+    if resumo['numeroPontos'] == 0:
+        return
+    print(f"Duração: {resumo['duracao']:.3f} s")
+    print(f"Distância percorrida: {resumo['comprimento']:.3f} m")
+    if 'rapidezMaxima' in resumo:
+        print(f"Rapidez média: {resumo['rapidezMedia']:.3f} m/s, máxima: {resumo['rapidezMaxima']:.3f} m/s")
+        print(f"Aceleração máxima: {resumo['aceleracaoMaxima']:.3f} m/s^2")
+        print(f"Velocidade angular máxima: {resumo['velocidadeAngularMaxima']:.3f} rad/s")
+        print(f"Tempo parado: {resumo['tempoParado']:.3f} s")
+    else:
+        print(f"Rapidez média: {resumo['rapidezMedia']:.3f} m/s")
+    minimo = ", ".join(f"{v:.3f}" for v in resumo['caixaMinima'])
+    maximo = ", ".join(f"{v:.3f}" for v in resumo['caixaMaxima'])
+    print(f"Limites: [{minimo}] a [{maximo}] m")
+    if 'numeroTemperaturas' in resumo:
+        print(f"Temperaturas: {resumo['numeroTemperaturas']}, mínima: {resumo['temperaturaMinima']:.3f} °C, "
+              f"máxima: {resumo['temperaturaMaxima']:.3f} °C, média: {resumo['temperaturaMedia']:.3f} °C, "
+              f"variância: {resumo['temperaturaVariancia']:.4f}")
 
 def main():
     """
@@ -15,6 +59,8 @@ def main():
     Exemplo de execução no terminal (linha de comando):
         $ python script.py --log caminho/para/o/log.txt
         $ python script.py --log caminho/para/o/log.txt --f 5
+        $ python script.py --logPose voo.txt --output voo.png --vistas 3d topo lado --dpi 150
+        $ python script.py exportar --logPose voo.txt --logTemp temp.txt --destino dados --formato npz
 
         - No exemplo mostrado, o ficheiro de log está localizado em "caminho/para/o/log.txt".
         - A frequência com que os vetores de orientação são mostrados na trajetória
@@ -26,15 +72,122 @@ def main():
     Argumentos da linha de comando:
     -------------------------------
     --logPose : str (obrigatório)
-        Especifica o caminho para o ficheiro de log de trajetória.
+        Especifica o caminho para o ficheiro de log de trajetória. Os ficheiros
+        comprimidos com gzip, bzip2, xz ou zstd (este último com o pacote
+        zstandard) são reconhecidos pelo conteúdo e lidos sem os descomprimir
+        para o disco; o mesmo se aplica a --logTemp.
 
-    --logTemp : str (opcional)
-        Especifica o caminho para o ficheiro de log da temperatura.
+    --logTemp : str [str ...] (opcional)
+        Especifica o caminho para o ficheiro de log da temperatura. Com vários
+        ficheiros (por exemplo, um por sonda), as medições de todos são
+        intercaladas por ordem de tempo (ver Temperatura.ReadLogsTemperatura).
 
     --f : int, (opcional)
         Define a frequência de com que os vetores de orientação são desenhados
         no gráfico. (default = 1).
 
+    --processos : int, (opcional)
+        Número de processos usados na leitura dos ficheiros de log. Só os
+        ficheiros grandes são divididos entre processos. (default = 1).
+
+    --pontos : int, (opcional)
+        Número máximo de pontos desenhados por série (trajetória, temperaturas).
+        Acima deste número os pontos são decimados, preservando a forma da
+        trajetória e os extremos de temperatura; 0 desliga a decimação. (default = 50000).
+
+    --tolerancia : int, (opcional)
+        Diferença máxima, em nanosegundos, entre o instante de uma pose e o da
+        temperatura que lhe é associada. (default = 5000).
+
+    --interpolacao : str, (opcional)
+        Método de interpolação das temperaturas ao longo da trajetória: linear,
+        pchip (cúbica monótona, sem oscilações) ou cubica (spline natural). A
+        interpolação é feita uma só vez sobre o comprimento de arco de todos os
+        pontos com temperatura. (default = pchip).
+
+    --amostrasSegmento : int, (opcional)
+        Número de pontos interpolados em cada segmento entre dois pontos com
+        temperatura. (default = 10).
+
+    --passoDistancia : float, (opcional)
+        Em vez de --amostrasSegmento, um ponto interpolado a cada passoDistancia
+        metros ao longo da trajetória.
+
+    --passoTempo : float, (opcional)
+        Em vez de --amostrasSegmento, um ponto interpolado a cada passoTempo
+        segundos.
+
+    --resumo : (opcional)
+        Imprime o resumo cinemático da trajetória (duração, distância percorrida,
+        rapidez, aceleração e velocidade angular máximas, tempo parado e limites).
+
+    --semGrafico : (opcional)
+        Não desenha nem guarda a figura (útil com --resumo).
+
+    --output : str, (opcional)
+        Em vez de abrir a janela interativa, guarda a figura neste ficheiro. O
+        formato (png, svg, pdf) é dado pela extensão. Com várias vistas, cada
+        ficheiro recebe o sufixo da vista (por exemplo voo_topo.png).
+
+    --vistas : str, (opcional)
+        Vistas guardadas com --output: 3d, topo e/ou lado. (default = 3d).
+
+    --dpi : int, (opcional)
+        Resolução das imagens guardadas com --output. (default = 100).
+
+    --tamanho : float float, (opcional)
+        Largura e altura, em polegadas, das imagens guardadas com --output.
+
+    --semCache : (opcional)
+        Lê sempre os ficheiros de log, sem usar nem escrever a cache binária.
+
+    --ordenar : (opcional)
+        Ordena as mensagens de cada ficheiro por tempo (de forma estável) e remove
+        as duplicadas. Sem esta opção, a integridade dos ficheiros (lacunas de seq,
+        duplicadas, instantes fora de ordem) é só verificada e indicada.
+
+    --reconstruirCache : (opcional)
+        Ignora as entradas existentes na cache e volta a escrevê-las.
+
+    --dirCache : str, (opcional)
+        Pasta da cache binária dos ficheiros de log lidos. (default = .cache_logs).
+
+    --follow : (opcional)
+        Segue os ficheiros de log enquanto continuam a ser escritos (por exemplo,
+        durante o voo): as mensagens novas são lidas à medida que são acrescentadas
+        e a figura é atualizada, até a janela ser fechada ou até Ctrl+C. A memória
+        e o custo de cada atualização ficam limitados por --pontos. Com --semGrafico
+        só imprime o número de poses recebidas. Não se aplica a ficheiros comprimidos
+        nem a --output.
+
+    --intervalo : float, (opcional)
+        Com --follow, intervalo em segundos entre as leituras e as atualizações
+        da figura. (default = 0.5).
+
+    --fluxo : (opcional)
+        Lê os ficheiros de log por pedaços, com memória limitada, para ficheiros
+        maiores do que a memória disponível (ver LeituraFluxo): o resumo (distância,
+        limites e estatísticas das temperaturas) e os pontos desenhados, limitados
+        por --pontos, são calculados pedaço a pedaço. Não usa a cache nem se aplica
+        a --ordenar ou --follow.
+
+    --profile : str, (opcional)
+        Mede o tempo de parede, o tempo de CPU, o número de itens e o pico de
+        memória de cada etapa (validação, leitura, associação, interpolação,
+        criação da figura, ...). Sem valor, imprime uma tabela no fim; com o
+        caminho de um ficheiro, guarda os resultados nesse ficheiro em JSON.
+
+    --profileSemMemoria : (opcional)
+        Com --profile, não mede a memória (o tracemalloc torna a execução mais
+        lenta e altera os tempos medidos).
+
+    Subcomando exportar:
+    --------------------
+    Com "exportar" como primeiro argumento, os ficheiros de log são lidos e as
+    colunas (seq, instante em nanosegundos, frame_id, posição x, y, z,
+    quaternião w, x, y, z ou temperatura e variância) são exportadas para
+    ficheiros Parquet ou NumPy, sem desenhar a figura (ver MainExportar).
+
     Exceções:
     ---------
     FileNotFoundError:
@@ -42,63 +195,393 @@ def main():
         ficheiro não existir nesse caminho.
 
     IOError:
-        Ocorre se o ficheiro de log não pode ser lido .
+        Ocorre se o ficheiro de log não pode ser lido ou descomprimido.
 
     Retorna:
     --------
     NULL
     """
 
+    if len(sys.argv) > 1 and sys.argv[1] == 'exportar':
+        MainExportar(sys.argv[2:])
+        return
+
     # Usando argparse para lidar com os argumentos
-    parser = argparse.ArgumentParser(description='Processar informações de trajetória de um drone.')
+    prog = os.path.basename(sys.argv[0])
+    parser = argparse.ArgumentParser(description='Processar informações de trajetória de um drone.',
+                                     epilog=f"Subcomando: '{prog} exportar' exporta as colunas dos ficheiros de log "
+                                            f"para Parquet ou NPZ (ver '{prog} exportar --help').")
 
     # Adicionar os argumentos
     parser.add_argument('--logPose', required=True, type=str, help='Caminho para o ficheiro de log de trajetória.')
-    parser.add_argument('--logTemp', type=str, default="", help='Caminho para o ficheiro de log de temperatura (opcional).')
+    parser.add_argument('--logTemp', type=str, nargs='+', default=[], help='Caminho para o(s) ficheiro(s) de log de temperatura (opcional).')
     parser.add_argument('--f', type=int, default=1, help='Frequência com que os vetores de orientação são desenhados no gráfico. (default = 1).')
+    parser.add_argument('--processos', type=int, default=1, help='Número de processos usados na leitura dos ficheiros de log grandes. (default = 1).')
+    parser.add_argument('--pontos', type=int, default=50000, help='Número máximo de pontos desenhados por série; 0 desliga a decimação. (default = 50000).')
+    parser.add_argument('--tolerancia', type=int, default=5000, help='Diferença máxima (ns) entre uma pose e a temperatura associada. (default = 5000).')
+    parser.add_argument('--interpolacao', choices=list(InterpolacaoArco.METODOS), default='pchip', help='Método de interpolação das temperaturas. (default = pchip).')
+    parser.add_argument('--amostrasSegmento', type=int, default=10, help='Pontos interpolados por segmento. (default = 10).')
+    passos = parser.add_mutually_exclusive_group()
+    passos.add_argument('--passoDistancia', type=float, help='Distância (m) entre pontos interpolados, em vez de --amostrasSegmento.')
+    passos.add_argument('--passoTempo', type=float, help='Intervalo (s) entre pontos interpolados, em vez de --amostrasSegmento.')
+    parser.add_argument('--resumo', action='store_true', help='Imprimir o resumo cinemático da trajetória.')
+    parser.add_argument('--semGrafico', action='store_true', help='Não desenhar nem guardar a figura.')
+    parser.add_argument('--output', type=str, default="", help='Guardar a figura neste ficheiro (png, svg, pdf) em vez de a mostrar.')
+    parser.add_argument('--vistas', nargs='+', choices=list(Trajetoria.VISTAS), default=['3d'], help='Vistas guardadas com --output. (default = 3d).')
+    parser.add_argument('--dpi', type=int, default=100, help='Resolução das imagens guardadas com --output. (default = 100).')
+    parser.add_argument('--tamanho', nargs=2, type=float, metavar=('LARGURA', 'ALTURA'), help='Largura e altura (polegadas) das imagens guardadas com --output.')
+    parser.add_argument('--semCache', action='store_true', help='Não usar a cache binária dos ficheiros de log.')
+    parser.add_argument('--ordenar', action='store_true', help='Ordenar as mensagens por tempo e remover as duplicadas.')
+    parser.add_argument('--reconstruirCache', action='store_true', help='Reconstruir a cache binária dos ficheiros de log.')
+    parser.add_argument('--dirCache', type=str, default=".cache_logs", help='Pasta da cache binária dos ficheiros de log. (default = .cache_logs).')
+    parser.add_argument('--follow', action='store_true', help='Seguir os ficheiros de log enquanto são escritos e atualizar a figura.')
+    parser.add_argument('--intervalo', type=float, default=0.5, help='Com --follow, segundos entre atualizações. (default = 0.5).')
+    parser.add_argument('--fluxo', action='store_true', help='Ler os ficheiros de log por pedaços, com memória limitada.')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FICHEIRO', help='Medir cada etapa e imprimir uma tabela ou, se for dado um ficheiro, guardar em JSON.')
+    parser.add_argument('--profileSemMemoria', action='store_true', help='Com --profile, não medir a memória de cada etapa.')
 
     # Parse dos argumentos recebidos na linha de comando
     args = parser.parse_args()
 
-    # Verifica se o caminho do ficheiro é válido para o logPose
-    try:
-        with open(args.logPose, 'r') as file:
-            pass
-    except FileNotFoundError:
-        print("Erro: O caminho do ficheiro fornecido para logPose não é válido ou o ficheiro não existe.")
+    if args.profile is None:
+        Processar(args)
         return
-    except IOError:
-        print("Erro: O ficheiro logPose não pôde ser lido.")
+
+    Perfilador.Ativar(not args.profileSemMemoria)
+    try:
+        with Perfilador.Etapa('total'):
+            Processar(args)
+    finally:
+        perfilador = Perfilador.Desativar()
+        if args.profile == '-':
+            perfilador.ImprimirTabela()
+        else:
+            perfilador.GuardarJson(args.profile)
+            print(f"Perfil guardado em {args.profile}")
+
+def MainExportar(argv):
+    """
+    Subcomando exportar: lê os ficheiros de log e exporta as colunas para ficheiros colunares.
+
+    Exemplo de execução:
+        $ python script.py exportar --logPose logs/drone1.txt --logTemp logs/temperature_drone.txt --destino dados
+
+        - São criados dados/drone1.parquet e dados/temperature_drone.parquet, que podem
+          ser lidos com Exportacao.Carregar ou com Trajetoria.Importar e Temperatura.Importar.
+
+    Argumentos da linha de comando:
+        --logPose : str (obrigatório). Ficheiro de log de trajetória.
+        --logTemp : str [str ...] (opcional). Ficheiro(s) de log de temperatura; vários ficheiros são
+            intercalados por ordem de tempo e exportados para <logPose>_temperaturas.<formato>.
+        --destino : str (opcional). Pasta dos ficheiros exportados (default = .).
+        --formato : str (opcional). parquet (requer pyarrow) ou npz (default = parquet).
+        --linhasPorGrupo : int (opcional). Linhas de cada grupo de linhas do Parquet (default = 1000000).
+        --sincronizar : float (opcional). Exporta também a tabela sincronizada (ver Sincronizacao) numa
+            grade de tempo com este passo, em segundos, para <logPose>_sincronizado.<formato>.
+        --fluxo : (opcional). Lê e exporta os ficheiros por pedaços, com memória limitada (só no formato
+            parquet e sem --sincronizar nem --ordenar, que precisam de todos os dados).
+        --processos, --semCache, --reconstruirCache, --dirCache, --ordenar : como no comando principal.
+
+    Parâmetros:
+        argv (list): Argumentos da linha de comando a seguir a "exportar".
+    """
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} exportar", description='Exportar as colunas dos ficheiros de log para Parquet ou NPZ.')
+    parser.add_argument('--logPose', required=True, type=str, help='Caminho para o ficheiro de log de trajetória.')
+    parser.add_argument('--logTemp', type=str, nargs='+', default=[], help='Caminho para o(s) ficheiro(s) de log de temperatura (opcional).')
+    parser.add_argument('--destino', type=str, default=".", help='Pasta dos ficheiros exportados. (default = .).')
+    parser.add_argument('--formato', choices=['parquet', 'npz'], default='parquet', help='Formato dos ficheiros exportados. (default = parquet).')
+    parser.add_argument('--linhasPorGrupo', type=int, default=Exportacao.LINHAS_POR_GRUPO, help='Linhas de cada grupo de linhas do Parquet. (default = 1000000).')
+    parser.add_argument('--sincronizar', type=float, metavar='PASSO', help='Exportar também as séries sincronizadas numa grade com este passo (s).')
+    parser.add_argument('--fluxo', action='store_true', help='Ler e exportar os ficheiros por pedaços, com memória limitada (só parquet).')
+    parser.add_argument('--processos', type=int, default=1, help='Número de processos usados na leitura dos ficheiros de log grandes. (default = 1).')
+    parser.add_argument('--semCache', action='store_true', help='Não usar a cache binária dos ficheiros de log.')
+    parser.add_argument('--ordenar', action='store_true', help='Ordenar as mensagens por tempo e remover as duplicadas.')
+    parser.add_argument('--reconstruirCache', action='store_true', help='Reconstruir a cache binária dos ficheiros de log.')
+    parser.add_argument('--dirCache', type=str, default=".cache_logs", help='Pasta da cache binária dos ficheiros de log. (default = .cache_logs).')
+    args = parser.parse_args(argv)
+    if args.sincronizar is not None and args.sincronizar <= 0:
+        parser.error("--sincronizar tem de ser positivo")
+    if args.fluxo and (args.formato != 'parquet' or args.sincronizar is not None or args.ordenar):
+        parser.error("--fluxo só pode ser usado com o formato parquet, sem --sincronizar nem --ordenar")
+
+    for opcao, pathFile in [('logPose', args.logPose)] + [('logTemp', pathFile) for pathFile in args.logTemp]:
+        try:
+            FicheiroLog.Validar(pathFile)
+        except FileNotFoundError:
+            print(f"Erro: O caminho do ficheiro fornecido para {opcao} não é válido ou o ficheiro não existe.")
+            return
+        except IOError:
+            print(f"Erro: O ficheiro {opcao} não pôde ser lido.")
+            return
+        except ImportError as erro:
+            print(f"Erro: {erro}")
+            return
+
+    def Nome(pathFile):
+        # Nome do ficheiro de log sem as extensões (voo.txt.gz -> voo)
+        return os.path.basename(pathFile).split(".")[0].strip()
+
+    os.makedirs(args.destino, exist_ok=True)
+    nomeTemperatura = Nome(args.logTemp[0]) if len(args.logTemp) == 1 else f"{Nome(args.logPose)}_temperaturas"
+    if args.fluxo:
+        try:
+            ExportarFluxo(args, os.path.join(args.destino, f"{Nome(args.logPose)}.{args.formato}"),
+                          os.path.join(args.destino, f"{nomeTemperatura}.{args.formato}"))
+        except ImportError as erro:
+            print(f"Erro: {erro}")
         return
 
-    # Verifica se o caminho do ficheiro é válido para o logTemp (caso seja fornecido)
+    cache = None if args.semCache else CacheLogs(args.dirCache, args.reconstruirCache)
+    try:
+        trajetoria = Trajetoria()
+        trajetoria._nome = Nome(args.logPose)
+        trajetoria.ReadLogTrajetoria(args.logPose, args.processos, cache, args.ordenar)
+        destino = os.path.join(args.destino, f"{trajetoria._nome}.{args.formato}")
+        trajetoria.Exportar(destino, args.linhasPorGrupo)
+        print(f"Exportado para {destino}")
+
+        temperatura = None
+        if args.logTemp:
+            temperatura = Temperatura()
+            temperatura._nome = nomeTemperatura
+            temperatura.ReadLogsTemperatura(args.logTemp, args.processos, cache, args.ordenar)
+            destino = os.path.join(args.destino, f"{temperatura._nome}.{args.formato}")
+            temperatura.Exportar(destino, args.linhasPorGrupo)
+            print(f"Exportado para {destino}")
+
+        if args.sincronizar is not None:
+            tabela = Sincronizacao(trajetoria, temperatura).NaGrade(int(round(args.sincronizar * 1e9)))
+            destino = os.path.join(args.destino, f"{trajetoria._nome}_sincronizado.{args.formato}")
+            with Exportacao(destino, 'sincronizacao', args.linhasPorGrupo) as exportacao:
+                exportacao.Acrescentar(tabela)
+            print(f"Exportado para {destino} ({len(tabela['tempoNs'])} instantes)")
+    except ImportError as erro:
+        print(f"Erro: {erro}")
+
+def ExportarFluxo(args, destinoPose, destinoTemperatura):
+    """
+    Exporta os ficheiros de log lidos por pedaços (exportar --fluxo): cada pedaço é acrescentado
+    ao ficheiro Parquet assim que é lido, por isso a memória usada não depende do tamanho dos logs.
+
+    Parâmetros:
+        args (argparse.Namespace): Argumentos recebidos por MainExportar.
+        destinoPose (str): Ficheiro de saída da trajetória.
+        destinoTemperatura (str): Ficheiro de saída das temperaturas (só usado com --logTemp).
+    """
+    leitura = LeituraFluxo(args.logPose, args.logTemp)
+    exportacoes = {'pose': Exportacao(destinoPose, 'trajetoria', args.linhasPorGrupo)}
+    if args.logTemp:
+        exportacoes['temperatura'] = Exportacao(destinoTemperatura, 'temperatura', args.linhasPorGrupo)
+    with Perfilador.Etapa('exportarFluxo') as etapa:
+        for tipo, colunas in leitura:
+            exportacoes[tipo].Acrescentar(colunas)
+        for exportacao in exportacoes.values():
+            exportacao.Fechar()
+        etapa.itens = leitura.contagemPose[1] + sum(total for _, total in leitura.contagensTemperatura)
+
+    ImprimirLeituraFluxo(leitura)
+    print(f"Exportado para {destinoPose}")
     if args.logTemp:
+        print(f"Exportado para {destinoTemperatura}")
+
+def Processar(args):
+    """
+    Valida e lê os ficheiros de log e desenha ou guarda a figura, segundo os argumentos da linha de comando.
+
+    Parâmetros:
+        args (argparse.Namespace): Argumentos recebidos por main.
+    """
+    with Perfilador.Etapa('validarFicheiros'):
+        # Verifica se o caminho do ficheiro é válido para o logPose
         try:
-            with open(args.logTemp, 'r') as file:
-                pass
+            FicheiroLog.Validar(args.logPose)
         except FileNotFoundError:
-            print("Erro: O caminho do ficheiro fornecido para logTemp não é válido ou o ficheiro não existe.")
+            print("Erro: O caminho do ficheiro fornecido para logPose não é válido ou o ficheiro não existe.")
             return
         except IOError:
-            print("Erro: O ficheiro logTemp não pôde ser lido.")
+            print("Erro: O ficheiro logPose não pôde ser lido.")
             return
+        except ImportError as erro:
+            print(f"Erro: {erro}")
+            return
+
+        # Verifica se os caminhos dos ficheiros são válidos para o logTemp (caso sejam fornecidos)
+        for pathFile in args.logTemp:
+            try:
+                FicheiroLog.Validar(pathFile)
+            except FileNotFoundError:
+                print("Erro: O caminho do ficheiro fornecido para logTemp não é válido ou o ficheiro não existe.")
+                return
+            except IOError:
+                print("Erro: O ficheiro logTemp não pôde ser lido.")
+                return
+            except ImportError as erro:
+                print(f"Erro: {erro}")
+                return
+
+    if args.fluxo:
+        ProcessarFluxo(args)
+        return
+
+    if args.follow:
+        Seguir(args)
+        return
+
+    # Cache binária das colunas lidas dos ficheiros de log
+    cache = None if args.semCache else CacheLogs(args.dirCache, args.reconstruirCache)
 
     # Inicializa a trajetória, lê o ficheiro log e cria os objetos
-    trajetoria = Trajetoria(args.f)
-    trajetoria.ReadLogTrajetoria(args.logPose)
+    try:
+        interpolacao = InterpolacaoArco(args.interpolacao, args.amostrasSegmento, args.passoDistancia, args.passoTempo)
+    except ValueError as erro:
+        print(f"Erro: {erro}")
+        return
+    trajetoria = Trajetoria(args.f, args.pontos, interpolacao)
+    trajetoria.ReadLogTrajetoria(args.logPose, args.processos, cache, args.ordenar)
     nome = args.logPose.split("/")[1].strip()
     nome = nome.split(".")[0].strip()
     trajetoria._nome = nome
 
-    if not args.logTemp:
-        # Desenha os pontos da trajetória com os respetivos vetores orientação
-        trajetoria.PlotTrajetoria()
-    else:
+    temperatura = None
+    if args.logTemp:
         temperatura = Temperatura()
         temperatura._nome = trajetoria._nome
-        temperatura.ReadLogTempratura(args.logTemp)
-        trajetoria.PlotTrajetoria(temperatura._pontosTemperatura)
+        temperatura.ReadLogsTemperatura(args.logTemp, args.processos, cache, args.ordenar)
+
+    if args.resumo:
+        with Perfilador.Etapa('resumo', len(trajetoria.tempoNs)):
+            ImprimirResumo(Cinematica(trajetoria).Resumo())
+
+    if args.semGrafico:
+        # Só leitura (e resumo, se pedido), sem figura
+        print("-- END --")
+        return
+
+    if args.output:
+        # Sem janelas: backend não interativo e uma imagem por vista, a partir dos mesmos dados lidos
+        import matplotlib
+        matplotlib.use('Agg')
+        with Perfilador.Etapa('guardarFiguras', len(args.vistas)):
+            ficheiros = trajetoria.GuardarFiguras(args.output, temperatura, args.tolerancia, args.vistas, args.dpi, args.tamanho)
+        for ficheiro in ficheiros:
+            print(f"Figura guardada em {ficheiro}")
+    else:
+        # Desenha os pontos da trajetória com os respetivos vetores orientação
+        with Perfilador.Etapa('plotTrajetoria'):
+            trajetoria.PlotTrajetoria(temperatura, args.tolerancia)
+
+    print("-- END --")
+
+def ProcessarFluxo(args):
+    """
+    Lê os ficheiros de log por pedaços, com memória limitada, e calcula o resumo e a figura
+    pedaço a pedaço (--fluxo).
+
+    Parâmetros:
+        args (argparse.Namespace): Argumentos recebidos por main.
+    """
+    if args.follow or args.ordenar:
+        print("Erro: --fluxo não pode ser usado com --follow nem com --ordenar.")
+        return
+
+    leitura = LeituraFluxo(args.logPose, args.logTemp)
+    resumo = ResumoFluxo()
+    vista = VistaAoVivo(os.path.basename(args.logPose).split(".")[0].strip(), args.f, args.pontos, args.tolerancia)
+    consumidores = {'pose': (resumo.AcrescentarPoses, vista.AcrescentarPoses),
+                    'temperatura': (resumo.AcrescentarTemperaturas, vista.AcrescentarTemperaturas)}
+    with Perfilador.Etapa('lerFluxo') as etapa:
+        for tipo, colunas in leitura:
+            for acrescentar in consumidores[tipo]:
+                acrescentar(colunas)
+        etapa.itens = resumo.countPoses + resumo.countTemperaturas
+
+    ImprimirLeituraFluxo(leitura)
+    ImprimirResumo(resumo.Resumo())
+
+    if args.semGrafico:
+        print("-- END --")
+        return
+
+    if args.output:
+        import matplotlib
+        matplotlib.use('Agg')
+        with Perfilador.Etapa('guardarFiguras', len(args.vistas)):
+            ficheiros = vista.GuardarFiguras(args.output, args.vistas, args.dpi, args.tamanho)
+        for ficheiro in ficheiros:
+            print(f"Figura guardada em {ficheiro}")
+    else:
+        from matplotlib import pyplot as plt
+        vista.CriarFigura(args.tamanho)
+        vista.Atualizar()
+        with Perfilador.Etapa('mostrar'):
+            plt.show()
+
+    print("-- END --")
+
+def ImprimirLeituraFluxo(leitura):
+    """
+    Imprime o número de mensagens lidas e o relatório de integridade de cada ficheiro de uma leitura por pedaços.
+
+    Parâmetros:
+        leitura (LeituraFluxo): Leitura terminada.
+    """
+    countPontosValidos, countPontosTotal = leitura.contagemPose
+    print(f"Trajetórias do ficheiro {leitura.integridadePose.nome}, número de pontos válidos: {countPontosValidos} de {countPontosTotal}")
+    print(leitura.integridadePose.Relatorio())
+    for integridade, (countPontosValidos, countTemperaturas) in zip(leitura.integridadesTemperatura, leitura.contagensTemperatura):
+        print(f"Temperaturas do ficheiro {integridade.nome}, número de pontos válidos: {countPontosValidos} de {countTemperaturas}")
+        print(integridade.Relatorio())
+
+def Seguir(args):
+    """
+    Segue os ficheiros de log enquanto são escritos e atualiza a figura com as mensagens novas (--follow).
+
+    Parâmetros:
+        args (argparse.Namespace): Argumentos recebidos por main.
+    """
+    if args.output:
+        print("Erro: --follow não pode ser usado com --output.")
+        return
+
+    vista = VistaAoVivo(os.path.basename(args.logPose).split(".")[0].strip(), args.f, args.pontos, args.tolerancia)
+    try:
+        seguidores = [(SeguidorLog(LeitorLogPose(), args.logPose), vista.AcrescentarPoses)]
+        for pathFile in args.logTemp:
+            seguidores.append((SeguidorLog(LeitorLogTemperatura(), pathFile), vista.AcrescentarTemperaturas))
+    except IOError as erro:
+        print(f"Erro: {erro}")
+        return
+
+    figura = None
+    if not args.semGrafico:
+        from matplotlib import pyplot as plt
+        figura = vista.CriarFigura()
+        plt.show(block=False)
+
+    intervalo = max(args.intervalo, 0.05)
+    try:
+        while figura is None or plt.fignum_exists(figura.number):
+            novas = 0
+            with Perfilador.Etapa('lerNovas') as etapa:
+                for seguidor, acrescentar in seguidores:
+                    resultado = seguidor.LerNovas()
+                    if resultado is not None:
+                        acrescentar(resultado[0])
+                        novas += resultado[2]
+                etapa.itens = novas
+
+            if figura is None:
+                if novas:
+                    print(f"Poses recebidas: {vista.countPoses}, com temperatura: {vista.countTemperaturas}")
+                time.sleep(intervalo)
+            else:
+                if novas:
+                    vista.Atualizar()
+                plt.pause(intervalo)
+    except KeyboardInterrupt:
+        pass
 
+    print(f"Poses recebidas: {vista.countPoses}, com temperatura: {vista.countTemperaturas}")
     print("-- END --")
 
 if __name__ == "__main__":
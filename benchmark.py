@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from classAssociacaoTemporal import AssociacaoTemporal
+from classGeradorLogs import GeradorLogs
+from classTemperatura import Temperatura
+from classTrajetoria import Trajetoria
+
+# Etapas medidas, pela ordem de execução; 'temperaturas' (PlotTemperaturas completo) só corre se for pedida
+ETAPAS = ('gerar', 'lerPose', 'lerTemperatura', 'associacao', 'orientacoes', 'temperaturas')
+ETAPAS_POR_OMISSAO = ('gerar', 'lerPose', 'lerTemperatura', 'associacao', 'orientacoes')
+
+def Medir(funcao, repeticoes, medirMemoria):
+    """
+    Mede uma etapa: o menor tempo de parede em várias repetições e, numa execução à parte
+    (porque o tracemalloc atrasa o código), o pico de memória alocada.
+
+    Parâmetros:
+        funcao (callable): Etapa a medir, sem argumentos.
+        repeticoes (int): Número de execuções cronometradas.
+        medirMemoria (bool): Se verdadeiro, mede também o pico de memória.
+
+    Retorna:
+        tuple: (tempo em segundos, pico de memória em bytes ou None, resultado da última execução).
+    """
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    pico = None
+    if medirMemoria:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return min(tempos), pico, resultado
+
+def Revisao():
+    """Devolve o commit atual do repositório git, ou None se não estiver disponível."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def CorrerTamanho(n, args, diretorio):
+    """
+    Gera os logs com n mensagens e mede cada etapa pedida.
+
+    Retorna:
+        list: Um dicionário por etapa, com o tempo, o débito e o pico de memória.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+
+    pathPose = os.path.join(diretorio, f"pose_{n}.txt")
+    pathTemperatura = os.path.join(diretorio, f"temperatura_{n}.txt")
+    gerador = GeradorLogs(args.semente, args.corrupcao, args.jitter)
+    dados = {}
+
+    def Gerar():
+        gerador.EscreverPose(pathPose, n)
+        gerador.EscreverTemperatura(pathTemperatura, n)
+
+    def LerPose():
+        trajetoria = Trajetoria(args.f)
+        trajetoria.ReadLogTrajetoria(pathPose, args.processos)
+        return trajetoria
+
+    def LerTemperatura():
+        temperatura = Temperatura()
+        temperatura.ReadLogTempratura(pathTemperatura, args.processos)
+        return temperatura
+
+    def Associacao():
+        return AssociacaoTemporal(args.tolerancia).Associar(dados['trajetoria'].tempoNs, dados['temperatura'].tempoNs)
+
+    def Orientacoes():
+        figura = plt.figure()
+        eixo = figura.add_subplot(111, projection='3d')
+        dados['trajetoria'].PlotOrientacoes(eixo)
+        figura.canvas.draw()
+        plt.close(figura)
+
+    def Temperaturas():
+        figura = plt.figure()
+        eixo = figura.add_subplot(111, projection='3d')
+        dados['trajetoria'].PlotTemperaturas(eixo, dados['temperatura'], args.tolerancia, interativo=False)
+        figura.canvas.draw()
+        plt.close(figura)
+
+    funcoes = {
+        'gerar': Gerar, 'lerPose': LerPose, 'lerTemperatura': LerTemperatura,
+        'associacao': Associacao, 'orientacoes': Orientacoes, 'temperaturas': Temperaturas,
+    }
+
+    # A leitura é necessária às etapas seguintes, mesmo que não seja medida
+    precisaLeitura = any(etapa in args.etapas for etapa in ('associacao', 'orientacoes', 'temperaturas'))
+    resultados = []
+    for etapa in ETAPAS:
+        if etapa not in args.etapas:
+            if etapa == 'gerar':
+                Gerar()
+            elif etapa == 'lerPose' and precisaLeitura:
+                dados['trajetoria'] = LerPose()
+            elif etapa == 'lerTemperatura' and precisaLeitura:
+                dados['temperatura'] = LerTemperatura()
+            continue
+
+        tempo, pico, resultado = Medir(funcoes[etapa], args.repeticoes, not args.semMemoria)
+        if etapa == 'lerPose':
+            dados['trajetoria'] = resultado
+        elif etapa == 'lerTemperatura':
+            dados['temperatura'] = resultado
+
+        resultados.append({
+            'mensagens': n,
+            'etapa': etapa,
+            'tempo': tempo,
+            'mensagensPorSegundo': n / tempo if tempo > 0 else None,
+            'picoMemoria': pico,
+        })
+        pico = "-" if pico is None else f"{pico / 2 ** 20:.1f} MiB"
+        print(f"{n:>11} {etapa:<15} {tempo:10.4f} s {n / tempo if tempo > 0 else float('inf'):14.0f} msg/s  {pico}")
+
+    return resultados
+
+def Comparar(resultados, pathAnterior):
+    """Imprime a razão entre os tempos atuais e os de um ficheiro de resultados anterior."""
+    with open(pathAnterior, 'r', encoding='utf-8') as f:
+        anterior = json.load(f)
+    tempos = {(r['mensagens'], r['etapa']): r['tempo'] for r in anterior['resultados']}
+
+    print(f"\nComparação com {pathAnterior} (revisão {anterior.get('revisao')}): tempo atual / tempo anterior")
+    for r in resultados:
+        chave = (r['mensagens'], r['etapa'])
+        if chave in tempos and tempos[chave] > 0:
+            print(f"{r['mensagens']:>11} {r['etapa']:<15} {r['tempo'] / tempos[chave]:8.2f}x")
+
+def main():
+    """
+    Mede o desempenho das etapas de processamento sobre logs sintéticos de vários tamanhos
+    e guarda os resultados em JSON, para comparar revisões.
+
+    Etapas:
+    -------
+    gerar          : escrita dos logs de pose e temperatura (classGeradorLogs).
+    lerPose        : Trajetoria.ReadLogTrajetoria.
+    lerTemperatura : Temperatura.ReadLogTempratura.
+    associacao     : associação das temperaturas às poses (AssociacaoTemporal).
+    orientacoes    : PlotOrientacoes e desenho da figura (backend Agg).
+    temperaturas   : PlotTemperaturas e desenho da figura (só se for pedida em --etapas).
+
+    Exemplos de Execução:
+    ---------------------
+        $ python benchmark.py
+        $ python benchmark.py --mensagens 1000 100000 1000000 --corrupcao 0.01 --saida atual.json
+        $ python benchmark.py --comparar anterior.json
+
+    Retorna:
+    --------
+    NULL
+    """
+    parser = argparse.ArgumentParser(description='Medir o desempenho do processamento de logs sintéticos.')
+    parser.add_argument('--mensagens', nargs='+', type=int, default=[1000, 10000, 100000], help='Números de mensagens dos logs gerados.')
+    parser.add_argument('--etapas', nargs='+', choices=ETAPAS, default=list(ETAPAS_POR_OMISSAO), help='Etapas medidas.')
+    parser.add_argument('--corrupcao', type=float, default=0.0, help='Fração de mensagens corrompidas. (default = 0).')
+    parser.add_argument('--jitter', type=int, default=0, help='Desvio padrão (ns) do ruído nos instantes. (default = 0).')
+    parser.add_argument('--semente', type=int, default=0, help='Semente do gerador. (default = 0).')
+    parser.add_argument('--f', type=int, default=10, help='Frequência dos vetores de orientação. (default = 10).')
+    parser.add_argument('--tolerancia', type=int, default=5000, help='Tolerância (ns) da associação. (default = 5000).')
+    parser.add_argument('--processos', type=int, default=1, help='Processos usados na leitura. (default = 1).')
+    parser.add_argument('--repeticoes', type=int, default=1, help='Execuções cronometradas de cada etapa (fica a mais rápida). (default = 1).')
+    parser.add_argument('--semMemoria', action='store_true', help='Não medir o pico de memória (evita a execução extra com tracemalloc).')
+    parser.add_argument('--dir', type=str, default="", help='Pasta dos logs gerados (por omissão, uma pasta temporária apagada no fim).')
+    parser.add_argument('--saida', type=str, default="resultados_benchmark.json", help='Ficheiro JSON dos resultados.')
+    parser.add_argument('--comparar', type=str, default="", help='Ficheiro JSON de uma execução anterior para comparar.')
+    args = parser.parse_args()
+
+    diretorio = args.dir or tempfile.mkdtemp(prefix="tomsa_benchmark_")
+    os.makedirs(diretorio, exist_ok=True)
+
+    print(f"{'mensagens':>11} {'etapa':<15} {'tempo':>12} {'débito':>20}  pico de memória")
+    resultados = []
+    try:
+        for n in args.mensagens:
+            resultados += CorrerTamanho(n, args, diretorio)
+    finally:
+        if not args.dir:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    relatorio = {
+        'revisao': Revisao(),
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'parametros': {nome: valor for nome, valor in vars(args).items() if nome not in ('saida', 'comparar', 'dir')},
+        'resultados': resultados,
+    }
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=1)
+    print(f"Resultados guardados em {args.saida}")
+
+    if args.comparar:
+        Comparar(resultados, args.comparar)
+
+if __name__ == "__main__":
+    main()
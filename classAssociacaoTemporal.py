@@ -0,0 +1,83 @@
+import numpy as np
+
+class AssociacaoTemporal:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe AssociacaoTemporal no âmbito da u.c. TOMSA
+
+    Associa cada instante de uma série (por exemplo, as poses de uma trajetória) à amostra
+    mais próxima no tempo de outra série (por exemplo, as medições de temperatura), por
+    pesquisa binária sobre os instantes ordenados das amostras: O((N+M) log M) em vez da
+    comparação de todos os pares. Não depende do matplotlib.
+
+    Atributos:
+        _tolerancia (int): Diferença máxima, em nanosegundos, para que uma amostra seja associada.
+    """
+
+    def __init__(self, tolerancia=5000) -> None:
+        self._tolerancia = tolerancia
+
+    def Associar(self, tempos, temposAmostras, ordenadas=False):
+        """
+        Associa cada instante de tempos à amostra mais próxima de temposAmostras.
+
+        Em caso de empate, ou de amostras com o mesmo instante, é escolhida a amostra que
+        aparece primeiro em temposAmostras, tal como na procura linear original. As amostras
+        não precisam de estar ordenadas: se não estiverem, são ordenadas (de forma estável).
+
+        Parâmetros:
+            tempos (array): Instantes a associar, em nanosegundos (int64, N).
+            temposAmostras (array): Instantes das amostras, em nanosegundos (int64, M).
+            ordenadas (bool): Verdadeiro se já se sabe que as amostras estão ordenadas, para saltar a verificação.
+
+        Retorna:
+            tuple: (indices, mascara), em que indices (intp, N) é o índice em temposAmostras da
+            amostra mais próxima de cada instante e mascara (bool, N) indica se essa amostra está
+            dentro da tolerância. Onde a máscara é falsa, o índice não tem significado.
+        """
+        tempos = np.asarray(tempos, dtype=np.int64)
+        temposAmostras = np.asarray(temposAmostras, dtype=np.int64)
+        if len(temposAmostras) == 0:
+            return np.zeros(len(tempos), dtype=np.intp), np.zeros(len(tempos), dtype=bool)
+
+        ordem = None
+        if not ordenadas and np.any(temposAmostras[1:] < temposAmostras[:-1]):
+            ordem = np.argsort(temposAmostras, kind='stable')
+            temposAmostras = temposAmostras[ordem]
+
+        # Candidatos: a primeira amostra com instante >= t e a primeira com o instante imediatamente anterior
+        direita = np.searchsorted(temposAmostras, tempos, side='left')
+        direita = np.minimum(direita, len(temposAmostras) - 1)
+        esquerda = np.maximum(direita - 1, 0)
+        esquerda = np.searchsorted(temposAmostras, temposAmostras[esquerda], side='left')
+
+        diferencaEsquerda = np.abs(tempos - temposAmostras[esquerda])
+        diferencaDireita = np.abs(tempos - temposAmostras[direita])
+        if ordem is not None:
+            esquerda = ordem[esquerda]
+            direita = ordem[direita]
+
+        # Em caso de empate fica a amostra que aparece primeiro
+        usarEsquerda = (diferencaEsquerda < diferencaDireita) | ((diferencaEsquerda == diferencaDireita) & (esquerda <= direita))
+        indices = np.where(usarEsquerda, esquerda, direita)
+        diferencas = np.where(usarEsquerda, diferencaEsquerda, diferencaDireita)
+        return indices, diferencas <= self._tolerancia
+
+    @property
+    def tolerancia(self):
+        """
+        Retorna:
+            int: Diferença máxima, em nanosegundos, para que uma amostra seja associada.
+        """
+        return self._tolerancia
+
+    @tolerancia.setter
+    def tolerancia(self, tolerancia):
+        """
+        Define a diferença máxima, em nanosegundos, para que uma amostra seja associada.
+
+        Parâmetros:
+            tolerancia (int): Nova tolerância.
+        """
+        self._tolerancia = tolerancia
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+class CacheLogs:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe CacheLogs no âmbito da u.c. TOMSA
+
+    Cache persistente, em binário, das colunas lidas de ficheiros de log. Cada ficheiro
+    lido dá origem a uma pasta dentro de _diretorio com uma coluna por ficheiro .npy e
+    um ficheiro meta.json com a chave do ficheiro de origem, a tabela de frame_id e os
+    contadores de mensagens. Uma entrada só é reutilizada se o caminho, o tamanho, a data
+    de modificação e a impressão digital do conteúdo do ficheiro de origem coincidirem.
+    As colunas de uma entrada reutilizada são mapeadas em memória (só de leitura).
+
+    Atributos:
+        _diretorio (str): Pasta onde são guardadas as entradas da cache.
+        _reconstruir (bool): Se verdadeiro, as entradas existentes são ignoradas e reescritas.
+    """
+
+    # Versão do formato das entradas; entradas de outra versão são ignoradas
+    VERSAO = 1
+
+    # Número de bytes do início e do fim do ficheiro usados na impressão digital
+    TAMANHO_AMOSTRA = 64 * 1024
+
+    def __init__(self, diretorio=".cache_logs", reconstruir=False) -> None:
+        self._diretorio = diretorio
+        self._reconstruir = reconstruir
+
+    def LerFicheiro(self, leitor, pathFile, processos=1):
+        """
+        Lê um ficheiro de log através da cache: devolve a entrada guardada se ainda for válida;
+        caso contrário lê o ficheiro com o leitor dado e guarda o resultado.
+
+        Parâmetros:
+            leitor (LeitorLog): Leitor usado quando a cache não tem uma entrada válida.
+            pathFile (str): Caminho do ficheiro de log.
+            processos (int): Número de processos usados na leitura (default = 1).
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal), como LeitorLog.LerFicheiro.
+        """
+        chave = self.Chave(pathFile, type(leitor).__name__)
+        if not self._reconstruir:
+            resultado = self.Carregar(chave)
+            if resultado is not None:
+                return resultado
+
+        resultado = leitor.LerFicheiro(pathFile, processos)
+        try:
+            self.Guardar(chave, *resultado)
+        except OSError as erro:
+            # Uma cache que não pode ser escrita não impede a leitura
+            print(f"Aviso: não foi possível guardar a cache de {pathFile}: {erro}")
+        return resultado
+
+    def Chave(self, pathFile, tipo):
+        """
+        Calcula a chave que identifica o conteúdo atual de um ficheiro de log.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de log.
+            tipo (str): Tipo de leitura (nome da classe do leitor).
+
+        Retorna:
+            dict: Caminho absoluto, tipo, tamanho, data de modificação (ns) e impressão digital.
+        """
+        caminho = os.path.abspath(pathFile)
+        with open(caminho, 'rb') as f:
+            estado = os.fstat(f.fileno())
+            resumo = hashlib.blake2b(digest_size=16)
+            resumo.update(f.read(self.TAMANHO_AMOSTRA))
+            if estado.st_size > self.TAMANHO_AMOSTRA:
+                f.seek(max(self.TAMANHO_AMOSTRA, estado.st_size - self.TAMANHO_AMOSTRA))
+                resumo.update(f.read())
+
+        return {
+            'versao': self.VERSAO,
+            'caminho': caminho,
+            'tipo': tipo,
+            'tamanho': estado.st_size,
+            'mtimeNs': estado.st_mtime_ns,
+            'impressaoDigital': resumo.hexdigest(),
+        }
+
+    def Carregar(self, chave):
+        """
+        Carrega a entrada da cache correspondente a uma chave.
+
+        Parâmetros:
+            chave (dict): Chave devolvida por Chave.
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal), ou None se não existir uma entrada válida.
+        """
+        pasta = self._Pasta(chave)
+        try:
+            with open(os.path.join(pasta, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['chave'] != chave:
+                return None
+            colunas = {
+                nome: np.load(os.path.join(pasta, f"{nome}.npy"), mmap_mode='r')
+                for nome in meta['colunas']
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        colunas['frameIds'] = meta['frameIds']
+        return colunas, meta['countPontosValidos'], meta['countPontosTotal']
+
+    def Guardar(self, chave, colunas, countPontosValidos, countPontosTotal):
+        """
+        Guarda as colunas lidas de um ficheiro de log, substituindo a entrada anterior da mesma chave.
+        A entrada é escrita numa pasta temporária e só depois posta no lugar definitivo.
+
+        Parâmetros:
+            chave (dict): Chave devolvida por Chave.
+            colunas (dict): Colunas lidas, incluindo a tabela de frame_id ('frameIds').
+            countPontosValidos (int): Número de mensagens válidas.
+            countPontosTotal (int): Número total de mensagens.
+        """
+        os.makedirs(self._diretorio, exist_ok=True)
+        pasta = self._Pasta(chave)
+        temporaria = tempfile.mkdtemp(dir=self._diretorio)
+        try:
+            nomes = [nome for nome in colunas if nome != 'frameIds']
+            for nome in nomes:
+                np.save(os.path.join(temporaria, f"{nome}.npy"), np.ascontiguousarray(colunas[nome]))
+
+            meta = {
+                'chave': chave,
+                'colunas': nomes,
+                'frameIds': list(colunas['frameIds']),
+                'countPontosValidos': countPontosValidos,
+                'countPontosTotal': countPontosTotal,
+            }
+            with open(os.path.join(temporaria, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=1)
+
+            shutil.rmtree(pasta, ignore_errors=True)
+            os.replace(temporaria, pasta)
+        finally:
+            shutil.rmtree(temporaria, ignore_errors=True)
+
+    def _Pasta(self, chave):
+        """Devolve a pasta da entrada de uma chave (uma por ficheiro de origem e tipo de leitura)."""
+        identificador = hashlib.blake2b(f"{chave['tipo']}:{chave['caminho']}".encode('utf-8'), digest_size=8).hexdigest()
+        nome = os.path.splitext(os.path.basename(chave['caminho']))[0]
+        return os.path.join(self._diretorio, f"{nome}-{chave['tipo']}-{identificador}")
@@ -0,0 +1,199 @@
+import numpy as np
+from classQuaternioes import Quaternioes
+
+class Cinematica:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Cinematica no âmbito da u.c. TOMSA
+
+    Grandezas cinemáticas de uma trajetória (distâncias, velocidades, acelerações,
+    velocidade angular, tempo parado) e o respetivo resumo, calculados sobre as colunas
+    de instantes, posições e quaterniões, sem ciclos em Python. As amostras são usadas
+    por ordem de tempo. As grandezas por segmento referem-se a pares de amostras
+    consecutivas; segmentos com intervalo de tempo nulo dão NaN nas grandezas por unidade
+    de tempo.
+
+    Atributos:
+        _tempoNs (np.ndarray): Instantes em nanosegundos, por ordem de tempo (int64, N).
+        _posicoes (np.ndarray): Posições x, y, z (float64, Nx3).
+        _quaternioes (np.ndarray): Orientações q_0 (w), q_1 (x), q_2 (y), q_3 (z) (float64, Nx4).
+        _cache (dict): Resultados intermédios já calculados (intervalos, deslocamentos, ...).
+    """
+
+    def __init__(self, trajetoria) -> None:
+        ordem = trajetoria.IndiceTempo().ordem
+        if ordem is None:
+            self._tempoNs = trajetoria.tempoNs
+            self._posicoes = trajetoria.posicoes
+            self._quaternioes = trajetoria.quaternioes
+        else:
+            self._tempoNs = trajetoria.tempoNs[ordem]
+            self._posicoes = trajetoria.posicoes[ordem]
+            self._quaternioes = trajetoria.quaternioes[ordem]
+        self._cache = {}
+
+    def Intervalos(self):
+        """
+        Retorna:
+            np.ndarray: Duração de cada segmento em segundos (float64, N-1).
+        """
+        if 'intervalos' not in self._cache:
+            self._cache['intervalos'] = np.diff(self._tempoNs) / 1e9
+        return self._cache['intervalos']
+
+    def Deslocamentos(self):
+        """
+        Retorna:
+            np.ndarray: Vetor deslocamento de cada segmento, em metros (float64, (N-1)x3).
+        """
+        if 'deslocamentos' not in self._cache:
+            self._cache['deslocamentos'] = np.diff(self._posicoes, axis=0)
+        return self._cache['deslocamentos']
+
+    def Distancias(self):
+        """
+        Retorna:
+            np.ndarray: Comprimento de cada segmento em metros (float64, N-1).
+        """
+        if 'distancias' not in self._cache:
+            self._cache['distancias'] = self._Normas(self.Deslocamentos())
+        return self._cache['distancias']
+
+    def DistanciaAcumulada(self):
+        """
+        Retorna:
+            np.ndarray: Distância percorrida desde a primeira amostra até cada amostra, em metros (float64, N).
+        """
+        return np.concatenate([[0.0], np.cumsum(self.Distancias())])
+
+    def Velocidades(self):
+        """
+        Retorna:
+            np.ndarray: Vetor velocidade média de cada segmento, em m/s (float64, (N-1)x3).
+        """
+        if 'velocidades' not in self._cache:
+            self._cache['velocidades'] = self._PorSegundo(self.Deslocamentos(), self.Intervalos()[:, None])
+        return self._cache['velocidades']
+
+    def Rapidez(self):
+        """
+        Retorna:
+            np.ndarray: Módulo da velocidade de cada segmento, em m/s (float64, N-1).
+        """
+        return self._PorSegundo(self.Distancias(), self.Intervalos())
+
+    def Aceleracoes(self):
+        """
+        Aceleração entre segmentos consecutivos: diferença das velocidades a dividir pelo
+        intervalo entre os pontos médios dos dois segmentos.
+
+        Retorna:
+            np.ndarray: Vetor aceleração, em m/s^2 (float64, (N-2)x3).
+        """
+        intervalos = self.Intervalos()
+        return self._PorSegundo(np.diff(self.Velocidades(), axis=0), ((intervalos[:-1] + intervalos[1:]) / 2)[:, None])
+
+    def VelocidadesAngulares(self):
+        """
+        Velocidade angular de cada segmento, a partir da rotação relativa entre quaterniões
+        consecutivos (q_i^-1 * q_i+1), expressa no referencial do corpo.
+
+        Retorna:
+            np.ndarray: Vetor velocidade angular, em rad/s (float64, (N-1)x3).
+        """
+        quaternioes = Quaternioes.Normalizar(self._quaternioes)
+        relativos = Quaternioes.Produto(Quaternioes.Conjugado(quaternioes[:-1]), quaternioes[1:])
+
+        # Vetor de rotação (eixo * ângulo) de cada rotação relativa, pelo caminho mais curto (q e -q são a mesma rotação)
+        vetores = relativos[:, 1:] * np.where(relativos[:, :1] < 0, -1.0, 1.0)
+        senos = self._Normas(vetores)
+        angulos = 2 * np.arctan2(senos, np.abs(relativos[:, 0]))
+        fatores = np.full_like(senos, 2.0)
+        np.divide(angulos, senos, out=fatores, where=senos > 0)
+        return self._PorSegundo(vetores * fatores[:, None], self.Intervalos()[:, None])
+
+    def RapidezAngular(self):
+        """
+        Módulo da velocidade angular de cada segmento, sem calcular o eixo de rotação: o ângulo
+        da rotação relativa é o dobro do ângulo entre os dois quaterniões unitários (vistos como
+        vetores em 4D), calculado de forma estável por 2 * atan2(|q2 - q1|, |q2 + q1|).
+
+        Retorna:
+            np.ndarray: Velocidade angular, em rad/s (float64, N-1).
+        """
+        quaternioes = Quaternioes.Normalizar(self._quaternioes)
+        anteriores = quaternioes[:-1]
+        seguintes = quaternioes[1:]
+
+        # q e -q são a mesma rotação: alinhar o sinal para medir o caminho mais curto
+        anteriores = anteriores * np.where(np.einsum('ij,ij->i', anteriores, seguintes) < 0, -1.0, 1.0)[:, None]
+        diferencas = seguintes - anteriores
+        somas = seguintes + anteriores
+        angulos = 4 * np.arctan2(np.sqrt(np.einsum('ij,ij->i', diferencas, diferencas)),
+                                 np.sqrt(np.einsum('ij,ij->i', somas, somas)))
+        return self._PorSegundo(angulos, self.Intervalos())
+
+    def TempoParado(self, limiarRapidez=0.05):
+        """
+        Tempo total passado em segmentos com rapidez inferior ao limiar.
+
+        Parâmetros:
+            limiarRapidez (float): Rapidez, em m/s, abaixo da qual o veículo é considerado parado (default = 0.05).
+
+        Retorna:
+            float: Tempo parado, em segundos.
+        """
+        intervalos = self.Intervalos()
+        parados = self.Distancias() < limiarRapidez * intervalos
+        return float(np.sum(intervalos[parados]))
+
+    def Resumo(self, limiarRapidez=0.05):
+        """
+        Reduções da trajetória inteira.
+
+        Parâmetros:
+            limiarRapidez (float): Limiar usado no tempo parado (default = 0.05 m/s).
+
+        Retorna:
+            dict: numeroPontos, duracao (s), comprimento (m), rapidezMedia e rapidezMaxima (m/s),
+            aceleracaoMaxima (m/s^2), velocidadeAngularMaxima (rad/s), tempoParado (s),
+            caixaMinima e caixaMaxima (x, y, z em metros).
+        """
+        n = len(self._tempoNs)
+        if n == 0:
+            return {'numeroPontos': 0}
+
+        duracao = float(self._tempoNs[-1] - self._tempoNs[0]) / 1e9
+        comprimento = float(np.sum(self.Distancias()))
+        return {
+            'numeroPontos': n,
+            'duracao': duracao,
+            'comprimento': comprimento,
+            'rapidezMedia': comprimento / duracao if duracao > 0 else float('nan'),
+            'rapidezMaxima': self._Maximo(self.Rapidez()),
+            'aceleracaoMaxima': self._Maximo(self._Normas(self.Aceleracoes())),
+            'velocidadeAngularMaxima': self._Maximo(self.RapidezAngular()),
+            'tempoParado': self.TempoParado(limiarRapidez),
+            'caixaMinima': [float(self._posicoes[:, k].min()) for k in range(3)],
+            'caixaMaxima': [float(self._posicoes[:, k].max()) for k in range(3)],
+        }
+
+    @staticmethod
+    def _PorSegundo(valores, intervalos):
+        """Divide valores por intervalos de tempo, com NaN onde o intervalo é nulo."""
+        resultado = np.full(np.broadcast_shapes(np.shape(valores), np.shape(intervalos)), np.nan)
+        np.divide(valores, intervalos, out=resultado, where=intervalos > 0)
+        return resultado
+
+    @staticmethod
+    def _Normas(vetores):
+        """Norma euclidiana de cada linha de um array (M, 3)."""
+        return np.sqrt(np.einsum('ij,ij->i', vetores, vetores))
+
+    @staticmethod
+    def _Maximo(valores):
+        """Máximo ignorando NaN (NaN se não houver valores válidos)."""
+        if len(valores) == 0 or np.all(np.isnan(valores)):
+            return float('nan')
+        return float(np.nanmax(valores))
@@ -0,0 +1,100 @@
+import numpy as np
+
+class Decimacao:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Decimacao no âmbito da u.c. TOMSA
+
+    Escolha dos pontos a desenhar quando uma série tem mais pontos do que o orçamento de
+    visualização. Os métodos devolvem os índices (ordenados) dos pontos a manter, para que
+    as restantes colunas (temperaturas, instantes, ...) possam ser indexadas da mesma forma.
+    Todas as operações são vetorizadas e de custo O(N), ou O(N log N) no caso de MinMax.
+    Um orçamento nulo ou negativo desliga a decimação.
+    """
+
+    @staticmethod
+    def _Baldes(n, baldes):
+        """Divide os índices [0, n) em baldes contíguos; devolve o início de cada balde e o balde de cada índice."""
+        inicios = (np.arange(baldes, dtype=np.int64) * n) // baldes
+        idsBalde = np.repeat(np.arange(baldes), np.diff(np.append(inicios, n)))
+        return inicios, idsBalde
+
+    @staticmethod
+    def _PrimeiroIgual(valores, referencia, idsBalde):
+        """Índice do primeiro elemento de cada balde cujo valor é igual ao valor de referência do balde."""
+        candidatos = np.flatnonzero(valores == referencia[idsBalde])
+        _, primeiros = np.unique(idsBalde[candidatos], return_index=True)
+        return candidatos[primeiros]
+
+    @staticmethod
+    def LTTB(posicoes, orcamento):
+        """
+        Decimação de um percurso 3D pelo maior triângulo em cada balde (Largest-Triangle-Three-Buckets).
+        O primeiro e o último ponto são sempre mantidos; os restantes são divididos em orcamento - 2
+        baldes e de cada balde fica o ponto que forma o triângulo de maior área com o centroide do
+        balde anterior e o centroide do balde seguinte. Usar os centroides (em vez do ponto escolhido
+        no balde anterior) torna os baldes independentes e permite calcular todos de uma só vez.
+
+        Parâmetros:
+            posicoes (array): Posições do percurso (N, 3).
+            orcamento (int): Número máximo de pontos a manter.
+
+        Retorna:
+            np.ndarray: Índices dos pontos mantidos (intp).
+        """
+        posicoes = np.asarray(posicoes, dtype=np.float64)
+        n = len(posicoes)
+        if orcamento <= 0 or n <= orcamento:
+            return np.arange(n)
+        if orcamento < 3:
+            return np.array([0, n - 1])[:orcamento]
+
+        # Baldes dos pontos interiores
+        interiores = posicoes[1:-1]
+        baldes = orcamento - 2
+        inicios, idsBalde = Decimacao._Baldes(len(interiores), baldes)
+        contagens = np.bincount(idsBalde, minlength=baldes)[:, None]
+        centroides = np.add.reduceat(interiores, inicios, axis=0) / contagens
+
+        # Vértices fixos de cada balde: o centroide anterior (ou o primeiro ponto) e o seguinte (ou o último)
+        anteriores = np.concatenate([posicoes[:1], centroides[:-1]])
+        seguintes = np.concatenate([centroides[1:], posicoes[-1:]])
+        a = anteriores[idsBalde]
+        c = seguintes[idsBalde]
+
+        # Área (a menos do fator 1/2) do triângulo formado por cada ponto com os vértices do seu balde
+        areas = np.linalg.norm(np.cross(interiores - a, c - a), axis=1)
+        maximos = np.maximum.reduceat(areas, inicios)
+        escolhidos = Decimacao._PrimeiroIgual(areas, maximos, idsBalde) + 1
+
+        return np.concatenate([[0], escolhidos, [n - 1]])
+
+    @staticmethod
+    def MinMax(valores, orcamento):
+        """
+        Decimação que preserva os extremos: os valores são divididos em (orcamento - 2) // 2
+        baldes contíguos e de cada balde ficam o mínimo e o máximo. O primeiro e o último ponto
+        são sempre mantidos (com orcamento menor do que 4 só ficam esses).
+
+        Parâmetros:
+            valores (array): Valores da série, por exemplo temperaturas (N).
+            orcamento (int): Número máximo de pontos a manter.
+
+        Retorna:
+            np.ndarray: Índices dos pontos mantidos (intp).
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        n = len(valores)
+        if orcamento <= 0 or n <= orcamento:
+            return np.arange(n)
+
+        if orcamento < 4:
+            return np.array([0, n - 1])[:orcamento]
+
+        baldes = (orcamento - 2) // 2
+        inicios, idsBalde = Decimacao._Baldes(n, baldes)
+        minimos = Decimacao._PrimeiroIgual(valores, np.minimum.reduceat(valores, inicios), idsBalde)
+        maximos = Decimacao._PrimeiroIgual(valores, np.maximum.reduceat(valores, inicios), idsBalde)
+
+        return np.unique(np.concatenate([[0], minimos, maximos, [n - 1]]))
@@ -0,0 +1,92 @@
+import numpy as np
+
+class DecimacaoIncremental:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe DecimacaoIncremental no âmbito da u.c. TOMSA
+
+    Decimação de uma série que chega aos bocados (por exemplo, um log seguido durante um
+    voo), com memória limitada. São mantidos os pontos de índice múltiplo de um passo;
+    quando os pontos mantidos excedem a capacidade, o passo duplica e fica um ponto em cada
+    dois. Assim os pontos mantidos continuam uniformemente distribuídos pela série inteira,
+    nunca são mais do que a capacidade, e o custo de cada acrescento é proporcional ao
+    número de pontos novos (e, quando o passo duplica, à capacidade).
+
+    Atributos:
+        _capacidade (int): Número máximo de pontos mantidos.
+        _colunas (dict): Arrays pré-dimensionados de cada coluna (capacidade linhas).
+        _n (int): Número de pontos mantidos.
+        _total (int): Número de pontos recebidos.
+        _passo (int): Intervalo, em pontos recebidos, entre os pontos mantidos.
+    """
+
+    def __init__(self, capacidade) -> None:
+        self._capacidade = max(2, int(capacidade))
+        self._colunas = None
+        self._n = 0
+        self._total = 0
+        self._passo = 1
+
+    def Acrescentar(self, **colunas):
+        """
+        Acrescenta pontos, dados por colunas com o mesmo número de linhas.
+
+        Parâmetros:
+            colunas (array): Colunas dos pontos novos (N ou N x k), pelo nome.
+        """
+        colunas = {nome: np.asarray(coluna) for nome, coluna in colunas.items()}
+        k = len(next(iter(colunas.values())))
+        if k == 0:
+            return
+        if self._colunas is None:
+            self._colunas = {nome: np.empty((self._capacidade,) + coluna.shape[1:], dtype=coluna.dtype)
+                             for nome, coluna in colunas.items()}
+
+        indices = self._total + np.arange(k)
+        self._total += k
+        while True:
+            selecao = np.flatnonzero(indices % self._passo == 0)
+            if self._n + len(selecao) <= self._capacidade:
+                break
+            # Demasiados pontos: duplicar o passo e ficar com um ponto em cada dois
+            self._passo *= 2
+            manter = (self._n + 1) // 2
+            for coluna in self._colunas.values():
+                coluna[:manter] = coluna[0:self._n:2]
+            self._n = manter
+
+        for nome, coluna in colunas.items():
+            self._colunas[nome][self._n:self._n + len(selecao)] = coluna[selecao]
+        self._n += len(selecao)
+
+    def __len__(self):
+        return self._n
+
+    def Coluna(self, nome):
+        """
+        Parâmetros:
+            nome (str): Nome da coluna.
+
+        Retorna:
+            np.ndarray: Vista dos valores mantidos da coluna (sem cópia).
+        """
+        if self._colunas is None:
+            return np.empty(0)
+        return self._colunas[nome][:self._n]
+
+    @property
+    def total(self):
+        """
+        Retorna:
+            int: Número de pontos recebidos.
+        """
+        return self._total
+
+    @property
+    def passo(self):
+        """
+        Retorna:
+            int: Intervalo, em pontos recebidos, entre os pontos mantidos.
+        """
+        return self._passo
@@ -0,0 +1,263 @@
+import numpy as np
+
+class EsquemaMensagem:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe EsquemaMensagem no âmbito da u.c. TOMSA
+
+    Descrição de um tipo de mensagem dos ficheiros de log (texto indentado, no formato
+    das mensagens ROS), usada por LeitorLog para ler qualquer tipo de mensagem sem
+    escrever um leitor próprio. Os campos são declarados uma vez, pelo caminho e pelo tipo:
+
+        'header.seq: int'
+        'header.stamp: time'          (secs e nsecs, convertidos em nanosegundos)
+        'header.frame_id: str'        (convertido em códigos da tabela de frame_id)
+        'pose.position.x: float'
+
+    e as colunas produzidas são definidas a partir dos caminhos: um caminho dá uma coluna
+    (N) e um tuplo de caminhos dá uma coluna (N, k), com um campo por coluna. Por exemplo,
+    para as mensagens de uma IMU:
+
+        EsquemaMensagem(
+            campos=('header.seq: int', 'header.stamp: time', 'header.frame_id: str',
+                    'angular_velocity.x: float', 'angular_velocity.y: float', 'angular_velocity.z: float'),
+            colunas={'seq': 'header.seq', 'tempoNs': 'header.stamp', 'frameIdCodigos': 'header.frame_id',
+                     'velocidadesAngulares': ('angular_velocity.x', 'angular_velocity.y', 'angular_velocity.z')},
+        )
+
+    As chaves das linhas são procuradas como nos leitores originais, sem depender da
+    indentação. As secções são os caminhos que contêm campos (header, pose.position, ...;
+    secs e nsecs contam como campos da secção que contém o stamp); a linha de uma secção
+    abre-a e descarta os valores anteriores dos seus campos, e as chaves seguintes são
+    procuradas nessa secção e depois nas secções que a contêm, até à raiz da mensagem.
+    As linhas dos restantes nós (pose, stamp) são ignoradas.
+
+    Atributos:
+        _campos (tuple): Caminho de cada campo lido, pela ordem da declaração (um campo time dá .secs e .nsecs).
+        _tipos (dict): Tipo ('int', 'float' ou 'str') de cada campo lido.
+        _tempos (tuple): Caminhos declarados com o tipo time.
+        _colunas (dict): Caminho, ou tuplo de caminhos, de cada coluna produzida.
+        _tolerantes (tuple): Campos cujo valor inválido é apenas ignorado, sem descartar o resto da secção.
+        _camposPorChave (dict): Campo correspondente a cada (secção, chave em bytes); '' é a raiz.
+        _seccoesPorChave (dict): Secção aberta por cada (secção, chave em bytes).
+        _camposDeSeccao (dict): Campos de cada secção (incluindo os das secções que contém).
+    """
+
+    TIPOS = ('int', 'float', 'str', 'time')
+
+    # Tipo das colunas produzidas a partir de cada tipo de campo
+    _DTYPES = {'int': np.int64, 'float': np.float64, 'str': np.int32, 'time': np.int64}
+
+    def __init__(self, campos, colunas, tolerantes=()) -> None:
+        self._campos = ()
+        self._tipos = {}
+        self._tempos = ()
+        for declaracao in campos:
+            caminho, _, tipo = declaracao.partition(':')
+            caminho = caminho.strip()
+            tipo = tipo.strip()
+            if tipo not in self.TIPOS:
+                raise ValueError(f"Tipo desconhecido no campo '{declaracao}': use um de {self.TIPOS}")
+            if tipo == 'time':
+                self._tempos += (caminho,)
+                novos = {f"{caminho}.secs": 'int', f"{caminho}.nsecs": 'int'}
+            else:
+                novos = {caminho: tipo}
+            for campo, tipoCampo in novos.items():
+                if campo in self._tipos:
+                    raise ValueError(f"Campo repetido: '{campo}'")
+                self._tipos[campo] = tipoCampo
+                self._campos += (campo,)
+
+        self._colunas = dict(colunas)
+        for nome, caminhos in self._colunas.items():
+            caminhos = (caminhos,) if isinstance(caminhos, str) else caminhos
+            for caminho in caminhos:
+                if caminho not in self._tipos and caminho not in self._tempos:
+                    raise ValueError(f"A coluna '{nome}' usa o campo '{caminho}', que não foi declarado")
+            if len(caminhos) > 1 and len({self._Tipo(caminho) for caminho in caminhos}) > 1:
+                raise ValueError(f"Os campos da coluna '{nome}' têm de ter todos o mesmo tipo")
+        if sum(self._Tipo(c) == 'str' for c in self._colunas.values() if isinstance(c, str)) > 1:
+            raise ValueError("Só é suportada uma coluna de texto (a tabela de frame_id é única)")
+
+        self._tolerantes = tuple(tolerantes)
+        for campo in self._tolerantes:
+            if campo not in self._tipos:
+                raise ValueError(f"Campo tolerante não declarado: '{campo}'")
+
+        self._Indexar()
+
+    def _Tipo(self, caminho):
+        """Tipo declarado de um caminho (campo ou time)."""
+        return 'time' if caminho in self._tempos else self._tipos[caminho]
+
+    def _TipoColuna(self, nome):
+        """Devolve o tipo dos campos de uma coluna."""
+        caminhos = self._colunas[nome]
+        return self._Tipo(caminhos if isinstance(caminhos, str) else caminhos[0])
+
+    def _Indexar(self):
+        """Constrói as tabelas de procura das chaves em cada secção."""
+        # Secção de cada campo: o caminho que o contém, sem o nó de um campo time (secs e nsecs
+        # pertencem à secção onde está o stamp, como nos leitores originais)
+        seccaoDeCampo = {}
+        for campo in self._campos:
+            seccao = campo.rpartition('.')[0]
+            if seccao in self._tempos:
+                seccao = seccao.rpartition('.')[0]
+            seccaoDeCampo[campo] = seccao
+        seccoes = sorted(set(seccaoDeCampo.values()) | {''})
+
+        self._camposDeSeccao = {
+            seccao: tuple(campo for campo in self._campos
+                          if seccaoDeCampo[campo] == seccao or seccaoDeCampo[campo].startswith(seccao + '.'))
+            for seccao in seccoes if seccao
+        }
+
+        self._camposPorChave = {}
+        self._seccoesPorChave = {}
+        for contexto in seccoes:
+            ancestrais = [contexto]
+            while ancestrais[-1]:
+                ancestrais.append(ancestrais[-1].rpartition('.')[0])
+
+            for ancestral in ancestrais:
+                # Campos da própria secção e depois das secções que a contêm
+                porNome = {}
+                for campo, seccao in seccaoDeCampo.items():
+                    if seccao == ancestral:
+                        porNome.setdefault(campo.rsplit('.', 1)[-1].encode(), []).append(campo)
+                for nome, campos in porNome.items():
+                    if len(campos) == 1:
+                        self._camposPorChave.setdefault((contexto, nome), campos[0])
+
+                # Secções contidas na secção mais próxima que tenha uma com esse nome (sem ambiguidade)
+                porNome = {}
+                for seccao in seccoes:
+                    if seccao and (not ancestral or seccao.startswith(ancestral + '.')):
+                        porNome.setdefault(seccao.rsplit('.', 1)[-1].encode(), []).append(seccao)
+                for nome, encontradas in porNome.items():
+                    if len(encontradas) == 1:
+                        self._seccoesPorChave.setdefault((contexto, nome), encontradas[0])
+
+    def ColunasVazias(self, n):
+        """
+        Parâmetros:
+            n (int): Número de mensagens.
+
+        Retorna:
+            dict: Colunas pré-dimensionadas para n mensagens, pela ordem de colunas.
+        """
+        colunas = {}
+        for nome, caminhos in self._colunas.items():
+            if isinstance(caminhos, str):
+                colunas[nome] = np.empty(n, dtype=self._DTYPES[self._Tipo(caminhos)])
+            else:
+                colunas[nome] = np.empty((n, len(caminhos)), dtype=self._DTYPES[self._Tipo(caminhos[0])])
+        return colunas
+
+    def Converter(self, valores, frameIds):
+        """
+        Converte os valores (em bytes) de cada campo, pela ordem de campos, nas colunas tipadas.
+
+        Parâmetros:
+            valores (list): Sequência de valores de cada campo.
+            frameIds (TabelaFrameIds): Tabela onde são registados os valores dos campos de texto.
+
+        Retorna:
+            dict: Colunas, pela ordem de colunas.
+
+        Exceções:
+            ValueError, OverflowError: Se algum valor não for convertível.
+        """
+        porCampo = dict(zip(self._campos, valores))
+        k = len(valores[0]) if valores else 0
+
+        def Coluna(caminho):
+            tipo = self._Tipo(caminho)
+            if tipo == 'time':
+                return (np.array(porCampo[f"{caminho}.secs"], dtype=np.int64) * 1_000_000_000
+                        + np.array(porCampo[f"{caminho}.nsecs"], dtype=np.int64))
+            if tipo == 'str':
+                mapa = {valor: frameIds.Codigo(valor.decode('utf-8', 'replace')) for valor in set(porCampo[caminho])}
+                return np.fromiter(map(mapa.__getitem__, porCampo[caminho]), dtype=np.int32, count=k)
+            return np.array(porCampo[caminho], dtype=self._DTYPES[tipo])
+
+        # As colunas de texto são convertidas no fim, para que uma conversão que falha não registe
+        # na tabela frame_id de mensagens que não chegam a ser lidas
+        colunas = {}
+        for nome in sorted(self._colunas, key=lambda nome: self._TipoColuna(nome) == 'str'):
+            caminhos = self._colunas[nome]
+            if isinstance(caminhos, str):
+                colunas[nome] = Coluna(caminhos)
+                continue
+            coluna = np.empty((k, len(caminhos)), dtype=self._DTYPES[self._Tipo(caminhos[0])])
+            for i, caminho in enumerate(caminhos):
+                coluna[:, i] = Coluna(caminho)
+            colunas[nome] = coluna
+        return {nome: colunas[nome] for nome in self._colunas}
+
+    @property
+    def campos(self):
+        """
+        Retorna:
+            tuple: Caminho de cada campo lido das mensagens, pela ordem da declaração.
+        """
+        return self._campos
+
+    @property
+    def camposInt(self):
+        """
+        Retorna:
+            tuple: Campos inteiros.
+        """
+        return tuple(campo for campo in self._campos if self._tipos[campo] == 'int')
+
+    @property
+    def camposTexto(self):
+        """
+        Retorna:
+            tuple: Campos de texto.
+        """
+        return tuple(campo for campo in self._campos if self._tipos[campo] == 'str')
+
+    @property
+    def camposTolerantes(self):
+        """
+        Retorna:
+            tuple: Campos cujo valor inválido é apenas ignorado.
+        """
+        return self._tolerantes
+
+    @property
+    def colunas(self):
+        """
+        Retorna:
+            dict: Caminho, ou tuplo de caminhos, de cada coluna produzida.
+        """
+        return self._colunas
+
+    @property
+    def camposPorChave(self):
+        """
+        Retorna:
+            dict: Campo correspondente a cada (secção, chave em bytes).
+        """
+        return self._camposPorChave
+
+    @property
+    def seccoesPorChave(self):
+        """
+        Retorna:
+            dict: Secção aberta por cada (secção, chave em bytes).
+        """
+        return self._seccoesPorChave
+
+    @property
+    def camposDeSeccao(self):
+        """
+        Retorna:
+            dict: Campos contidos em cada secção.
+        """
+        return self._camposDeSeccao
@@ -0,0 +1,287 @@
+import os
+import numpy as np
+from classTabelaFrameIds import TabelaFrameIds
+
+class Exportacao:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Exportacao no âmbito da u.c. TOMSA
+
+    Exportação das colunas lidas (de uma trajetória ou de dados de temperatura) ou de uma
+    tabela sincronizada (ver Sincronizacao) para ficheiros colunares, e leitura desses
+    ficheiros. O formato é dado pela extensão:
+
+        .parquet : Apache Parquet (requer o pacote opcional pyarrow). Colunas seq, tempoNs
+                   (int64, nanosegundos), frameId (dicionário de texto), x, y, z e qw, qx,
+                   qy, qz (trajetória) ou temperatura, variancia e fonte (temperatura); a tabela
+                   sincronizada tem tempoNs, x a qz, temperatura, variancia e valido. As linhas são
+                   escritas em grupos de linhasPorGrupo, cada um convertido a partir de uma
+                   fatia das colunas, por isso nunca é feita uma cópia completa dos dados; as
+                   colunas acrescentadas em pedaços menores ficam em memória só até completarem
+                   um grupo, por isso um ficheiro lido por pedaços (ver LeituraFluxo) é
+                   exportado com memória limitada.
+        .npz     : Arquivo NumPy com as colunas no formato de AcrescentarColunas (seq,
+                   tempoNs, frameIdCodigos, frameIds, posicoes e quaternioes, ou temperaturas,
+                   variancias e fontes). Os arrays de um arquivo .npz são escritos de uma vez, por
+                   isso as colunas acrescentadas em várias vezes ficam em memória até Fechar.
+
+    As colunas podem ser acrescentadas em várias vezes (Acrescentar), por exemplo à medida
+    que um log é lido; os frame_id de cada vez são fundidos numa única tabela (a tabela
+    sincronizada não tem seq nem frame_id).
+
+    Atributos:
+        _pathFile (str): Caminho do ficheiro de saída.
+        _tipo (str): 'trajetoria', 'temperatura' ou 'sincronizacao'.
+        _formato (str): 'parquet' ou 'npz'.
+        _linhasPorGrupo (int): Número máximo de linhas de cada grupo de linhas do Parquet.
+        _frameIds (TabelaFrameIds): Tabela dos frame_id de todas as colunas acrescentadas.
+        _escritor (ParquetWriter): Escritor do ficheiro Parquet (None até à primeira escrita).
+        _partes (list): Colunas acrescentadas e ainda não escritas (no formato npz, todas até Fechar).
+        _countPendentes (int): Número de linhas em _partes (só no formato Parquet).
+    """
+
+    FORMATOS = {'.parquet': 'parquet', '.pq': 'parquet', '.npz': 'npz'}
+    LINHAS_POR_GRUPO = 1_000_000
+
+    # Colunas de cada tipo: (nome no ficheiro, coluna de AcrescentarColunas, componente ou None)
+    COLUNAS = {
+        'trajetoria': (
+            ('seq', 'seq', None), ('tempoNs', 'tempoNs', None), ('frameId', 'frameIdCodigos', None),
+            ('x', 'posicoes', 0), ('y', 'posicoes', 1), ('z', 'posicoes', 2),
+            ('qw', 'quaternioes', 0), ('qx', 'quaternioes', 1), ('qy', 'quaternioes', 2), ('qz', 'quaternioes', 3),
+        ),
+        'temperatura': (
+            ('seq', 'seq', None), ('tempoNs', 'tempoNs', None), ('frameId', 'frameIdCodigos', None),
+            ('temperatura', 'temperaturas', None), ('variancia', 'variancias', None), ('fonte', 'fontes', None),
+        ),
+        'sincronizacao': (
+            ('tempoNs', 'tempoNs', None),
+            ('x', 'posicoes', 0), ('y', 'posicoes', 1), ('z', 'posicoes', 2),
+            ('qw', 'quaternioes', 0), ('qx', 'quaternioes', 1), ('qy', 'quaternioes', 2), ('qz', 'quaternioes', 3),
+            ('temperatura', 'temperaturas', None), ('variancia', 'variancias', None), ('valido', 'validos', None),
+        ),
+    }
+
+    # Chave dos metadados do Parquet (e do arquivo .npz) com o tipo dos dados
+    CHAVE_TIPO = 'tomsa.tipo'
+
+    def __init__(self, pathFile, tipo, linhasPorGrupo=LINHAS_POR_GRUPO) -> None:
+        if tipo not in self.COLUNAS:
+            raise ValueError(f"Tipo desconhecido: '{tipo}' (use um de {', '.join(self.COLUNAS)})")
+        self._pathFile = pathFile
+        self._tipo = tipo
+        self._formato = self.Formato(pathFile)
+        if self._formato == 'parquet':
+            # Falhar já, antes de ler ou converter dados, se faltar o pyarrow
+            self._Pyarrow()
+        self._linhasPorGrupo = max(1, int(linhasPorGrupo))
+        self._frameIds = TabelaFrameIds()
+        self._escritor = None
+        self._partes = []
+        self._countPendentes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        self.Fechar()
+        return False
+
+    @classmethod
+    def Formato(cls, pathFile):
+        """
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro.
+
+        Retorna:
+            str: 'parquet' ou 'npz', segundo a extensão.
+
+        Exceções:
+            ValueError: Se a extensão não corresponder a nenhum formato suportado.
+        """
+        extensao = os.path.splitext(pathFile)[1].lower()
+        if extensao not in cls.FORMATOS:
+            raise ValueError(f"Formato de exportação desconhecido: '{extensao}' (use {', '.join(cls.FORMATOS)})")
+        return cls.FORMATOS[extensao]
+
+    def Acrescentar(self, colunas):
+        """
+        Acrescenta colunas ao ficheiro.
+
+        Parâmetros:
+            colunas (dict): Colunas no formato de AcrescentarColunas (incluindo 'frameIds'), ou
+                a tabela devolvida por Sincronizacao.Reamostrar.
+        """
+        if 'frameIdCodigos' in colunas:
+            codigos = self._frameIds.Fundir(colunas['frameIds'], colunas['frameIdCodigos'])
+            colunas = dict(colunas, frameIdCodigos=codigos)
+        self._partes.append(colunas)
+        if self._formato == 'npz':
+            return
+
+        self._countPendentes += len(colunas['tempoNs'])
+        if self._countPendentes >= self._linhasPorGrupo:
+            self._EscreverPendentes(final=False)
+
+    def _EscreverPendentes(self, final):
+        """Escreve as linhas pendentes em grupos completos; no fim (final), também o último grupo incompleto."""
+        nomesColunas = {coluna for _, coluna, _ in self.COLUNAS[self._tipo]}
+        if len(self._partes) == 1:
+            colunas = self._partes[0]
+        else:
+            colunas = {nome: np.concatenate([parte[nome] for parte in self._partes]) for nome in nomesColunas}
+        n = self._countPendentes
+        escritas = n if final else n - n % self._linhasPorGrupo
+        for inicio in range(0, escritas, self._linhasPorGrupo):
+            self._EscreverGrupo(colunas, inicio, min(escritas, inicio + self._linhasPorGrupo))
+        self._partes = [{nome: colunas[nome][escritas:] for nome in nomesColunas}] if escritas < n else []
+        self._countPendentes = n - escritas
+
+    @staticmethod
+    def _Pyarrow():
+        """
+        Importa o pyarrow, que só é necessário para o formato Parquet.
+
+        Retorna:
+            tuple: Módulos pyarrow e pyarrow.parquet.
+
+        Exceções:
+            ImportError: Se o pacote pyarrow não estiver instalado.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("O formato Parquet requer o pacote pyarrow: instale-o ou use a extensão .npz.") from None
+        return pyarrow, pyarrow.parquet
+
+    def _EscreverGrupo(self, colunas, inicio, fim):
+        """Escreve um grupo de linhas do Parquet a partir das linhas [inicio, fim) das colunas."""
+        pa, pq = self._Pyarrow()
+
+        if self._escritor is None:
+            self._escritor = pq.ParquetWriter(self._pathFile, self._Esquema())
+
+        nomes = pa.array(self._frameIds.nomes, type=pa.string())
+        arrays = []
+        for _, coluna, componente in self.COLUNAS[self._tipo]:
+            if coluna == 'frameIdCodigos':
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(colunas[coluna][inicio:fim], type=pa.int32()), nomes))
+            elif componente is None:
+                arrays.append(pa.array(colunas[coluna][inicio:fim]))
+            else:
+                arrays.append(pa.array(colunas[coluna][inicio:fim, componente]))
+        self._escritor.write_table(pa.Table.from_arrays(arrays, schema=self._Esquema()), row_group_size=self._linhasPorGrupo)
+
+    def _Esquema(self):
+        """Esquema Arrow das colunas do tipo de dados, com o tipo nos metadados."""
+        pa, _ = self._Pyarrow()
+
+        tipos = {'seq': pa.int64(), 'tempoNs': pa.int64(), 'frameId': pa.dictionary(pa.int32(), pa.string()),
+                 'fonte': pa.int32(), 'valido': pa.bool_()}
+        return pa.schema([(nome, tipos.get(nome, pa.float64())) for nome, _, _ in self.COLUNAS[self._tipo]],
+                         metadata={self.CHAVE_TIPO: self._tipo})
+
+    def Fechar(self):
+        """Termina a escrita do ficheiro (um ficheiro sem linhas também é escrito)."""
+        if self._formato == 'npz':
+            self._GuardarNpz()
+            return
+        if self._partes:
+            self._EscreverPendentes(final=True)
+        if self._escritor is None:
+            # Nenhuma linha: escrever um ficheiro só com o esquema
+            _, pq = self._Pyarrow()
+            self._escritor = pq.ParquetWriter(self._pathFile, self._Esquema())
+        self._escritor.close()
+
+    def _GuardarNpz(self):
+        """Junta as colunas acrescentadas e escreve o arquivo .npz."""
+        nomesColunas = {coluna for _, coluna, _ in self.COLUNAS[self._tipo]}
+        if len(self._partes) == 1:
+            arrays = {nome: self._partes[0][nome] for nome in nomesColunas}
+        else:
+            vazias = self._ColunasVazias(self._tipo)
+            arrays = {nome: np.concatenate([vazias[nome]] + [parte[nome] for parte in self._partes]) for nome in nomesColunas}
+        self._partes = []
+        if 'frameIdCodigos' in nomesColunas:
+            arrays['frameIds'] = np.array(self._frameIds.nomes, dtype=str)
+        np.savez(self._pathFile, **{self.CHAVE_TIPO: np.array(self._tipo)}, **arrays)
+
+    @staticmethod
+    def _ColunasVazias(tipo):
+        """Colunas vazias de um tipo de dados, com os tipos das colunas de AcrescentarColunas."""
+        colunas = {'tempoNs': np.empty(0, dtype=np.int64)}
+        if tipo != 'sincronizacao':
+            colunas['seq'] = np.empty(0, dtype=np.int64)
+            colunas['frameIdCodigos'] = np.empty(0, dtype=np.int32)
+        if tipo != 'temperatura':
+            colunas['posicoes'] = np.empty((0, 3), dtype=np.float64)
+            colunas['quaternioes'] = np.empty((0, 4), dtype=np.float64)
+        if tipo != 'trajetoria':
+            colunas['temperaturas'] = np.empty(0, dtype=np.float64)
+            colunas['variancias'] = np.empty(0, dtype=np.float64)
+        if tipo == 'temperatura':
+            colunas['fontes'] = np.empty(0, dtype=np.int32)
+        if tipo == 'sincronizacao':
+            colunas['validos'] = np.empty(0, dtype=bool)
+        return colunas
+
+    @classmethod
+    def Carregar(cls, pathFile):
+        """
+        Lê um ficheiro exportado.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro (.parquet ou .npz).
+
+        Retorna:
+            tuple: (tipo, colunas), com tipo 'trajetoria', 'temperatura' ou 'sincronizacao' e as
+            colunas no formato de AcrescentarColunas (incluindo 'frameIds') ou de Sincronizacao.Reamostrar.
+
+        Exceções:
+            ValueError: Se o ficheiro não tiver sido escrito por Exportacao.
+            ImportError: Se o ficheiro for Parquet e o pacote pyarrow não estiver instalado.
+        """
+        if cls.Formato(pathFile) == 'npz':
+            with np.load(pathFile) as arquivo:
+                if cls.CHAVE_TIPO not in arquivo.files:
+                    raise ValueError(f"O ficheiro {pathFile} não foi exportado por Exportacao")
+                tipo = str(arquivo[cls.CHAVE_TIPO])
+                colunas = {nome: arquivo[nome] for nome in arquivo.files if nome not in (cls.CHAVE_TIPO, 'frameIds')}
+                if 'frameIds' in arquivo.files:
+                    colunas['frameIds'] = arquivo['frameIds'].tolist()
+            return tipo, colunas
+
+        pa, pq = cls._Pyarrow()
+        import pyarrow.compute as pc
+
+        tabela = pq.read_table(pathFile)
+        metadados = tabela.schema.metadata or {}
+        tipo = metadados.get(cls.CHAVE_TIPO.encode(), b'').decode()
+        if tipo not in cls.COLUNAS:
+            raise ValueError(f"O ficheiro {pathFile} não foi exportado por Exportacao (tipo '{tipo}')")
+
+        colunas = cls._ColunasVazias(tipo)
+        if 'frameIdCodigos' in colunas:
+            # frame_id: um dicionário comum a todos os grupos de linhas
+            frameId = tabela.column('frameId')
+            if not pa.types.is_dictionary(frameId.type):
+                frameId = pc.dictionary_encode(frameId)
+            frameId = frameId.unify_dictionaries()
+            codigos = [parte.indices.to_numpy(zero_copy_only=False) for parte in frameId.chunks]
+            colunas['frameIdCodigos'] = np.concatenate([colunas['frameIdCodigos']] + codigos).astype(np.int32, copy=False)
+            colunas['frameIds'] = frameId.chunk(0).dictionary.to_pylist() if frameId.num_chunks else []
+        componentes = {}
+        for nome, coluna, componente in cls.COLUNAS[tipo]:
+            if coluna == 'frameIdCodigos':
+                continue
+            valores = tabela.column(nome).to_numpy()
+            if componente is None:
+                colunas[coluna] = valores.astype(colunas[coluna].dtype, copy=False)
+            else:
+                componentes.setdefault(coluna, []).append(valores)
+        for coluna, valores in componentes.items():
+            colunas[coluna] = np.column_stack(valores).astype(np.float64, copy=False).reshape(len(tabela), len(valores))
+        return tipo, colunas
@@ -0,0 +1,90 @@
+import bz2
+import gzip
+import lzma
+
+class FicheiroLog:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe FicheiroLog no âmbito da u.c. TOMSA
+
+    Acesso aos ficheiros de log, em texto ou comprimidos. O formato de compressão (gzip,
+    bzip2, xz ou zstd) é detetado pelos primeiros bytes do ficheiro, independentemente da
+    extensão, e o conteúdo é descomprimido em fluxo, sem ficheiros temporários. O suporte
+    para zstd requer o pacote opcional zstandard, que só é importado quando é necessário.
+    """
+
+    # Primeiros bytes de cada formato de compressão
+    ASSINATURAS = {
+        'gzip': b'\x1f\x8b',
+        'bz2': b'BZh',
+        'xz': b'\xfd7zXZ\x00',
+        'zstd': b'\x28\xb5\x2f\xfd',
+    }
+
+    @staticmethod
+    def Compressao(pathFile):
+        """
+        Deteta o formato de compressão de um ficheiro.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro.
+
+        Retorna:
+            str: 'gzip', 'bz2', 'xz' ou 'zstd', ou None se o ficheiro não estiver comprimido.
+        """
+        with open(pathFile, 'rb') as f:
+            inicio = f.read(6)
+        for formato, assinatura in FicheiroLog.ASSINATURAS.items():
+            if inicio.startswith(assinatura):
+                return formato
+        return None
+
+    @staticmethod
+    def Abrir(pathFile):
+        """
+        Abre um ficheiro de log para leitura binária, descomprimindo-o em fluxo se necessário.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro.
+
+        Retorna:
+            Objeto de ficheiro binário com o conteúdo descomprimido.
+
+        Exceções:
+            ImportError: Se o ficheiro estiver comprimido com zstd e o pacote zstandard não estiver instalado.
+        """
+        formato = FicheiroLog.Compressao(pathFile)
+        if formato == 'gzip':
+            return gzip.open(pathFile, 'rb')
+        if formato == 'bz2':
+            return bz2.open(pathFile, 'rb')
+        if formato == 'xz':
+            return lzma.open(pathFile, 'rb')
+        if formato == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError(f"O ficheiro {pathFile} está comprimido com zstd: instale o pacote zstandard para o ler.") from None
+            return zstandard.ZstdDecompressor().stream_reader(open(pathFile, 'rb'), closefd=True)
+        return open(pathFile, 'rb')
+
+    @staticmethod
+    def Validar(pathFile):
+        """
+        Verifica se um ficheiro de log pode ser aberto e descomprimido, lendo o seu início.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro.
+
+        Exceções:
+            FileNotFoundError: Se o ficheiro não existir.
+            IOError: Se o ficheiro não puder ser lido ou descomprimido.
+            ImportError: Se faltar o pacote necessário para o descomprimir.
+        """
+        try:
+            with FicheiroLog.Abrir(pathFile) as f:
+                f.read(1)
+        except (EOFError, lzma.LZMAError) as erro:
+            # Ficheiro comprimido truncado ou corrompido
+            raise IOError(str(erro)) from erro
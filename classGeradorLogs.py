@@ -0,0 +1,168 @@
+import numpy as np
+from classQuaternioes import Quaternioes
+
+class GeradorLogs:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe GeradorLogs no âmbito da u.c. TOMSA
+
+    Gerador de ficheiros de log sintéticos, no mesmo formato em disco dos logs de exemplo
+    (pose como logs/drone1.txt, temperatura como logs/temperature_drone.txt), para medir o
+    desempenho da leitura e do processamento com qualquer número de mensagens. As mensagens
+    são geradas e escritas por blocos, por isso a memória usada não depende do tamanho do log.
+    Com a mesma semente, os ficheiros gerados são sempre iguais.
+
+    A trajetória é uma curva suave (soma de sinusoides) com a orientação a seguir a direção
+    do movimento; a temperatura varia lentamente com ruído. As mensagens de temperatura têm
+    o instante da pose correspondente mais um pequeno desfasamento, como nos logs reais.
+
+    Atributos:
+        _semente (int): Semente do gerador de números aleatórios.
+        _taxaCorrupcao (float): Fração de mensagens corrompidas (valor inválido, campo em falta ou mensagem truncada).
+        _jitterNs (int): Desvio padrão, em nanosegundos, do ruído somado aos instantes.
+        _periodoNs (int): Intervalo nominal entre mensagens, em nanosegundos.
+        _tamanhoBloco (int): Número de mensagens geradas de cada vez.
+    """
+
+    # Primeiro instante e desfasamento das temperaturas em relação às poses (como nos logs de exemplo)
+    INICIO_NS = 1693405729_897180140
+    DESFASAMENTO_TEMPERATURA_NS = 3600
+
+    _MODELO_POSE = (
+        "header: \n"
+        "  seq: {seq}\n"
+        "  stamp: \n"
+        "    secs: {secs}\n"
+        "    nsecs: {nsecs}\n"
+        "  frame_id: \"map\"\n"
+        "pose: \n"
+        "  position: \n"
+        "    x: {x!r}\n"
+        "    y: {y!r}\n"
+        "    z: {z!r}\n"
+        "  orientation: \n"
+        "    x: {qx!r}\n"
+        "    y: {qy!r}\n"
+        "    z: {qz!r}\n"
+        "    w: {qw!r}\n"
+        "---\n"
+    )
+
+    _MODELO_TEMPERATURA = (
+        "header:\r\n"
+        "  frame_id: map\r\n"
+        "  seq: {seq}\r\n"
+        "  stamp:\r\n"
+        "    nsecs: {nsecs}\r\n"
+        "    secs: {secs}\r\n"
+        "temperature: {temperatura!r}\r\n"
+        "variance: {variancia!r}\r\n"
+        "---\r\n"
+    )
+
+    def __init__(self, semente=0, taxaCorrupcao=0.0, jitterNs=0, periodoNs=30_000_000, tamanhoBloco=100_000) -> None:
+        self._semente = semente
+        self._taxaCorrupcao = taxaCorrupcao
+        self._jitterNs = jitterNs
+        self._periodoNs = periodoNs
+        self._tamanhoBloco = tamanhoBloco
+
+    def EscreverPose(self, pathFile, n):
+        """
+        Escreve um log de pose com n mensagens.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro a escrever.
+            n (int): Número de mensagens.
+
+        Retorna:
+            int: Número de mensagens corrompidas.
+        """
+        return self._Escrever(pathFile, n, self._MODELO_POSE, self._ValoresPose, '\n', 1)
+
+    def EscreverTemperatura(self, pathFile, n):
+        """
+        Escreve um log de temperatura com n mensagens.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro a escrever.
+            n (int): Número de mensagens.
+
+        Retorna:
+            int: Número de mensagens corrompidas.
+        """
+        return self._Escrever(pathFile, n, self._MODELO_TEMPERATURA, self._ValoresTemperatura, '\r\n', 2)
+
+    def _Escrever(self, pathFile, n, modelo, valores, finalLinha, fluxo):
+        """Gera e escreve as mensagens por blocos; devolve o número de mensagens corrompidas."""
+        rng = np.random.default_rng([self._semente, fluxo])
+        countCorrompidas = 0
+        with open(pathFile, 'w', encoding='utf-8', newline='') as f:
+            for inicio in range(0, n, self._tamanhoBloco):
+                indices = np.arange(inicio, min(n, inicio + self._tamanhoBloco), dtype=np.int64)
+                colunas = valores(indices, rng)
+                nomes = list(colunas)
+                mensagens = [modelo.format(**dict(zip(nomes, linha))) for linha in zip(*(colunas[nome].tolist() for nome in nomes))]
+
+                if self._taxaCorrupcao > 0:
+                    corrompidas = np.flatnonzero(rng.random(len(mensagens)) < self._taxaCorrupcao)
+                    for i in corrompidas.tolist():
+                        mensagens[i] = self._Corromper(mensagens[i], rng, finalLinha)
+                    countCorrompidas += len(corrompidas)
+
+                f.write(''.join(mensagens))
+        return countCorrompidas
+
+    def _Tempos(self, indices, rng, desfasamentoNs=0):
+        """Instantes (secs, nsecs) das mensagens, com o ruído de _jitterNs."""
+        tempoNs = self.INICIO_NS + desfasamentoNs + indices * self._periodoNs
+        if self._jitterNs:
+            tempoNs = tempoNs + np.rint(rng.normal(0, self._jitterNs, len(indices))).astype(np.int64)
+        return np.divmod(tempoNs, 1_000_000_000)
+
+    def _ValoresPose(self, indices, rng):
+        """Colunas das mensagens de pose de um bloco, pela ordem dos campos do modelo."""
+        secs, nsecs = self._Tempos(indices, rng)
+        t = indices * (self._periodoNs / 1e9)
+
+        # Curva suave e orientação (yaw) segundo a direção do movimento
+        x = 20 * np.sin(t / 60) + 2 * np.sin(t / 7)
+        y = 15 * np.sin(t / 45) + 2 * np.cos(t / 9)
+        z = 5 + 3 * np.sin(t / 30)
+        dx = 20 / 60 * np.cos(t / 60) + 2 / 7 * np.cos(t / 7)
+        dy = 15 / 45 * np.cos(t / 45) - 2 / 9 * np.sin(t / 9)
+        angulos = np.stack([0.05 * np.sin(t / 5), 0.05 * np.cos(t / 4), np.arctan2(dy, dx)], axis=1)
+        q = Quaternioes.DeEuler(angulos)
+
+        return {
+            'seq': indices, 'secs': secs, 'nsecs': nsecs,
+            'x': x, 'y': y, 'z': z,
+            'qx': q[:, 1], 'qy': q[:, 2], 'qz': q[:, 3], 'qw': q[:, 0],
+        }
+
+    def _ValoresTemperatura(self, indices, rng):
+        """Colunas das mensagens de temperatura de um bloco."""
+        secs, nsecs = self._Tempos(indices, rng, self.DESFASAMENTO_TEMPERATURA_NS)
+        t = indices * (self._periodoNs / 1e9)
+        return {
+            'seq': indices, 'secs': secs, 'nsecs': nsecs,
+            'temperatura': 25 + 3 * np.sin(t / 120) + rng.normal(0, 0.3, len(indices)),
+            'variancia': rng.uniform(0.05, 0.1, len(indices)),
+        }
+
+    @staticmethod
+    def _Corromper(mensagem, rng, finalLinha):
+        """Corrompe uma mensagem: um valor inválido, uma linha em falta ou a mensagem truncada."""
+        linhas = mensagem.split(finalLinha)[:-1]
+        comValor = [i for i, linha in enumerate(linhas) if linha.rstrip().split(':', 1)[-1].strip()]
+        tipo = rng.integers(3)
+        i = comValor[rng.integers(len(comValor))]
+        if tipo == 0:
+            chave = linhas[i].split(':', 1)[0]
+            linhas[i] = f"{chave}: ?{rng.integers(1000)}x"
+        elif tipo == 1:
+            del linhas[i]
+        else:
+            linhas = linhas[:max(1, i)]
+        return finalLinha.join(linhas) + finalLinha
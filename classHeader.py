@@ -1,4 +1,4 @@
-import numpy as np
+import sys
 from classTempo import Tempo
 
 class Header:
@@ -15,10 +15,12 @@ class Header:
         _frame_id (str): ID do quadro de referência utilizado.
     """
     
+    __slots__ = ('_seq', '_stamp', '_frame_id')
+
     def __init__(self, seq: int, stamp: Tempo, frame_id: str) -> None:
         self._seq = seq  
         self._stamp = stamp
-        self._frame_id = frame_id
+        self._frame_id = Header._Internar(frame_id)
 
     def __str__(self):
         return f"Header(seq={self._seq}, stamp={self._stamp}, frame_id={self._frame_id})"
@@ -75,4 +77,9 @@ class Header:
         Parâmetros:
             frame_id (str): ID do quadro de referência.
         """
-        self._frame_id = frame_id
\ No newline at end of file
+        self._frame_id = Header._Internar(frame_id)
+
+    @staticmethod
+    def _Internar(frame_id):
+        """Devolve a cópia única (sys.intern) do frame_id, partilhada por todos os headers com o mesmo valor."""
+        return sys.intern(frame_id) if type(frame_id) is str else frame_id
\ No newline at end of file
@@ -0,0 +1,85 @@
+import numpy as np
+
+class IndiceEspacial:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe IndiceEspacial no âmbito da u.c. TOMSA
+
+    Índice espacial (KD-tree, scipy.spatial.cKDTree) sobre as posições de uma trajetória,
+    para consultas de vizinhos mais próximos, por raio e por caixa alinhada com os eixos
+    em O(log N + k), em vez de percorrer todos os pontos. Todas as consultas devolvem
+    índices das amostras nas colunas da trajetória. A árvore só é construída na primeira
+    consulta; o SciPy só é importado nesse momento.
+
+    Atributos:
+        _posicoes (np.ndarray): Posições indexadas (float64, Nx3).
+        _arvore (cKDTree): Árvore construída a pedido (None até à primeira consulta).
+    """
+
+    def __init__(self, posicoes) -> None:
+        self._posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 3)
+        self._arvore = None
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def _Arvore(self):
+        """Devolve a KD-tree das posições, construindo-a no primeiro acesso."""
+        if self._arvore is None:
+            from scipy.spatial import cKDTree
+            self._arvore = cKDTree(self._posicoes)
+        return self._arvore
+
+    def MaisProximos(self, pontos, k=1):
+        """
+        Procura as k amostras mais próximas de cada ponto dado.
+
+        Parâmetros:
+            pontos (array): Ponto (3,) ou pontos (M, 3) de consulta.
+            k (int): Número de vizinhos por ponto (default = 1).
+
+        Retorna:
+            tuple: (distancias, indices), com a forma (M, k), ou (k,) para um único ponto.
+            Se houver menos de k amostras, os lugares em falta têm distância infinita e índice len(self).
+        """
+        pontos = np.asarray(pontos, dtype=np.float64)
+        return self._Arvore().query(pontos, k=list(range(1, k + 1)))
+
+    def NoRaio(self, ponto, raio):
+        """
+        Procura as amostras a uma distância (euclidiana) de ponto não superior a raio.
+
+        Parâmetros:
+            ponto (array): Ponto de consulta (3,).
+            raio (float): Raio da esfera, em metros.
+
+        Retorna:
+            np.ndarray: Índices das amostras, por ordem crescente (intp).
+        """
+        indices = self._Arvore().query_ball_point(np.asarray(ponto, dtype=np.float64), raio)
+        return np.sort(np.asarray(indices, dtype=np.intp))
+
+    def NaCaixa(self, minimo, maximo):
+        """
+        Procura as amostras dentro de uma caixa alinhada com os eixos (limites incluídos).
+
+        Parâmetros:
+            minimo (array): Canto mínimo (x, y, z) da caixa.
+            maximo (array): Canto máximo (x, y, z) da caixa.
+
+        Retorna:
+            np.ndarray: Índices das amostras, por ordem crescente (intp).
+        """
+        minimo = np.asarray(minimo, dtype=np.float64)
+        maximo = np.asarray(maximo, dtype=np.float64)
+        if np.any(minimo > maximo):
+            return np.empty(0, dtype=np.intp)
+
+        # Candidatos: o cubo (norma do máximo) que contém a caixa; depois o filtro exato por eixo
+        centro = (minimo + maximo) / 2
+        semiLado = float(np.max(np.maximum(maximo - centro, centro - minimo)))
+        candidatos = np.asarray(self._Arvore().query_ball_point(centro, semiLado, p=np.inf), dtype=np.intp)
+        posicoes = self._posicoes[candidatos]
+        dentro = np.all((posicoes >= minimo) & (posicoes <= maximo), axis=1)
+        return np.sort(candidatos[dentro])
@@ -0,0 +1,90 @@
+import numpy as np
+
+class IndiceTempo:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe IndiceTempo no âmbito da u.c. TOMSA
+
+    Índice ordenado dos instantes (int64, em nanosegundos) das amostras de um contentor
+    (Trajetoria ou Temperatura), para consultas por tempo em O(log N) por pesquisa binária.
+    Se os instantes já estiverem ordenados (o caso habitual), o índice usa o próprio array,
+    sem cópias, e as consultas devolvem fatias (slice) que dão vistas das colunas. Caso
+    contrário guarda a ordenação estável das amostras e as consultas devolvem arrays de índices.
+    Quando o contentor já sabe que os instantes estão ordenados (ver Integridade), a verificação
+    da ordem é saltada.
+
+    Atributos:
+        _tempos (np.ndarray): Instantes ordenados (int64, N).
+        _ordem (np.ndarray): Índice original de cada instante ordenado, ou None se já estavam ordenados.
+    """
+
+    def __init__(self, tempoNs, ordenado=False) -> None:
+        """
+        Parâmetros:
+            tempoNs (array): Instantes das amostras, em nanosegundos (N).
+            ordenado (bool): Verdadeiro se já se sabe que os instantes não diminuem (default = False).
+        """
+        tempoNs = np.asarray(tempoNs, dtype=np.int64)
+        if not ordenado and np.any(tempoNs[1:] < tempoNs[:-1]):
+            self._ordem = np.argsort(tempoNs, kind='stable')
+            self._tempos = tempoNs[self._ordem]
+        else:
+            self._ordem = None
+            self._tempos = tempoNs
+
+    def __len__(self):
+        return len(self._tempos)
+
+    def Intervalo(self, t0, t1):
+        """
+        Amostras com instante t no intervalo t0 <= t < t1.
+
+        Parâmetros:
+            t0 (int): Início do intervalo, em nanosegundos.
+            t1 (int): Fim (exclusivo) do intervalo, em nanosegundos.
+
+        Retorna:
+            slice ou np.ndarray: Seleção das amostras, por ordem de tempo (slice se os instantes estavam ordenados).
+        """
+        inicio = int(np.searchsorted(self._tempos, t0, side='left'))
+        fim = max(inicio, int(np.searchsorted(self._tempos, t1, side='left')))
+        if self._ordem is None:
+            return slice(inicio, fim)
+        return self._ordem[inicio:fim]
+
+    def MaisProximo(self, t):
+        """
+        Amostra com o instante mais próximo de t (a mais antiga, em caso de empate).
+
+        Parâmetros:
+            t (int): Instante em nanosegundos.
+
+        Retorna:
+            int: Índice da amostra nas colunas do contentor, ou None se não houver amostras.
+        """
+        if len(self._tempos) == 0:
+            return None
+        direita = min(int(np.searchsorted(self._tempos, t, side='left')), len(self._tempos) - 1)
+        esquerda = int(np.searchsorted(self._tempos, self._tempos[max(direita - 1, 0)], side='left'))
+        if abs(int(self._tempos[esquerda]) - t) <= abs(int(self._tempos[direita]) - t):
+            posicao = esquerda
+        else:
+            posicao = direita
+        return posicao if self._ordem is None else int(self._ordem[posicao])
+
+    @property
+    def tempos(self):
+        """
+        Retorna:
+            np.ndarray: Instantes ordenados (int64, N).
+        """
+        return self._tempos
+
+    @property
+    def ordem(self):
+        """
+        Retorna:
+            np.ndarray: Índice original de cada instante ordenado, ou None se os instantes já estavam ordenados.
+        """
+        return self._ordem
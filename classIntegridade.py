@@ -0,0 +1,236 @@
+import numpy as np
+
+class Integridade:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Integridade no âmbito da u.c. TOMSA
+
+    Verificação da integridade das mensagens de um ficheiro de log, pelas colunas seq e
+    tempoNs, à medida que são lidas. As mensagens são comparadas com a anterior, pela ordem
+    do ficheiro, em operações vetorizadas por pedaço (a última mensagem de um pedaço é
+    guardada para comparar com a primeira do seguinte), por isso a verificação pode ser
+    feita por pedaços sem ter o ficheiro todo em memória. São contados:
+        - lacunas: saltos de seq maiores do que 1 e o número de mensagens em falta;
+        - duplicadas: mensagens com o mesmo seq e o mesmo instante da anterior;
+        - recuos de seq: seq menor do que o da mensagem anterior;
+        - instantes fora de ordem: instante anterior ao da mensagem anterior;
+        - instantes repetidos: o mesmo instante da mensagem anterior com outro seq;
+        - quebras: intervalos entre mensagens maiores do que intervaloMaximo (por omissão,
+          FATOR_QUEBRA vezes a mediana dos intervalos do primeiro pedaço).
+
+    As mensagens podem ser ordenadas por tempo e as duplicadas removidas com Ordenar.
+
+    Atributos:
+        _nome (str): Nome do ficheiro verificado, usado no relatório.
+        _intervaloMaximo (int): Intervalo, em nanosegundos, acima do qual há uma quebra (None até ser conhecido).
+        _count (int): Número de mensagens verificadas.
+        _ultima (tuple): seq e instante da última mensagem verificada (None se ainda não houver).
+        _lacunas (int): Número de saltos de seq.
+        _perdidas (int): Número de mensagens em falta nos saltos de seq.
+        _maioresLacunas (list): Os MAXIMO_EXEMPLOS saltos com mais mensagens em falta, como (seq anterior, seq seguinte).
+        _duplicadas (int): Número de mensagens iguais à anterior.
+        _recuosSeq (int): Número de mensagens com seq menor do que o da anterior.
+        _foraDeOrdem (int): Número de mensagens com instante anterior ao da anterior.
+        _temposRepetidos (int): Número de mensagens com o instante da anterior e outro seq.
+        _quebras (int): Número de intervalos maiores do que _intervaloMaximo.
+        _maiorIntervalo (int): Maior intervalo entre mensagens consecutivas, em nanosegundos.
+    """
+
+    # Múltiplo da mediana dos intervalos acima do qual um intervalo é uma quebra
+    FATOR_QUEBRA = 5
+    # Número de lacunas indicadas no relatório
+    MAXIMO_EXEMPLOS = 3
+
+    def __init__(self, nome="", intervaloMaximo=None) -> None:
+        self._nome = nome
+        self._intervaloMaximo = intervaloMaximo
+        self._count = 0
+        self._ultima = None
+        self._lacunas = 0
+        self._perdidas = 0
+        self._maioresLacunas = []
+        self._duplicadas = 0
+        self._recuosSeq = 0
+        self._foraDeOrdem = 0
+        self._temposRepetidos = 0
+        self._quebras = 0
+        self._maiorIntervalo = 0
+
+    def Acrescentar(self, seq, tempoNs):
+        """
+        Verifica as mensagens seguintes do ficheiro.
+
+        Parâmetros:
+            seq (array): Sequência de cada mensagem, pela ordem do ficheiro (N).
+            tempoNs (array): Instante de cada mensagem em nanosegundos (N).
+        """
+        seq = np.asarray(seq, dtype=np.int64)
+        tempoNs = np.asarray(tempoNs, dtype=np.int64)
+        if len(tempoNs) == 0:
+            return
+        self._count += len(tempoNs)
+        ultima = (seq[-1], tempoNs[-1])
+        if self._ultima is not None:
+            seq = np.concatenate([[self._ultima[0]], seq])
+            tempoNs = np.concatenate([[self._ultima[1]], tempoNs])
+        self._ultima = ultima
+
+        saltos = np.diff(seq)
+        intervalos = np.diff(tempoNs)
+        if len(intervalos) == 0:
+            return
+
+        lacunas = np.flatnonzero(saltos > 1)
+        self._lacunas += len(lacunas)
+        self._perdidas += int(np.sum(saltos[lacunas] - 1))
+        if len(lacunas):
+            maiores = lacunas[np.argsort(-saltos[lacunas], kind='stable')[:self.MAXIMO_EXEMPLOS]]
+            exemplos = self._maioresLacunas + [(int(seq[i]), int(seq[i + 1])) for i in maiores]
+            self._maioresLacunas = sorted(exemplos, key=lambda lacuna: lacuna[0] - lacuna[1])[:self.MAXIMO_EXEMPLOS]
+
+        mesmoInstante = intervalos == 0
+        self._duplicadas += int(np.count_nonzero(mesmoInstante & (saltos == 0)))
+        self._temposRepetidos += int(np.count_nonzero(mesmoInstante & (saltos != 0)))
+        self._recuosSeq += int(np.count_nonzero(saltos < 0))
+        self._foraDeOrdem += int(np.count_nonzero(intervalos < 0))
+
+        if self._intervaloMaximo is None:
+            positivos = intervalos[intervalos > 0]
+            if len(positivos):
+                self._intervaloMaximo = int(np.median(positivos)) * self.FATOR_QUEBRA
+        if self._intervaloMaximo is not None:
+            self._quebras += int(np.count_nonzero(intervalos > self._intervaloMaximo))
+        self._maiorIntervalo = max(self._maiorIntervalo, int(intervalos.max()))
+
+    def Verificar(self, pedacos):
+        """
+        Verifica os pedaços de colunas à medida que passam, sem os alterar.
+
+        Parâmetros:
+            pedacos: Iterável de tuplos (colunas, countPontosValidos, countPontosTotal), como os de LeitorLog.LerPedacos.
+
+        Retorna:
+            Gerador dos mesmos tuplos.
+        """
+        for pedaco in pedacos:
+            self.Acrescentar(pedaco[0]['seq'], pedaco[0]['tempoNs'])
+            yield pedaco
+
+    @staticmethod
+    def Ordenar(tempoNs, seq, deduplicar=True, grupos=None):
+        """
+        Seleção que ordena as mensagens por tempo, de forma estável (as mensagens com o mesmo
+        instante ficam pela ordem original), e remove as duplicadas, em O(N log N).
+
+        Parâmetros:
+            tempoNs (array): Instante de cada mensagem em nanosegundos (N).
+            seq (array): Sequência de cada mensagem (N).
+            deduplicar (bool): Remover as mensagens com o mesmo instante e seq (e grupo) de uma
+                anterior; fica a primeira (default = True).
+            grupos (array): Grupo de cada mensagem (N), por exemplo a fonte; só são duplicadas
+                as mensagens do mesmo grupo. Por omissão, um só grupo.
+
+        Retorna:
+            tuple: (selecao, countDuplicadas), com selecao os índices das mensagens a manter, por
+            ordem de tempo (np.ndarray), e countDuplicadas o número de mensagens removidas.
+        """
+        tempoNs = np.asarray(tempoNs, dtype=np.int64)
+        selecao = np.argsort(tempoNs, kind='stable')
+        ordenados = tempoNs[selecao]
+        # Só pode haver duplicadas entre mensagens com o mesmo instante
+        if not deduplicar or not np.any(ordenados[1:] == ordenados[:-1]):
+            return selecao, 0
+
+        # As chaves iguais ficam seguidas, pela ordem original (a última chave do lexsort é a principal)
+        chaves = [np.arange(len(tempoNs)), np.asarray(seq)] + ([np.asarray(grupos)] if grupos is not None else []) + [tempoNs]
+        ordem = np.lexsort(chaves)
+        iguais = np.ones(len(ordem) - 1, dtype=bool)
+        for chave in chaves[1:]:
+            ordenada = chave[ordem]
+            iguais &= ordenada[1:] == ordenada[:-1]
+        if not iguais.any():
+            return selecao, 0
+        duplicadas = np.zeros(len(tempoNs), dtype=bool)
+        duplicadas[ordem[1:][iguais]] = True
+        selecao = selecao[~duplicadas[selecao]]
+        return selecao, len(tempoNs) - len(selecao)
+
+    def Relatorio(self):
+        """
+        Retorna:
+            str: Resumo, numa linha, dos problemas encontrados.
+        """
+        problemas = []
+        if self._lacunas:
+            exemplos = ", ".join(f"{anterior}->{seguinte}" for anterior, seguinte in self._maioresLacunas)
+            problemas.append(f"{self._lacunas} lacunas de seq ({self._perdidas} mensagens em falta; maiores: {exemplos})")
+        if self._duplicadas:
+            problemas.append(f"{self._duplicadas} mensagens duplicadas")
+        if self._recuosSeq:
+            problemas.append(f"{self._recuosSeq} recuos de seq")
+        if self._foraDeOrdem:
+            problemas.append(f"{self._foraDeOrdem} instantes fora de ordem")
+        if self._temposRepetidos:
+            problemas.append(f"{self._temposRepetidos} instantes repetidos")
+        if self._quebras:
+            problemas.append(f"{self._quebras} quebras de mais de {self._intervaloMaximo / 1e9:.3f} s "
+                             f"(a maior de {self._maiorIntervalo / 1e9:.3f} s)")
+        resumo = "; ".join(problemas) if problemas else "sem lacunas, duplicadas nem instantes fora de ordem"
+        return f"Integridade do ficheiro {self._nome}, {self._count} mensagens: {resumo}"
+
+    @property
+    def nome(self):
+        """
+        Retorna:
+            str: Nome do ficheiro verificado.
+        """
+        return self._nome
+
+    @property
+    def count(self):
+        """
+        Retorna:
+            int: Número de mensagens verificadas.
+        """
+        return self._count
+
+    @property
+    def ordenado(self):
+        """
+        Retorna:
+            bool: Verdadeiro se os instantes das mensagens verificadas não diminuem.
+        """
+        return self._foraDeOrdem == 0
+
+    @property
+    def lacunas(self):
+        """
+        Retorna:
+            tuple: (número de saltos de seq, número de mensagens em falta).
+        """
+        return self._lacunas, self._perdidas
+
+    @property
+    def duplicadas(self):
+        """
+        Retorna:
+            int: Número de mensagens com o mesmo seq e instante da anterior.
+        """
+        return self._duplicadas
+
+    @property
+    def foraDeOrdem(self):
+        """
+        Retorna:
+            int: Número de mensagens com instante anterior ao da mensagem anterior.
+        """
+        return self._foraDeOrdem
+
+    @property
+    def quebras(self):
+        """
+        Retorna:
+            int: Número de intervalos entre mensagens maiores do que o intervalo máximo.
+        """
+        return self._quebras
@@ -0,0 +1,127 @@
+import heapq
+import numpy as np
+from classTabelaFrameIds import TabelaFrameIds
+
+class IntercalacaoTemporal:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe IntercalacaoTemporal no âmbito da u.c. TOMSA
+
+    Intercalação (k-way merge) de várias fontes de mensagens do mesmo tipo (por exemplo, os
+    logs de várias sondas de temperatura), cada uma já ordenada por tempo, numa única série
+    ordenada por tempo com a coluna fontes (índice da fonte de cada mensagem).
+
+    Cada fonte é lida por pedaços de colunas (por exemplo, LeitorLog.LerPedacos) e só é
+    mantido em memória o pedaço atual de cada fonte. Um heap guarda as fontes pelo instante
+    da última mensagem do seu pedaço atual: o menor desses instantes é um limite até ao qual
+    todas as mensagens de todas as fontes já foram lidas. Em cada passo são intercaladas (por
+    ordenação estável, vetorizada) as mensagens antes desse limite, e as fontes cujo pedaço
+    terminou no limite leem o pedaço seguinte, a seguir às mensagens que lhes restam. A memória
+    fica assim limitada pelo número de fontes vezes o tamanho de um pedaço (mais as mensagens
+    de um mesmo instante), e não pelo número total de mensagens. Mensagens com o mesmo
+    instante ficam pela ordem das fontes e, na mesma fonte, pela ordem original.
+
+    Os pedaços de uma fonte que não estejam ordenados são ordenados; se uma fonte voltar atrás
+    no tempo entre pedaços, é mostrado um aviso e as suas mensagens atrasadas saem depois de
+    mensagens posteriores já intercaladas, por isso o resultado deixa de estar todo ordenado.
+
+    Atributos:
+        _fontes (list): Iteradores de tuplos (colunas, countPontosValidos, countPontosTotal) de cada fonte.
+        _frameIds (TabelaFrameIds): Tabela comum dos frame_id de todas as fontes.
+        _contagens (list): Mensagens válidas e total de mensagens lidas de cada fonte.
+    """
+
+    def __init__(self, fontes) -> None:
+        """
+        Parâmetros:
+            fontes (list): Para cada fonte, um iterável de tuplos (colunas, countPontosValidos,
+                countPontosTotal), como os de LeitorLog.LerPedacos, pela ordem dos índices das fontes.
+        """
+        self._fontes = [iter(fonte) for fonte in fontes]
+        self._frameIds = TabelaFrameIds()
+        self._contagens = [[0, 0] for _ in self._fontes]
+
+    def __iter__(self):
+        """
+        Retorna:
+            Gerador de dicionários de colunas intercaladas, com a coluna fontes (int32) e 'frameIds'
+            (a tabela comum, que só cresce, por isso os códigos dos pedaços anteriores continuam válidos).
+        """
+        pedacos = [None] * len(self._fontes)
+        ultimos = [None] * len(self._fontes)
+        heap = []
+        for fonte in range(len(self._fontes)):
+            self._Avancar(fonte, pedacos, ultimos, heap)
+
+        while True:
+            # Só saem as mensagens antes do limite: as do próprio limite esperam que todas as fontes
+            # terminadas nele leiam o pedaço seguinte, para os empates ficarem pela ordem das fontes
+            limite = heap[0][0] if heap else None
+            partes = []
+            for fonte, pedaco in enumerate(pedacos):
+                if pedaco is None:
+                    continue
+                corte = len(pedaco['tempoNs']) if limite is None else int(np.searchsorted(pedaco['tempoNs'], limite, side='left'))
+                if corte > 0:
+                    partes.append({nome: coluna[:corte] for nome, coluna in pedaco.items()})
+                    pedacos[fonte] = {nome: coluna[corte:] for nome, coluna in pedaco.items()}
+            if partes:
+                yield self._Intercalar(partes)
+            if not heap:
+                break
+
+            # As fontes cujo pedaço terminou no limite leem o pedaço seguinte (só depois de as retirar
+            # todas do heap, para um pedaço novo que também termine no limite não ser lido já)
+            esgotadas = []
+            while heap and heap[0][0] <= limite:
+                esgotadas.append(heapq.heappop(heap)[1])
+            for fonte in esgotadas:
+                self._Avancar(fonte, pedacos, ultimos, heap)
+
+    def _Avancar(self, fonte, pedacos, ultimos, heap):
+        """Lê o próximo pedaço não vazio de uma fonte, a seguir ao que resta do anterior, e coloca-a no heap (se não terminou)."""
+        for colunas, countValidos, countTotal in self._fontes[fonte]:
+            self._contagens[fonte][0] += countValidos
+            self._contagens[fonte][1] += countTotal
+            tempoNs = colunas['tempoNs']
+            if len(tempoNs) == 0:
+                continue
+
+            pedaco = {nome: coluna for nome, coluna in colunas.items() if nome != 'frameIds'}
+            pedaco['frameIdCodigos'] = self._frameIds.Fundir(colunas['frameIds'], colunas['frameIdCodigos'])
+            pedaco['fontes'] = np.full(len(tempoNs), fonte, dtype=np.int32)
+            if np.any(tempoNs[1:] < tempoNs[:-1]):
+                ordem = np.argsort(tempoNs, kind='stable')
+                pedaco = {nome: coluna[ordem] for nome, coluna in pedaco.items()}
+            if ultimos[fonte] is not None and pedaco['tempoNs'][0] < ultimos[fonte]:
+                print(f"Aviso: a fonte {fonte} não está ordenada por tempo; o resultado da intercalação pode não ficar ordenado.")
+
+            # As mensagens do pedaço anterior que ficaram no limite passam para o início deste
+            if pedacos[fonte] is not None and len(pedacos[fonte]['tempoNs']):
+                pedaco = {nome: np.concatenate([pedacos[fonte][nome], coluna]) for nome, coluna in pedaco.items()}
+
+            ultimo = int(pedaco['tempoNs'][-1])
+            ultimos[fonte] = ultimo
+            pedacos[fonte] = pedaco
+            heapq.heappush(heap, (ultimo, fonte))
+            return
+
+    def _Intercalar(self, partes):
+        """Junta as partes (uma por fonte, cada uma ordenada) numa só, ordenada por tempo e, em empate, pela fonte."""
+        if len(partes) == 1:
+            colunas = partes[0]
+        else:
+            colunas = {nome: np.concatenate([parte[nome] for parte in partes]) for nome in partes[0]}
+            ordem = np.argsort(colunas['tempoNs'], kind='stable')
+            colunas = {nome: coluna[ordem] for nome, coluna in colunas.items()}
+        colunas['frameIds'] = self._frameIds
+        return colunas
+
+    @property
+    def contagens(self):
+        """
+        Retorna:
+            list: Tuplo (countPontosValidos, countPontosTotal) de cada fonte, com as mensagens lidas até ao momento.
+        """
+        return [tuple(contagem) for contagem in self._contagens]
@@ -0,0 +1,126 @@
+import numpy as np
+
+class InterpolacaoArco:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe InterpolacaoArco no âmbito da u.c. TOMSA
+
+    Interpolação de uma grandeza (por exemplo, a temperatura) ao longo de um percurso 3D,
+    parametrizada pelo comprimento de arco. O comprimento de arco acumulado é calculado uma
+    vez para todos os pontos, é ajustado um único interpolador da grandeza ao longo dele e as
+    posições e os valores são avaliados em todas as amostras de uma só vez. As posições
+    interpoladas ficam sobre a linha poligonal dos pontos; os pontos repetidos (segmentos de
+    comprimento nulo) são ignorados, tal como na interpolação segmento a segmento original:
+    o segmento que chega a uma posição repetida termina no valor da primeira amostra dessa
+    posição e o segmento seguinte começa no valor da última.
+
+    As amostras são escolhidas por uma de três densidades:
+        - amostrasSegmento pontos igualmente espaçados em cada segmento, incluindo os extremos
+          (a densidade original, com 10 pontos por segmento);
+        - passoDistancia: um ponto a cada passoDistancia metros ao longo do percurso;
+        - passoTempo: um ponto a cada passoTempo segundos (requer os instantes dos pontos).
+
+    Métodos de interpolação da grandeza:
+        'linear': interpolação linear por segmento (igual a uma spline cúbica com dois nós por
+                  segmento, como no original, incluindo os valores nas posições repetidas);
+        'pchip' : interpolação cúbica monótona por troços (sem oscilações além dos valores dados);
+        'cubica': spline cúbica natural global.
+    Como pchip e cubica são contínuas, nas posições repetidas usam só o valor da última amostra.
+
+    Atributos:
+        _metodo (str): Método de interpolação da grandeza.
+        _amostrasSegmento (int): Número de amostras por segmento.
+        _passoDistancia (float): Distância entre amostras em metros (None se não for usada).
+        _passoTempo (float): Intervalo entre amostras em segundos (None se não for usado).
+    """
+
+    METODOS = ('linear', 'pchip', 'cubica')
+
+    def __init__(self, metodo='pchip', amostrasSegmento=10, passoDistancia=None, passoTempo=None) -> None:
+        if metodo not in self.METODOS:
+            raise ValueError(f"Método de interpolação desconhecido: '{metodo}' (use um de {self.METODOS})")
+        if passoDistancia is not None and passoTempo is not None:
+            raise ValueError("Use passoDistancia ou passoTempo, não os dois")
+        if (passoDistancia is not None and passoDistancia <= 0) or (passoTempo is not None and passoTempo <= 0):
+            raise ValueError("O passo de interpolação tem de ser positivo")
+        self._metodo = metodo
+        self._amostrasSegmento = max(2, int(amostrasSegmento))
+        self._passoDistancia = passoDistancia
+        self._passoTempo = passoTempo
+
+    def Interpolar(self, posicoes, valores, tempoNs=None):
+        """
+        Interpola as posições e os valores ao longo do percurso.
+
+        Parâmetros:
+            posicoes (array): Posições dos pontos, pela ordem do percurso (N, 3).
+            valores (array): Valor da grandeza em cada ponto (N).
+            tempoNs (array): Instante de cada ponto em nanosegundos (N); só é necessário com passoTempo.
+
+        Retorna:
+            tuple: (posicoesInterpoladas (M, 3), valoresInterpolados (M)); vazios se houver menos de
+            dois pontos distintos.
+
+        Exceções:
+            ValueError: Se for usado passoTempo sem os instantes dos pontos.
+        """
+        posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 3)
+        valores = np.asarray(valores, dtype=np.float64)
+        if self._passoTempo is not None and tempoNs is None:
+            raise ValueError("A interpolação por passo de tempo requer os instantes dos pontos")
+
+        # Comprimento de arco acumulado, sem os pontos que repetem a posição anterior
+        comprimentos = np.linalg.norm(np.diff(posicoes, axis=0), axis=1)
+        nos = np.concatenate([[True], comprimentos > 0])
+        indicesNos = np.flatnonzero(nos)
+        # Valor de cada posição à chegada (primeira amostra) e à partida (última amostra)
+        chegadas = valores[indicesNos]
+        partidas = valores[np.append(indicesNos[1:] - 1, len(valores) - 1)]
+        posicoes = posicoes[nos]
+        comprimentos = comprimentos[nos[1:]]
+        arco = np.concatenate([[0.0], np.cumsum(comprimentos)])
+        if len(arco) < 2:
+            return np.empty((0, 3), dtype=np.float64), np.empty(0, dtype=np.float64)
+
+        arcoAmostras, segmentos = self._Amostras(arco, comprimentos, None if tempoNs is None else np.asarray(tempoNs)[nos])
+
+        # Posições sobre a linha poligonal: segmento de cada amostra e fração percorrida
+        if segmentos is None:
+            segmentos = np.clip(np.searchsorted(arco, arcoAmostras, side='right') - 1, 0, len(comprimentos) - 1)
+        fracoes = (arcoAmostras - arco[segmentos]) / comprimentos[segmentos]
+        posicoesInterpoladas = posicoes[segmentos] + fracoes[:, None] * (posicoes[segmentos + 1] - posicoes[segmentos])
+        if self._metodo == 'linear':
+            valoresInterpolados = partidas[segmentos] + fracoes * (chegadas[segmentos + 1] - partidas[segmentos])
+        else:
+            valoresInterpolados = self._Interpolador(arco, partidas)(arcoAmostras)
+        return posicoesInterpoladas, valoresInterpolados
+
+    def _Amostras(self, arco, comprimentos, tempoNs):
+        """Comprimento de arco de cada amostra, segundo a densidade escolhida, e o seu segmento (None se não for fixo)."""
+        if self._passoDistancia is not None:
+            return np.arange(0.0, arco[-1] + self._passoDistancia / 2, self._passoDistancia).clip(max=arco[-1]), None
+        if self._passoTempo is not None:
+            # Instantes uniformes, convertidos em comprimento de arco pela interpolação linear entre os pontos
+            tempos = np.maximum.accumulate((tempoNs - tempoNs[0]) / 1e9)
+            instantes = np.arange(0.0, tempos[-1] + self._passoTempo / 2, self._passoTempo).clip(max=tempos[-1])
+            return np.interp(instantes, tempos, arco), None
+        # O fim de um segmento pertence a esse segmento, e não ao início do seguinte
+        fracoes = np.linspace(0.0, 1.0, self._amostrasSegmento)
+        segmentos = np.repeat(np.arange(len(comprimentos)), self._amostrasSegmento)
+        return (arco[:-1, None] + comprimentos[:, None] * fracoes).ravel(), segmentos
+
+    def _Interpolador(self, arco, valores):
+        """Interpolador pchip ou cubica dos valores ao longo do comprimento de arco (arco estritamente crescente)."""
+        from scipy.interpolate import CubicSpline, PchipInterpolator
+        if self._metodo == 'pchip':
+            return PchipInterpolator(arco, valores)
+        return CubicSpline(arco, valores, bc_type='natural')
+
+    @property
+    def metodo(self):
+        """
+        Retorna:
+            str: Método de interpolação da grandeza.
+        """
+        return self._metodo
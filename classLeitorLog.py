@@ -0,0 +1,805 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+import numpy as np
+from classFicheiroLog import FicheiroLog
+from classTabelaFrameIds import TabelaFrameIds
+
+class LeitorLog:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe LeitorLog no âmbito da u.c. TOMSA
+
+    Base dos leitores rápidos de ficheiros de log (mensagens em texto, com um "header:"
+    no início de cada mensagem e separadas por "---"). O ficheiro é lido em blocos de
+    bytes alinhados com o início das mensagens e os valores de cada bloco são extraídos
+    de uma só vez e convertidos por coluna para arrays tipados pré-dimensionados.
+
+    A disposição das mensagens (ordem das linhas e dos campos) é inferida da primeira
+    mensagem que sirva de modelo estrito (válida, com cada campo numa só linha) e só é
+    adotada se a sua leitura dessa mensagem coincidir com a leitura detalhada. Cada bloco
+    é lido pela primeira estratégia que resultar:
+        1. Divisão do bloco em linhas (modelo de linhas): se todas as mensagens seguirem o
+           modelo, cada campo ocupa sempre a mesma linha (módulo o número de linhas por
+           mensagem) e os valores são extraídos de uma só vez; caso contrário, as mensagens
+           que seguem o modelo continuam a ser lidas assim e só as restantes (e as que têm
+           valores inválidos) passam à leitura detalhada.
+        2. Uma expressão regular com a disposição, aplicada ao bloco inteiro.
+        3. A mesma expressão regular mensagem a mensagem, com a leitura detalhada para as
+           mensagens que não seguem a disposição.
+        4. A leitura detalhada de todas as mensagens.
+    A leitura detalhada segue as regras dos leitores linha a linha originais: uma mensagem
+    é válida se todos os campos estiverem presentes e tiverem valores válidos, e num campo
+    repetido prevalece o último valor. Ao contrário dos leitores originais, cada mensagem é
+    lida por si: os campos de uma mensagem incompleta não passam para a seguinte.
+
+    Um ficheiro grande pode ainda ser dividido em intervalos alinhados com o início das
+    mensagens e lido em paralelo por vários processos (ver LerFicheiro). Os ficheiros
+    comprimidos (ver FicheiroLog) são descomprimidos em fluxo e lidos por pedaços
+    alinhados com o início das mensagens, sem ficheiros temporários.
+
+    Cada subclasse declara o tipo de mensagem que lê num EsquemaMensagem (ESQUEMA): os
+    caminhos e tipos dos campos e as colunas produzidas. As tabelas usadas na leitura
+    (CAMPOS e as restantes) são derivadas do esquema na definição da subclasse.
+
+    Atributos:
+        _padrao (re.Pattern): Expressão regular da disposição das mensagens (None até ser inferida).
+        _ordem (list): Índice, nos grupos da expressão regular, de cada campo de CAMPOS.
+        _modelo (tuple): Linhas de uma mensagem, cada uma um tuplo (linha, campo, prefixo), com campo e
+            prefixo (a linha até ao ':' da chave) None nas linhas que não são de um campo.
+        _tamanhoBloco (int): Número aproximado de bytes processados de cada vez.
+    """
+
+    # Tipo de mensagem lido (EsquemaMensagem), definido pelas subclasses
+    ESQUEMA = None
+
+    # Campos extraídos de cada mensagem, pela ordem da declaração no esquema
+    CAMPOS = ()
+    _CAMPOS_INT = ()
+    _CAMPOS_TEXTO = ()
+    # Campos cujo valor inválido é apenas ignorado, sem descartar o resto da secção
+    _CAMPOS_TOLERANTES = ()
+
+    # Campo correspondente a cada (secção, chave) da mensagem
+    _CAMPOS_SECCAO = {}
+    # Secção iniciada por cada (secção, chave) e campos descartados no início de cada secção
+    _SECCOES = {}
+    _CAMPOS_DE_SECCAO = {}
+
+    # Expressões regulares dos valores aceites pela expressão regular da disposição
+    _VALOR_INT = rb'([-+]?\d+)'
+    _VALOR_FLOAT = rb'([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)'
+    _VALOR_TEXTO = rb'([^:\r\n]*?)'
+    # Marcas dos bytes dos valores de cada tipo (ver _ConverterNumeros): 0 nos bytes de um número
+    # simples, 1 nos restantes e 2 no fim de linha
+    _MARCAS_INT = bytes(2 if c == 10 else 0 if c in b'0123456789+- \t\r' else 1 for c in range(256))
+    _MARCAS_FLOAT = bytes(2 if c == 10 else 0 if c in b'0123456789+-.eE \t\r' else 1 for c in range(256))
+
+    # Início de uma mensagem: linha cujo conteúdo começa por "header:"
+    PADRAO_HEADER = re.compile(rb'(?<![^\r\n])[ \t]*header:')
+    # Variantes que começam pelo literal "header:", muito mais rápidas de procurar, para a contagem:
+    # "header:" no início da linha e "header:" precedido de espaços (que obriga à contagem exata)
+    _PADRAO_HEADER_COLUNA0 = re.compile(rb'header:(?<=(?<![^\r\n])header:)')
+    _PADRAO_HEADER_INDENTADO = re.compile(rb'header:(?<=[ \t]header:)')
+
+    # Tamanho mínimo (em bytes) de cada intervalo lido por um processo
+    TAMANHO_MINIMO_PARALELO = 16 * 1024 * 1024
+
+    def __init_subclass__(cls, **kwargs):
+        """Deriva as tabelas de leitura do esquema declarado pela subclasse."""
+        super().__init_subclass__(**kwargs)
+        if cls.ESQUEMA is None:
+            return
+        cls.CAMPOS = cls.ESQUEMA.campos
+        cls._CAMPOS_INT = cls.ESQUEMA.camposInt
+        cls._CAMPOS_TEXTO = cls.ESQUEMA.camposTexto
+        cls._CAMPOS_TOLERANTES = cls.ESQUEMA.camposTolerantes
+        cls._CAMPOS_SECCAO = cls.ESQUEMA.camposPorChave
+        cls._SECCOES = cls.ESQUEMA.seccoesPorChave
+        cls._CAMPOS_DE_SECCAO = cls.ESQUEMA.camposDeSeccao
+
+    def __init__(self, tamanhoBloco=8 * 1024 * 1024) -> None:
+        self._padrao = None
+        self._ordem = None
+        self._modelo = None
+        self._tamanhoBloco = tamanhoBloco
+
+    def LerFicheiro(self, pathFile, processos=1):
+        """
+        Lê um ficheiro de log completo. O ficheiro é mapeado em memória e, com mais do que
+        um processo, dividido em intervalos alinhados com o início das mensagens, lidos em
+        paralelo e juntos pela ordem do ficheiro. Um ficheiro comprimido é lido em fluxo,
+        num só processo (ver LerFluxo).
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de log.
+            processos (int): Número de processos usados na leitura (default = 1).
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal), em que colunas é um dicionário
+            de arrays com os campos lidos e a tabela de frame_id ('frameIds').
+        """
+        if FicheiroLog.Compressao(pathFile) is not None:
+            with FicheiroLog.Abrir(pathFile) as f:
+                return self.LerFluxo(f)
+
+        with open(pathFile, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.Ler(b'')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+                intervalos = self.Intervalos(dados, processos)
+                if len(intervalos) == 1:
+                    return self.Ler(dados)
+
+        with ProcessPoolExecutor(max_workers=len(intervalos)) as executor:
+            resultados = list(executor.map(LeitorLog._LerIntervalo, [type(self)] * len(intervalos),
+                                           [pathFile] * len(intervalos), *zip(*intervalos)))
+        return self.Juntar(resultados)
+
+    def LerFluxo(self, fluxo):
+        """
+        Lê as mensagens de um fluxo binário (por exemplo, um ficheiro a ser descomprimido), por
+        pedaços de cerca de _tamanhoBloco bytes. Cada pedaço é lido até ao início da sua última
+        mensagem, que passa para o pedaço seguinte, por poder estar incompleta.
+
+        Parâmetros:
+            fluxo: Objeto com o método read(n), que devolve bytes vazios no fim.
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal), como LerFicheiro.
+        """
+        return self.Juntar(list(self.Pedacos(fluxo)))
+
+    def LerPedacos(self, pathFile):
+        """
+        Lê um ficheiro de log (em texto ou comprimido) por pedaços, sem o ter todo em memória.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de log.
+
+        Retorna:
+            Gerador de tuplos (colunas, countPontosValidos, countPontosTotal), um por pedaço, pela ordem do ficheiro.
+        """
+        with FicheiroLog.Abrir(pathFile) as fluxo:
+            yield from self.Pedacos(fluxo)
+
+    def Pedacos(self, fluxo):
+        """
+        Lê as mensagens de um fluxo binário por pedaços de cerca de _tamanhoBloco bytes. Cada
+        pedaço é lido até ao início da sua última mensagem, que passa para o pedaço seguinte,
+        por poder estar incompleta.
+
+        Parâmetros:
+            fluxo: Objeto com o método read(n), que devolve bytes vazios no fim.
+
+        Retorna:
+            Gerador de tuplos (colunas, countPontosValidos, countPontosTotal), um por pedaço (pelo menos um).
+        """
+        lidos = False
+        resto = b''
+        fim = False
+        while not fim:
+            pedaco, fim = self._LerPedaco(fluxo)
+            if not pedaco:
+                break
+            dados = resto + pedaco if resto else pedaco
+            corte = self.UltimaMensagem(dados)
+            if corte > 0:
+                lidos = True
+                yield self.Ler(dados, 0, corte)
+            resto = dados[corte:]
+
+        if resto or not lidos:
+            yield self.Ler(resto)
+
+    def _LerPedaco(self, fluxo):
+        """
+        Lê cerca de _tamanhoBloco bytes de um fluxo, em leituras parciais (read1, quando existe),
+        para que um ficheiro comprimido truncado só perca a última leitura parcial.
+
+        Retorna:
+            tuple: (bytes lidos, True se o fluxo terminou).
+        """
+        ler = getattr(fluxo, 'read1', fluxo.read)
+        partes = []
+        tamanho = 0
+        while tamanho < self._tamanhoBloco:
+            try:
+                parte = ler(self._tamanhoBloco - tamanho)
+            except EOFError:
+                # Ficheiro comprimido truncado: ficam as mensagens lidas até aí
+                print("Aviso: o ficheiro comprimido termina antes do fim; foram lidas as mensagens até esse ponto.")
+                return b''.join(partes), True
+            if not parte:
+                return b''.join(partes), True
+            partes.append(parte)
+            tamanho += len(parte)
+        return b''.join(partes), False
+
+    def UltimaMensagem(self, dados):
+        """
+        Procura o início da última mensagem (a última linha começada por "header:") de um buffer.
+
+        Parâmetros:
+            dados (bytes): Buffer a procurar.
+
+        Retorna:
+            int: Posição do início da linha dessa mensagem, ou 0 se não houver nenhuma depois do início.
+        """
+        posicao = len(dados)
+        while True:
+            posicao = dados.rfind(b'header:', 0, posicao)
+            if posicao <= 0:
+                return 0
+            inicioLinha = max(dados.rfind(b'\n', 0, posicao), dados.rfind(b'\r', 0, posicao)) + 1
+            if not dados[inicioLinha:posicao].strip(b' \t'):
+                return inicioLinha
+
+    def Intervalos(self, dados, partes):
+        """
+        Divide um buffer em intervalos de tamanho semelhante, alinhados com o início das mensagens.
+
+        Parâmetros:
+            dados (bytes, mmap): Conteúdo do ficheiro de log.
+            partes (int): Número de intervalos pretendido.
+
+        Retorna:
+            list: Lista de tuplos (inicio, fim); pode ter menos intervalos do que os pedidos.
+        """
+        partes = max(1, min(partes, len(dados) // self.TAMANHO_MINIMO_PARALELO))
+        cortes = [0]
+        for i in range(1, partes):
+            proximo = self.PADRAO_HEADER.search(dados, max(cortes[-1] + 1, len(dados) * i // partes))
+            if proximo is None:
+                break
+            cortes.append(proximo.start())
+        cortes.append(len(dados))
+        return list(zip(cortes[:-1], cortes[1:]))
+
+    @staticmethod
+    def _LerIntervalo(classeLeitor, pathFile, inicio, fim):
+        """Lê um intervalo de um ficheiro num processo auxiliar. Devolve apenas arrays e a lista de frame_id."""
+        with open(pathFile, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            colunas, countValidos, countTotal = classeLeitor().Ler(dados, inicio, fim)
+        colunas['frameIds'] = colunas['frameIds'].nomes
+        return colunas, countValidos, countTotal
+
+    @staticmethod
+    def Juntar(resultados):
+        """
+        Junta, pela ordem dada, os resultados de várias leituras.
+
+        Parâmetros:
+            resultados (list): Lista de tuplos (colunas, countPontosValidos, countPontosTotal).
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal) do conjunto.
+        """
+        frameIds = TabelaFrameIds()
+        codigos = [frameIds.Fundir(colunas['frameIds'], colunas['frameIdCodigos']) for colunas, _, _ in resultados]
+        colunas = {
+            nome: np.concatenate([r[0][nome] for r in resultados])
+            for nome in resultados[0][0] if nome not in ('frameIds', 'frameIdCodigos')
+        }
+        colunas['frameIdCodigos'] = np.concatenate(codigos)
+        colunas['frameIds'] = frameIds
+        return colunas, sum(r[1] for r in resultados), sum(r[2] for r in resultados)
+
+    def Ler(self, dados, inicio=0, fim=None):
+        """
+        Lê as mensagens contidas num intervalo de um buffer de bytes.
+
+        Parâmetros:
+            dados (bytes, mmap): Conteúdo do ficheiro de log.
+            inicio (int): Posição inicial do intervalo (deve coincidir com o início de uma linha).
+            fim (int): Posição final do intervalo (por omissão, o fim de dados).
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal).
+        """
+        if fim is None:
+            fim = len(dados)
+
+        frameIds = TabelaFrameIds()
+        blocos = []
+        countPontosTotal = 0
+        for inicioBloco, fimBloco in self._Blocos(dados, inicio, fim):
+            bloco = bytes(dados[inicioBloco:fimBloco])
+            countMensagens = self.ContarMensagens(bloco)
+            blocos.append(self._LerBloco(bloco, countMensagens, frameIds))
+            countPontosTotal += countMensagens
+
+        colunas = self._ColunasVazias(0)
+        if blocos:
+            colunas = {nome: np.concatenate([bloco[nome] for bloco in blocos]) for nome in colunas}
+        countPontosValidos = len(colunas['seq'])
+        colunas['frameIds'] = frameIds
+        return colunas, countPontosValidos, countPontosTotal
+
+    def ContarMensagens(self, dados, inicio=0, fim=None):
+        """
+        Conta as mensagens (linhas começadas por "header:") de um intervalo de um buffer de bytes.
+
+        Parâmetros:
+            dados (bytes, mmap): Conteúdo do ficheiro de log.
+            inicio (int): Posição inicial do intervalo (deve coincidir com o início de uma linha).
+            fim (int): Posição final do intervalo (por omissão, o fim de dados).
+
+        Retorna:
+            int: Número de mensagens.
+        """
+        if fim is None:
+            fim = len(dados)
+        if isinstance(dados, bytes):
+            # Se todos os "header:" estiverem no início do intervalo ou a seguir a um '\n', são todos inícios de mensagem
+            count = dados.count(b'header:', inicio, fim)
+            if dados.count(b'\nheader:', inicio, fim) + dados.startswith(b'header:', inicio, fim) == count:
+                return count
+        if self._PADRAO_HEADER_INDENTADO.search(dados, inicio, fim) is None:
+            return len(self._PADRAO_HEADER_COLUNA0.findall(dados, inicio, fim))
+        return len(self.PADRAO_HEADER.findall(dados, inicio, fim))
+
+    def _ColunasVazias(self, n):
+        """Devolve o dicionário de colunas pré-dimensionadas para n mensagens."""
+        return self.ESQUEMA.ColunasVazias(n)
+
+    def _Converter(self, valores, frameIds):
+        """
+        Converte os valores (em bytes) de cada campo de CAMPOS nas colunas tipadas de um bloco.
+
+        Exceções:
+            ValueError, OverflowError: Se algum valor não for convertível.
+        """
+        return self.ESQUEMA.Converter(valores, frameIds)
+
+    def _Blocos(self, dados, inicio, fim):
+        """Divide o intervalo [inicio, fim) em blocos de cerca de _tamanhoBloco bytes, alinhados com o início das mensagens."""
+        while inicio < fim:
+            corte = inicio + self._tamanhoBloco
+            if corte >= fim:
+                yield inicio, fim
+                return
+            proximo = self.PADRAO_HEADER.search(dados, corte, fim)
+            if proximo is None:
+                yield inicio, fim
+                return
+            yield inicio, proximo.start()
+            inicio = proximo.start()
+
+    def _LerBloco(self, bloco, countMensagens, frameIds):
+        """
+        Lê as mensagens válidas de um bloco: com o modelo de linhas quando as mensagens podem ser
+        delimitadas pelas suas linhas e, caso contrário, pela primeira estratégia que resultar.
+
+        Retorna:
+            dict: Colunas do bloco.
+        """
+        if self._padrao is None:
+            self._InferirDisposicao(bloco, 0, len(bloco))
+
+        if self._modelo is not None:
+            colunas = self._LerModelo(bloco, countMensagens, frameIds)
+            if colunas is not None:
+                return colunas
+
+        for extrair in (self._ExtrairPadrao, self._ExtrairMensagens, self._ExtrairDetalhado):
+            valores = extrair(bloco, 0, len(bloco))
+            if valores is None:
+                continue
+            try:
+                return self._Converter(valores, frameIds)
+            except (ValueError, OverflowError):
+                # Algum valor não é válido: tentar a estratégia seguinte
+                continue
+
+    @staticmethod
+    def _Linhas(bloco):
+        """Divide um bloco nas suas linhas (sem o '\\n' final de cada uma)."""
+        linhas = bloco.split(b'\n')
+        if linhas[-1] == b'':
+            linhas.pop()
+        return linhas
+
+    def _LerModelo(self, bloco, countMensagens, frameIds):
+        """
+        Lê as mensagens de um bloco com o modelo de linhas. Se todas as mensagens seguirem o modelo,
+        os valores de cada campo são extraídos de uma só vez; caso contrário, são lidas mensagem a
+        mensagem (ver _LerLocalizado).
+
+        Retorna:
+            dict: Colunas do bloco, ou None se as mensagens não puderem ser delimitadas pelas linhas do modelo.
+        """
+        if countMensagens == 0:
+            return self._ColunasVazias(0)
+        linhas = self._Linhas(bloco)
+        valores = self._ValoresModelo(linhas, countMensagens)
+        if valores is not None:
+            self._LimparTexto(valores)
+            try:
+                return self._Converter(valores, frameIds)
+            except (ValueError, OverflowError):
+                # Algum valor não é válido: só as mensagens com valores inválidos passam à leitura detalhada
+                pass
+        return self._LerLocalizado(linhas, countMensagens, frameIds)
+
+    def _ValoresModelo(self, linhas, countMensagens):
+        """
+        Extrai os valores de cada campo de CAMPOS se todas as mensagens seguirem o modelo: cada linha
+        do modelo ocupa sempre a mesma posição (módulo o número de linhas por mensagem), as linhas fixas
+        são iguais às do modelo e as dos campos começam pela mesma chave.
+
+        Retorna:
+            list: Valores (em bytes, o resto da linha a seguir à chave) de cada campo, ou None.
+        """
+        numLinhas = len(self._modelo)
+        if len(linhas) != countMensagens * numLinhas:
+            return None
+
+        valores = {}
+        for posicao, (linha, campo, prefixo) in enumerate(self._modelo):
+            coluna = linhas[posicao::numLinhas]
+            if campo is None:
+                if coluna.count(linha) != countMensagens:
+                    return None
+                continue
+            partes = self._RestoLinhas(coluna, prefixo)
+            if len(partes) != countMensagens:
+                return None
+            valores[campo] = partes
+        return [valores[campo] for campo in self.CAMPOS]
+
+    @staticmethod
+    def _RestoLinhas(linhas, prefixo):
+        """
+        Devolve o resto de cada linha a seguir ao prefixo. Como cada '\\n' + prefixo só pode estar no início de
+        uma linha, há tantas partes como linhas se e só se todas as linhas começarem pelo prefixo.
+
+        Retorna:
+            list: Resto de cada linha, ou uma lista de outro tamanho se alguma linha não começar pelo prefixo.
+        """
+        if len(linhas) == 0 or not linhas[0].startswith(prefixo):
+            return []
+        partes = b'\n'.join(linhas).split(b'\n' + prefixo)
+        partes[0] = partes[0][len(prefixo):]
+        return partes
+
+    def _LerLocalizado(self, linhas, countMensagens, frameIds):
+        """
+        Lê as mensagens de um bloco em que nem todas seguem o modelo de linhas (ou em que há valores
+        inválidos): as mensagens que seguem o modelo, com valores válidos, são convertidas em conjunto
+        e só as restantes passam à leitura detalhada. O resultado fica pela ordem das mensagens.
+
+        Retorna:
+            dict: Colunas do bloco, ou None se algum início de mensagem não for a linha "header:" do modelo.
+        """
+        numLinhas = len(self._modelo)
+        objetos = np.array(linhas, dtype=object)
+        inicios = np.flatnonzero(objetos == self._modelo[0][0])
+        if len(inicios) != countMensagens:
+            return None
+        fins = np.append(inicios[1:], len(linhas))
+
+        # Mensagens com o número de linhas do modelo, uma por linha da grelha
+        candidatas = np.flatnonzero(fins - inicios == numLinhas)
+        grelha = objetos[inicios[candidatas, None] + np.arange(numLinhas)]
+        conformes = np.ones(len(candidatas), dtype=bool)
+        restos = {}
+        for posicao, (linha, campo, prefixo) in enumerate(self._modelo):
+            coluna = grelha[:, posicao]
+            if campo is None:
+                conformes &= coluna == linha
+                continue
+            restos[campo] = self._RestoLinhas(coluna, prefixo)
+            if len(restos[campo]) != len(coluna):
+                conformes &= np.fromiter(map(bytes.startswith, coluna, repeat(prefixo)), dtype=bool, count=len(coluna))
+                restos[campo] = None
+        selecao = candidatas[conformes]
+
+        # Restos das linhas dos campos nas mensagens que seguem o modelo
+        for posicao, (_, campo, prefixo) in enumerate(self._modelo):
+            if campo is None:
+                continue
+            if restos[campo] is None:
+                restos[campo] = self._RestoLinhas(grelha[conformes, posicao], prefixo)
+            elif len(selecao) != len(candidatas):
+                restos[campo] = list(compress(restos[campo], conformes))
+        valores = [restos[campo] for campo in self.CAMPOS]
+        self._LimparTexto(valores)
+        validas = ~self._ConverterNumeros(valores)
+        if not validas.all():
+            valores = [coluna[validas] if isinstance(coluna, np.ndarray) else list(compress(coluna, validas))
+                       for coluna in valores]
+            selecao = selecao[validas]
+        colunas = self._Converter(valores, frameIds)
+
+        indices = []
+        linhasLentas = []
+        for i in np.setdiff1d(np.arange(countMensagens), selecao, assume_unique=True):
+            valoresMensagem = self._LerMensagem(b'\n'.join(linhas[inicios[i]:fins[i]]))
+            if valoresMensagem is not None:
+                indices.append(i)
+                linhasLentas.append(tuple(valoresMensagem[campo] for campo in self.CAMPOS))
+        if not linhasLentas:
+            return colunas
+
+        lentas = self._Converter(list(zip(*linhasLentas)), frameIds)
+        ordem = np.argsort(np.concatenate([selecao, indices]), kind='stable')
+        return {nome: np.concatenate([colunas[nome], lentas[nome]])[ordem] for nome in colunas}
+
+    def _LimparTexto(self, valores):
+        """Reduz os valores dos campos de texto (o resto da linha a seguir à chave) ao valor lido pela leitura detalhada."""
+        for i, campo in enumerate(self.CAMPOS):
+            if campo not in self._CAMPOS_TEXTO:
+                continue
+            distintos = set(valores[i])
+            limpos = {valor: valor.split(b':')[0].strip() for valor in distintos}
+            if any(valor != limpo for valor, limpo in limpos.items()):
+                valores[i] = list(map(limpos.__getitem__, valores[i]))
+
+    def _ConverterNumeros(self, valores):
+        """
+        Converte, no lugar, os valores dos campos numéricos em arrays, como a conversão direta. Os valores
+        que ela não aceita (que não são números, com ':' ou, num inteiro, fora de int64) são substituídos
+        por zero e as suas mensagens assinaladas. Numa coluna em que a conversão falha, só os valores com
+        bytes estranhos a um número são verificados um a um, e só se a conversão voltar a falhar são
+        verificados todos.
+
+        Retorna:
+            np.ndarray: Máscara (bool) das mensagens com algum valor inválido.
+        """
+        invalidas = np.zeros(len(valores[0]), dtype=bool)
+        for i, campo in enumerate(self.CAMPOS):
+            if campo in self._CAMPOS_TEXTO:
+                continue
+            inteiro = campo in self._CAMPOS_INT
+            coluna = valores[i]
+            try:
+                valores[i] = np.array(coluna, dtype=np.int64 if inteiro else np.float64)
+                continue
+            except (ValueError, OverflowError):
+                pass
+
+            marcas = np.frombuffer(b'\n'.join(coluna).translate(self._MARCAS_INT if inteiro else self._MARCAS_FLOAT),
+                                   dtype=np.uint8)
+            suspeitos = np.unique(np.searchsorted(np.flatnonzero(marcas == 2), np.flatnonzero(marcas == 1)))
+            for verificar in (suspeitos, range(len(coluna))):
+                erradas = [j for j in verificar if not self._Valido(campo, coluna[j])]
+                corrigida = list(coluna)
+                for j in erradas:
+                    corrigida[j] = b'0'
+                try:
+                    valores[i] = np.array(corrigida, dtype=np.int64 if inteiro else np.float64)
+                except (ValueError, OverflowError):
+                    continue
+                invalidas[erradas] = True
+                break
+        return invalidas
+
+    def _Valido(self, campo, valor):
+        """Indica se o valor (em bytes) de um campo é válido (ver _Valor)."""
+        try:
+            self._Valor(campo, valor)
+        except ValueError:
+            return False
+        return True
+
+    def _ExtrairPadrao(self, dados, inicio, fim):
+        """Extrai os valores de cada campo com a expressão regular da disposição, se todas as mensagens do bloco a seguirem."""
+        if self._padrao is None:
+            return None
+        linhas = self._padrao.findall(dados, inicio, fim)
+        if len(linhas) != self.ContarMensagens(dados, inicio, fim):
+            return None
+        colunas = list(zip(*linhas)) or [()] * len(self._ordem)
+        return [colunas[i] for i in self._ordem]
+
+    def _ExtrairMensagens(self, dados, inicio, fim):
+        """Extrai os valores mensagem a mensagem: com a expressão regular quando possível e com a leitura detalhada nas restantes."""
+        if self._padrao is None:
+            return None
+        linhas = []
+        for mensagem in self._Mensagens(dados, inicio, fim):
+            correspondencia = self._padrao.match(mensagem)
+            if correspondencia is not None:
+                grupos = correspondencia.groups()
+                linhas.append(tuple(grupos[i] for i in self._ordem))
+                continue
+            valores = self._LerMensagem(mensagem)
+            if valores is not None:
+                linhas.append(tuple(valores[campo] for campo in self.CAMPOS))
+        return list(zip(*linhas)) or [()] * len(self.CAMPOS)
+
+    def _ExtrairDetalhado(self, dados, inicio, fim):
+        """Extrai os valores com a leitura detalhada de todas as mensagens do bloco."""
+        linhas = []
+        for mensagem in self._Mensagens(dados, inicio, fim):
+            valores = self._LerMensagem(mensagem)
+            if valores is not None:
+                linhas.append(tuple(valores[campo] for campo in self.CAMPOS))
+        return list(zip(*linhas)) or [()] * len(self.CAMPOS)
+
+    def _Mensagens(self, dados, inicio, fim):
+        """Devolve o conteúdo de cada mensagem (de um "header:" até ao seguinte) do intervalo."""
+        anterior = None
+        for correspondencia in self.PADRAO_HEADER.finditer(dados, inicio, fim):
+            if anterior is not None:
+                yield bytes(dados[anterior:correspondencia.start()])
+            anterior = correspondencia.start()
+        if anterior is not None:
+            yield bytes(dados[anterior:fim])
+
+    def _LerMensagem(self, mensagem):
+        """
+        Lê uma mensagem linha a linha, com as regras dos leitores originais: o último valor de um
+        campo repetido prevalece, mas a mensagem fica completa (e as linhas seguintes são ignoradas)
+        logo que todos os campos tenham um valor.
+
+        Retorna:
+            dict: Valores (em bytes, já validados) de cada campo de CAMPOS, ou None se a mensagem não for válida.
+        """
+        valores = {}
+        seccao = ''
+        ignorar = False
+        for line in mensagem.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            chave, _, resto = line.partition(b':')
+            novaSeccao = self._SECCOES.get((seccao, chave))
+            if novaSeccao is not None:
+                # O início de uma secção descarta os valores anteriores dessa secção
+                seccao = novaSeccao
+                ignorar = False
+                for campo in self._CAMPOS_DE_SECCAO[seccao]:
+                    valores.pop(campo, None)
+                continue
+
+            campo = None if ignorar else self._CAMPOS_SECCAO.get((seccao, chave))
+            if campo is None:
+                continue
+
+            try:
+                valores[campo] = self._Valor(campo, resto.split(b':')[0].strip())
+            except ValueError:
+                if campo not in self._CAMPOS_TOLERANTES:
+                    # Valor inválido: os restantes campos são ignorados até ao início de outra secção
+                    ignorar = True
+                continue
+
+            if len(valores) == len(self.CAMPOS):
+                return valores
+        return None
+
+    def _Valor(self, campo, valor):
+        """
+        Valida e normaliza o valor (em bytes) de um campo, como nos leitores originais.
+
+        Exceções:
+            ValueError: Se o valor não for válido para o tipo do campo (ou, num inteiro, estiver fora de int64).
+        """
+        if campo in self._CAMPOS_INT:
+            inteiro = int(valor)
+            if not -2 ** 63 <= inteiro < 2 ** 63:
+                raise ValueError(f"Valor fora de int64: {inteiro}")
+            return str(inteiro).encode()
+        if campo in self._CAMPOS_TEXTO:
+            return valor
+        return repr(float(valor)).encode()
+
+    def _InferirDisposicao(self, dados, inicio, fim, maxMensagens=100):
+        """
+        Define a expressão regular e o modelo de linhas a partir da primeira mensagem do intervalo que
+        sirva de modelo estrito (ver _Disposicao). A disposição só é adotada se a leitura dessa mensagem
+        com ela coincidir com a leitura detalhada.
+        """
+        for i, mensagem in enumerate(self._Mensagens(dados, inicio, fim)):
+            if i >= maxMensagens:
+                return
+            esperado = self._LerMensagem(mensagem)
+            if esperado is None:
+                continue
+            disposicao = self._Disposicao(mensagem)
+            if disposicao is None:
+                continue
+
+            self._padrao, self._ordem, self._modelo = disposicao
+            if self._ConfirmarDisposicao(mensagem, [esperado[campo] for campo in self.CAMPOS]):
+                return
+            self._padrao = self._ordem = self._modelo = None
+
+    def _ConfirmarDisposicao(self, mensagem, esperado):
+        """Verifica se a expressão regular e o modelo de linhas leem de uma mensagem os valores esperados."""
+        try:
+            valores = self._ExtrairPadrao(mensagem, 0, len(mensagem))
+            if valores is None or [self._Valor(campo, valor[0]) for campo, valor in zip(self.CAMPOS, valores)] != esperado:
+                return False
+            if self._modelo is None:
+                return True
+            valores = self._ValoresModelo(self._Linhas(mensagem), 1)
+            if valores is None:
+                return False
+            self._LimparTexto(valores)
+            return [self._Valor(campo, valor[0]) for campo, valor in zip(self.CAMPOS, valores)] == esperado
+        except ValueError:
+            return False
+
+    def _Disposicao(self, mensagem):
+        """
+        Constrói a expressão regular e o modelo de linhas de uma mensagem válida, se for um modelo
+        estrito: cada campo numa só linha e com um valor válido, e nenhuma secção reaberta depois de
+        lido algum dos seus campos. Uma mensagem com um campo repetido não serve de modelo, porque a
+        leitura detalhada fica com o último valor.
+
+        Retorna:
+            tuple: (padrao, ordem, modelo), com modelo None se as linhas não terminarem em '\\n'; None se a
+            mensagem não for um modelo estrito.
+        """
+        partes = []
+        grupos = []
+        modelo = []
+        porLinhas = True
+        seccao = ''
+        for bruta in mensagem.splitlines(keepends=True):
+            if bruta.endswith(b'\n'):
+                conteudo = bruta[:-1]
+            else:
+                # Linha terminada só por '\r' (ou a última, sem fim de linha)
+                porLinhas = porLinhas and not bruta.endswith(b'\r')
+                conteudo = bruta
+            line = bruta.strip()
+
+            if not line or len(grupos) == len(self.CAMPOS):
+                # As linhas depois do último campo não fazem parte da expressão regular, mas são linhas fixas do modelo
+                modelo.append((conteudo, None, None))
+                continue
+
+            chave, separador, resto = line.partition(b':')
+            if not separador:
+                partes.append(rb'\s*' + re.escape(line) + rb'[ \t]*(?=[\r\n]|\Z)')
+                modelo.append((conteudo, None, None))
+                continue
+
+            campo = None
+            novaSeccao = self._SECCOES.get((seccao, chave))
+            if novaSeccao is not None:
+                if set(grupos) & set(self._CAMPOS_DE_SECCAO[novaSeccao]):
+                    return None
+                seccao = novaSeccao
+            else:
+                campo = self._CAMPOS_SECCAO.get((seccao, chave))
+
+            if campo is not None:
+                if campo in grupos:
+                    return None
+                try:
+                    self._Valor(campo, resto.split(b':')[0].strip())
+                except ValueError:
+                    return None
+                if campo in self._CAMPOS_INT:
+                    valor = self._VALOR_INT
+                elif campo in self._CAMPOS_TEXTO:
+                    valor = self._VALOR_TEXTO
+                else:
+                    valor = self._VALOR_FLOAT
+                grupos.append(campo)
+                modelo.append((conteudo, campo, conteudo[:conteudo.index(b':') + 1]))
+            else:
+                valor = rb'[^\r\n]*?' if resto.strip() else b''
+                modelo.append((conteudo, None, None))
+
+            if not partes:
+                # A primeira linha é sempre "header:"; começar pelo literal torna a procura muito mais rápida
+                indentacao = bruta[:len(bruta) - len(bruta.lstrip(b' \t'))]
+                linha = rb'header:(?<=(?<![^\r\n])' + re.escape(indentacao) + rb'header:)'
+            else:
+                linha = rb'\s*' + re.escape(chave) + b':'
+            partes.append(linha + rb'[ \t]*' + valor + rb'[ \t]*(?=[\r\n]|\Z)')
+
+        if len(grupos) < len(self.CAMPOS):
+            return None
+        padrao = re.compile(b''.join(partes))
+        return padrao, [grupos.index(campo) for campo in self.CAMPOS], tuple(modelo) if porLinhas else None
@@ -0,0 +1,35 @@
+from classEsquemaMensagem import EsquemaMensagem
+from classLeitorLog import LeitorLog
+
+class LeitorLogPose(LeitorLog):
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe LeitorLogPose no âmbito da u.c. TOMSA
+
+    Leitor rápido de ficheiros de log de trajetória (mensagens de pose com header,
+    position e orientation). As colunas produzidas são as aceites por
+    Trajetoria.AcrescentarColunas: seq, tempoNs, frameIdCodigos, frameIds, posicoes e quaternioes.
+    """
+
+    ESQUEMA = EsquemaMensagem(
+        campos=(
+            'header.seq: int',
+            'header.stamp: time',
+            'header.frame_id: str',
+            'pose.position.x: float',
+            'pose.position.y: float',
+            'pose.position.z: float',
+            'pose.orientation.w: float',
+            'pose.orientation.x: float',
+            'pose.orientation.y: float',
+            'pose.orientation.z: float',
+        ),
+        colunas={
+            'seq': 'header.seq',
+            'tempoNs': 'header.stamp',
+            'frameIdCodigos': 'header.frame_id',
+            'posicoes': ('pose.position.x', 'pose.position.y', 'pose.position.z'),
+            'quaternioes': ('pose.orientation.w', 'pose.orientation.x', 'pose.orientation.y', 'pose.orientation.z'),
+        },
+    )
@@ -0,0 +1,33 @@
+from classEsquemaMensagem import EsquemaMensagem
+from classLeitorLog import LeitorLog
+
+class LeitorLogTemperatura(LeitorLog):
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe LeitorLogTemperatura no âmbito da u.c. TOMSA
+
+    Leitor rápido de ficheiros de log de temperatura (mensagens com header, temperature
+    e variance). Tal como no leitor original, um valor inválido de temperatura ou de
+    variância é apenas ignorado, enquanto um valor inválido no header descarta a mensagem.
+    As colunas produzidas são as aceites por Temperatura.AcrescentarColunas: seq, tempoNs,
+    frameIdCodigos, frameIds, temperaturas e variancias.
+    """
+
+    ESQUEMA = EsquemaMensagem(
+        campos=(
+            'header.seq: int',
+            'header.stamp: time',
+            'header.frame_id: str',
+            'temperature: float',
+            'variance: float',
+        ),
+        colunas={
+            'seq': 'header.seq',
+            'tempoNs': 'header.stamp',
+            'frameIdCodigos': 'header.frame_id',
+            'temperaturas': 'temperature',
+            'variancias': 'variance',
+        },
+        tolerantes=('temperature', 'variance'),
+    )
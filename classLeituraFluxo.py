@@ -0,0 +1,107 @@
+from classIntegridade import Integridade
+from classIntercalacaoTemporal import IntercalacaoTemporal
+from classLeitorLogPose import LeitorLogPose
+from classLeitorLogTemperatura import LeitorLogTemperatura
+
+class LeituraFluxo:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe LeituraFluxo no âmbito da u.c. TOMSA
+
+    Leitura por pedaços, com memória limitada, de um ficheiro de log de trajetória e dos
+    ficheiros de log de temperatura, para ficheiros maiores do que a memória disponível.
+    Cada ficheiro é lido por LeitorLog.LerPedacos, em pedaços de cerca de tamanhoBloco bytes,
+    e os ficheiros de temperatura são intercalados por ordem de tempo (IntercalacaoTemporal).
+    A iteração devolve os pedaços de colunas das duas séries, sempre primeiro o que termina
+    mais cedo no tempo, para que avancem juntas e possam ser associadas à medida que passam
+    (por exemplo por VistaAoVivo). A integridade de cada ficheiro é verificada pelo caminho
+    (ver Integridade).
+
+    Só é mantido em memória o pedaço atual de cada ficheiro; quem consome os pedaços (ResumoFluxo,
+    VistaAoVivo, Exportacao) deve guardar apenas reduções de tamanho limitado.
+
+    Atributos:
+        _pathPose (str): Caminho do ficheiro de log de trajetória.
+        _pathsTemperatura (list): Caminhos dos ficheiros de log de temperatura.
+        _tamanhoBloco (int): Tamanho aproximado, em bytes, de cada pedaço lido.
+        _integridadePose (Integridade): Verificação do ficheiro de trajetória.
+        _integridadesTemperatura (list): Verificação de cada ficheiro de temperatura.
+        _contagemPose (list): Poses válidas e total de mensagens lidas.
+        _intercalacao (IntercalacaoTemporal): Intercalação dos ficheiros de temperatura (None até à leitura).
+    """
+
+    def __init__(self, pathPose, pathsTemperatura=(), tamanhoBloco=8 * 1024 * 1024) -> None:
+        self._pathPose = pathPose
+        self._pathsTemperatura = list(pathsTemperatura)
+        self._tamanhoBloco = tamanhoBloco
+        self._integridadePose = Integridade(pathPose)
+        self._integridadesTemperatura = [Integridade(pathFile) for pathFile in self._pathsTemperatura]
+        self._contagemPose = [0, 0]
+        self._intercalacao = None
+
+    def __iter__(self):
+        """
+        Retorna:
+            Gerador de tuplos (tipo, colunas), com tipo 'pose' ou 'temperatura' e colunas um pedaço
+            não vazio, como os de LeitorLog.LerPedacos (os de temperatura com a coluna fontes, o
+            índice do ficheiro em pathsTemperatura).
+        """
+        series = {'pose': self._Poses(), 'temperatura': iter(())}
+        if self._pathsTemperatura:
+            self._intercalacao = IntercalacaoTemporal([
+                integridade.Verificar(LeitorLogTemperatura(self._tamanhoBloco).LerPedacos(pathFile))
+                for pathFile, integridade in zip(self._pathsTemperatura, self._integridadesTemperatura)
+            ])
+            series['temperatura'] = iter(self._intercalacao)
+
+        pendentes = {tipo: next(serie, None) for tipo, serie in series.items()}
+        while any(colunas is not None for colunas in pendentes.values()):
+            # Sai o pedaço que termina mais cedo; a outra série já tem lido o pedaço que o cobre
+            tipo = min((tipo for tipo, colunas in pendentes.items() if colunas is not None),
+                       key=lambda tipo: pendentes[tipo]['tempoNs'][-1])
+            yield tipo, pendentes[tipo]
+            pendentes[tipo] = next(series[tipo], None)
+
+    def _Poses(self):
+        """Pedaços não vazios do ficheiro de trajetória, contando e verificando as mensagens lidas."""
+        leitor = LeitorLogPose(self._tamanhoBloco)
+        for colunas, countPontosValidos, countPontosTotal in self._integridadePose.Verificar(leitor.LerPedacos(self._pathPose)):
+            self._contagemPose[0] += countPontosValidos
+            self._contagemPose[1] += countPontosTotal
+            if len(colunas['tempoNs']):
+                yield colunas
+
+    @property
+    def contagemPose(self):
+        """
+        Retorna:
+            tuple: (countPontosValidos, countPontosTotal) do ficheiro de trajetória, até ao momento.
+        """
+        return tuple(self._contagemPose)
+
+    @property
+    def contagensTemperatura(self):
+        """
+        Retorna:
+            list: Tuplo (countPontosValidos, countPontosTotal) de cada ficheiro de temperatura, até ao momento.
+        """
+        if self._intercalacao is None:
+            return [(0, 0) for _ in self._pathsTemperatura]
+        return self._intercalacao.contagens
+
+    @property
+    def integridadePose(self):
+        """
+        Retorna:
+            Integridade: Verificação do ficheiro de trajetória.
+        """
+        return self._integridadePose
+
+    @property
+    def integridadesTemperatura(self):
+        """
+        Retorna:
+            list: Verificação (Integridade) de cada ficheiro de temperatura.
+        """
+        return self._integridadesTemperatura
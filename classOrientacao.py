@@ -1,4 +1,5 @@
 import numpy as np
+from classQuaternioes import Quaternioes
 
 class Orientacao:
     """ 
@@ -8,6 +9,7 @@ class Orientacao:
     
     Um quaternião representa a orientação no espaço 3D. 
     quaterniões são usados para representar rotações no espaço 3D, esta classe fornece métodos para converter o quaternião em uma matriz de rotação.
+    Os cálculos são delegados em Quaternioes, que faz as mesmas operações para N quaterniões de uma só vez.
 
     Componentes do quaternião:
     - q_0: parte escalar (real)
@@ -21,6 +23,8 @@ class Orientacao:
 
     """
 
+    __slots__ = ('_q_0', '_q_1', '_q_2', '_q_3')
+
     def __init__(self, q_0: float, q_1: float, q_2: float, q_3):
         """
         Inicializa o quaternião com os componentes q_0, q_1, q_2, q_3.
@@ -47,12 +51,7 @@ class Orientacao:
         Retorna:
         - Um array numpy 3x3 representando a matriz de rotação.
         """
-        q_0, q_1, q_2, q_3 = self._q_0, self._q_1, self._q_2, self._q_3
-        return np.array([
-            [2 * (q_0 ** 2 + q_1 ** 2) - 1, 2 * (q_1 * q_2 - q_0 * q_3), 2 * (q_1 * q_3 + q_0 * q_2)],
-            [2 * (q_1 * q_2 + q_0 * q_3), 2 * (q_0 ** 2 + q_2 ** 2) - 1, 2 * (q_2 * q_3 - q_0 * q_1)],
-            [2 * (q_1 * q_3 - q_0 * q_2), 2 * (q_2 * q_3 + q_0 * q_1), 2 * (q_0 ** 2 + q_3 ** 2) - 1]
-        ])
+        return Quaternioes.MatrizesRotacao(self.componentes)
 
     def RotateVector(self, v):
         """
@@ -64,8 +63,15 @@ class Orientacao:
         Retorna:
         - Um vetor 3D (array numpy) rotacionado de acordo com a orientação do quaternião.
         """
-        R = self.RotationMatrix()
-        return R.dot(v)
+        return Quaternioes.RodarVetores(self.componentes, v)
+
+    @property
+    def componentes(self):
+        """
+        Retorna:
+            np.ndarray: Componentes (q_0, q_1, q_2, q_3) do quaternião, no formato aceite por Quaternioes.
+        """
+        return np.array([self._q_0, self._q_1, self._q_2, self._q_3], dtype=np.float64)
 
     @property
     def q_0(self):
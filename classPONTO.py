@@ -13,6 +13,8 @@ Created on Thu Sep 20 2024
 class Ponto:
     """Um ponto 3D no plano cartesiano"""
     
+    __slots__ = ('_x', '_y', '_z')
+
     def __init__(self, x=0, y=0, z=0):
         """
         Constrói um objeto ponto dado as coordenadas x, y e z.
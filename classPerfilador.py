@@ -0,0 +1,197 @@
+import json
+import time
+import tracemalloc
+
+class Perfilador:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Perfilador no âmbito da u.c. TOMSA
+
+    Medição do custo de cada etapa do processamento (leitura, associação, interpolação,
+    criação dos elementos gráficos, ...). Cada etapa é delimitada por um bloco
+    `with Perfilador.Etapa('nome') as etapa:` e acumula o número de chamadas, o tempo de
+    parede, o tempo de CPU, o número de itens processados (etapa.itens) e o pico de memória
+    alocada acima da memória no início da etapa (medido com tracemalloc). Etapas dentro de
+    outras etapas são identificadas pelo caminho completo ('guardarFiguras/criarFigura/associacao').
+
+    Há no máximo um perfilador ativo, guardado na classe, para que as etapas possam ser
+    marcadas em qualquer módulo sem passar o perfilador como parâmetro. Sem perfilador
+    ativo, Etapa devolve sempre o mesmo objeto vazio e o custo de cada bloco é o de uma
+    chamada de função.
+
+    Atributos:
+        _memoria (bool): Se verdadeiro, mede o pico de memória de cada etapa (torna a execução mais lenta).
+        _etapas (dict): Totais de cada etapa, pelo caminho, pela ordem em que cada etapa começou pela primeira vez.
+        _pilha (list): Etapas em curso, da mais exterior para a mais interior.
+        _iniciouTracemalloc (bool): Se verdadeiro, o tracemalloc foi iniciado por este perfilador.
+    """
+
+    # Perfilador ativo (None se a medição estiver desligada)
+    _ativo = None
+
+    def __init__(self, memoria=True) -> None:
+        self._memoria = memoria
+        self._etapas = {}
+        self._pilha = []
+        self._iniciouTracemalloc = False
+
+    @classmethod
+    def Ativar(cls, memoria=True):
+        """
+        Liga a medição das etapas, substituindo o perfilador ativo, se existir.
+
+        Parâmetros:
+            memoria (bool): Se verdadeiro, mede também o pico de memória de cada etapa (default = True).
+
+        Retorna:
+            Perfilador: Perfilador ativado.
+        """
+        cls.Desativar()
+        perfilador = cls(memoria)
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            perfilador._iniciouTracemalloc = True
+        cls._ativo = perfilador
+        return perfilador
+
+    @classmethod
+    def Desativar(cls):
+        """
+        Desliga a medição das etapas.
+
+        Retorna:
+            Perfilador: Perfilador que estava ativo, com os totais medidos, ou None.
+        """
+        perfilador = cls._ativo
+        cls._ativo = None
+        if perfilador is not None and perfilador._iniciouTracemalloc:
+            tracemalloc.stop()
+            perfilador._iniciouTracemalloc = False
+        return perfilador
+
+    @classmethod
+    def Etapa(cls, nome, itens=None):
+        """
+        Delimita uma etapa num bloco with.
+
+        Parâmetros:
+            nome (str): Nome da etapa.
+            itens (int): Número de itens processados na etapa; também pode ser definido dentro do bloco (etapa.itens).
+
+        Retorna:
+            Contexto da etapa, ou um contexto vazio se a medição estiver desligada.
+        """
+        if cls._ativo is None:
+            return _ETAPA_NULA
+        return _Etapa(cls._ativo, nome, itens)
+
+    def _Totais(self, caminho):
+        """Devolve os totais de uma etapa, criando-os na primeira execução."""
+        totais = self._etapas.get(caminho)
+        if totais is None:
+            totais = self._etapas[caminho] = {
+                'etapa': caminho, 'chamadas': 0, 'tempoParede': 0.0, 'tempoCpu': 0.0, 'itens': None, 'picoMemoria': None,
+            }
+        return totais
+
+    def Resultados(self):
+        """
+        Retorna:
+            list: Totais de cada etapa (etapa, chamadas, tempoParede e tempoCpu em segundos,
+            itens, picoMemoria em bytes), cada etapa antes das etapas interiores.
+        """
+        return [dict(totais) for totais in self._etapas.values()]
+
+    def ImprimirTabela(self):
+        """Imprime os totais das etapas numa tabela, com as etapas interiores indentadas."""
+        print(f"{'etapa':<36} {'chamadas':>8} {'parede (s)':>11} {'CPU (s)':>9} {'itens':>10} {'itens/s':>12} {'memória':>11}")
+        for totais in self._etapas.values():
+            partes = totais['etapa'].split('/')
+            nome = '  ' * (len(partes) - 1) + partes[-1]
+            itens = totais['itens']
+            debito = itens / totais['tempoParede'] if itens is not None and totais['tempoParede'] > 0 else None
+            memoria = totais['picoMemoria']
+            print(f"{nome:<36} {totais['chamadas']:>8} {totais['tempoParede']:>11.4f} {totais['tempoCpu']:>9.4f} "
+                  f"{'-' if itens is None else itens:>10} {'-' if debito is None else f'{debito:.0f}':>12} "
+                  f"{'-' if memoria is None else f'{memoria / 2 ** 20:.1f} MiB':>11}")
+
+    def GuardarJson(self, pathFile):
+        """
+        Guarda os totais das etapas num ficheiro JSON.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de saída.
+        """
+        with open(pathFile, 'w', encoding='utf-8') as f:
+            json.dump({'memoria': self._memoria, 'etapas': self.Resultados()}, f, ensure_ascii=False, indent=1)
+
+class _Etapa:
+    """Execução de uma etapa com o perfilador ligado."""
+
+    __slots__ = ('_perfilador', '_caminho', '_totais', 'itens', '_inicioParede', '_inicioCpu', '_memoriaInicial', '_pico')
+
+    def __init__(self, perfilador, nome, itens) -> None:
+        self._perfilador = perfilador
+        self._caminho = nome
+        self.itens = itens
+
+    def __enter__(self):
+        perfilador = self._perfilador
+        pilha = perfilador._pilha
+        if pilha:
+            self._caminho = f"{pilha[-1]._caminho}/{self._caminho}"
+        self._totais = perfilador._Totais(self._caminho)
+
+        self._memoriaInicial = None
+        if perfilador._memoria and tracemalloc.is_tracing():
+            # O pico do tracemalloc é recomeçado em cada etapa; o pico anterior passa para a etapa exterior
+            atual, pico = tracemalloc.get_traced_memory()
+            if pilha:
+                pilha[-1]._pico = max(pilha[-1]._pico, pico)
+            tracemalloc.reset_peak()
+            self._memoriaInicial = self._pico = atual
+
+        pilha.append(self)
+        self._inicioCpu = time.process_time()
+        self._inicioParede = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        tempoParede = time.perf_counter() - self._inicioParede
+        tempoCpu = time.process_time() - self._inicioCpu
+        pilha = self._perfilador._pilha
+        pilha.pop()
+
+        memoria = None
+        if self._memoriaInicial is not None and tracemalloc.is_tracing():
+            pico = max(self._pico, tracemalloc.get_traced_memory()[1])
+            memoria = pico - self._memoriaInicial
+            if pilha:
+                pilha[-1]._pico = max(pilha[-1]._pico, pico)
+
+        totais = self._totais
+        totais['chamadas'] += 1
+        totais['tempoParede'] += tempoParede
+        totais['tempoCpu'] += tempoCpu
+        if self.itens is not None:
+            totais['itens'] = (totais['itens'] or 0) + int(self.itens)
+        if memoria is not None:
+            totais['picoMemoria'] = max(totais['picoMemoria'] or 0, memoria)
+        return False
+
+class _EtapaNula:
+    """Etapa sem medição, partilhada por todos os blocos quando o perfilador está desligado."""
+
+    __slots__ = ('itens',)
+
+    def __init__(self) -> None:
+        self.itens = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        return False
+
+_ETAPA_NULA = _EtapaNula()
@@ -14,6 +14,8 @@ class Pose:
         _orientacao (Orientacao): Orientação 3D representada por um objeto Orientacao.
     """
     
+    __slots__ = ('_posicao', '_orientacao')
+
     def __init__(self, posicao: Ponto, orientacao: Orientacao):
         self._posicao = posicao  # Posição é representada por um objeto Ponto
         self._orientacao = orientacao  # Orientação é representada por um objeto Orientacao
@@ -14,6 +14,8 @@ class PoseWithHeader:
         _pose (Pose): Informações de posição e orientação associadas ao ponto.
     """
     
+    __slots__ = ('_header', '_pose')
+
     def __init__(self, header: Header, pose: Pose):
         self._header = header
         self._pose = pose
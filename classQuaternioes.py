@@ -0,0 +1,231 @@
+import numpy as np
+
+class Quaternioes:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Quaternioes no âmbito da u.c. TOMSA
+
+    Operações sobre muitos quaterniões de uma só vez. Os quaterniões são dados por arrays
+    com as componentes (q_0, q_1, q_2, q_3) = (w, x, y, z) no último eixo, de forma (..., 4);
+    um array (N, 4) representa N orientações e um array (4,) uma única orientação.
+    Todas as operações são feitas sobre o array inteiro, sem ciclos em Python.
+
+    Os ângulos de Euler seguem a convenção (roll, pitch, yaw): rotações intrínsecas
+    em torno de Z (yaw), depois Y (pitch) e depois X (roll), em radianos.
+    """
+
+    @staticmethod
+    def Normalizar(q):
+        """
+        Normaliza os quaterniões para norma unitária.
+
+        Parâmetros:
+            q (array): Quaterniões (..., 4).
+
+        Retorna:
+            np.ndarray: Quaterniões unitários (..., 4). Quaterniões nulos ficam inalterados.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        normas = np.sqrt(np.einsum('...i,...i->...', q, q))[..., None]
+        return q / np.where(normas == 0, 1, normas)
+
+    @staticmethod
+    def MatrizesRotacao(q):
+        """
+        Converte quaterniões unitários nas matrizes de rotação 3x3 (ver Orientacao).
+
+        Parâmetros:
+            q (array): Quaterniões (..., 4).
+
+        Retorna:
+            np.ndarray: Matrizes de rotação (..., 3, 3).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        q_0, q_1, q_2, q_3 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+        matrizes = np.empty(q.shape[:-1] + (3, 3), dtype=np.float64)
+        matrizes[..., 0, 0] = 2 * (q_0 ** 2 + q_1 ** 2) - 1
+        matrizes[..., 0, 1] = 2 * (q_1 * q_2 - q_0 * q_3)
+        matrizes[..., 0, 2] = 2 * (q_1 * q_3 + q_0 * q_2)
+        matrizes[..., 1, 0] = 2 * (q_1 * q_2 + q_0 * q_3)
+        matrizes[..., 1, 1] = 2 * (q_0 ** 2 + q_2 ** 2) - 1
+        matrizes[..., 1, 2] = 2 * (q_2 * q_3 - q_0 * q_1)
+        matrizes[..., 2, 0] = 2 * (q_1 * q_3 - q_0 * q_2)
+        matrizes[..., 2, 1] = 2 * (q_2 * q_3 + q_0 * q_1)
+        matrizes[..., 2, 2] = 2 * (q_0 ** 2 + q_3 ** 2) - 1
+        return matrizes
+
+    @staticmethod
+    def RodarVetores(q, v):
+        """
+        Roda vetores 3D pelos quaterniões.
+
+        Parâmetros:
+            q (array): Quaterniões unitários (..., 4).
+            v (array): Vetores (..., 3); um único vetor (3,) é rodado por todos os quaterniões.
+
+        Retorna:
+            np.ndarray: Vetores rodados (..., 3).
+        """
+        matrizes = Quaternioes.MatrizesRotacao(q)
+        return np.einsum('...ij,...j->...i', matrizes, np.asarray(v, dtype=np.float64))
+
+    @staticmethod
+    def Produto(a, b):
+        """
+        Produto de Hamilton a * b (a rotação b seguida da rotação a).
+
+        Parâmetros:
+            a (array): Quaterniões (..., 4).
+            b (array): Quaterniões (..., 4).
+
+        Retorna:
+            np.ndarray: Quaterniões (..., 4).
+        """
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        a_0, a_1, a_2, a_3 = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+        b_0, b_1, b_2, b_3 = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+        return np.stack([
+            a_0 * b_0 - a_1 * b_1 - a_2 * b_2 - a_3 * b_3,
+            a_0 * b_1 + a_1 * b_0 + a_2 * b_3 - a_3 * b_2,
+            a_0 * b_2 - a_1 * b_3 + a_2 * b_0 + a_3 * b_1,
+            a_0 * b_3 + a_1 * b_2 - a_2 * b_1 + a_3 * b_0,
+        ], axis=-1)
+
+    @staticmethod
+    def Conjugado(q):
+        """
+        Conjugado dos quaterniões (igual ao inverso para quaterniões unitários).
+
+        Parâmetros:
+            q (array): Quaterniões (..., 4).
+
+        Retorna:
+            np.ndarray: Quaterniões (..., 4).
+        """
+        return np.asarray(q, dtype=np.float64) * np.array([1.0, -1.0, -1.0, -1.0])
+
+    @staticmethod
+    def Inverso(q):
+        """
+        Inverso dos quaterniões, q^-1 = conjugado(q) / |q|^2.
+
+        Parâmetros:
+            q (array): Quaterniões não nulos (..., 4).
+
+        Retorna:
+            np.ndarray: Quaterniões (..., 4).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        return Quaternioes.Conjugado(q) / np.sum(q * q, axis=-1, keepdims=True)
+
+    @staticmethod
+    def Slerp(a, b, t):
+        """
+        Interpolação esférica linear entre pares de orientações, pelo arco mais curto (q e -q
+        representam a mesma rotação). Para orientações quase iguais é usada a interpolação
+        linear normalizada, numericamente mais estável.
+
+        Parâmetros:
+            a (array): Quaterniões iniciais (..., 4).
+            b (array): Quaterniões finais (..., 4).
+            t (array): Fração de cada interpolação, 0 em a e 1 em b (...).
+
+        Retorna:
+            np.ndarray: Quaterniões unitários interpolados (..., 4).
+        """
+        a = Quaternioes.Normalizar(a)
+        b = Quaternioes.Normalizar(b)
+        t = np.asarray(t, dtype=np.float64)[..., None]
+        cossenos = np.einsum('...i,...i->...', a, b)[..., None]
+        b = np.where(cossenos < 0, -b, b)
+        cossenos = np.abs(cossenos)
+
+        angulos = np.arccos(np.clip(cossenos, -1.0, 1.0))
+        senos = np.sin(angulos)
+        proximos = senos < 1e-6
+        senos = np.where(proximos, 1.0, senos)
+        pesoA = np.where(proximos, 1 - t, np.sin((1 - t) * angulos) / senos)
+        pesoB = np.where(proximos, t, np.sin(t * angulos) / senos)
+        return Quaternioes.Normalizar(pesoA * a + pesoB * b)
+
+    @staticmethod
+    def ParaEuler(q):
+        """
+        Converte quaterniões unitários em ângulos de Euler.
+
+        Parâmetros:
+            q (array): Quaterniões (..., 4).
+
+        Retorna:
+            np.ndarray: Ângulos (roll, pitch, yaw) em radianos (..., 3).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        q_0, q_1, q_2, q_3 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+        roll = np.arctan2(2 * (q_0 * q_1 + q_2 * q_3), 1 - 2 * (q_1 ** 2 + q_2 ** 2))
+        pitch = np.arcsin(np.clip(2 * (q_0 * q_2 - q_3 * q_1), -1.0, 1.0))
+        yaw = np.arctan2(2 * (q_0 * q_3 + q_1 * q_2), 1 - 2 * (q_2 ** 2 + q_3 ** 2))
+        return np.stack([roll, pitch, yaw], axis=-1)
+
+    @staticmethod
+    def DeEuler(angulos):
+        """
+        Converte ângulos de Euler em quaterniões unitários.
+
+        Parâmetros:
+            angulos (array): Ângulos (roll, pitch, yaw) em radianos (..., 3).
+
+        Retorna:
+            np.ndarray: Quaterniões (..., 4).
+        """
+        angulos = np.asarray(angulos, dtype=np.float64) / 2
+        cr, cp, cy = np.cos(angulos[..., 0]), np.cos(angulos[..., 1]), np.cos(angulos[..., 2])
+        sr, sp, sy = np.sin(angulos[..., 0]), np.sin(angulos[..., 1]), np.sin(angulos[..., 2])
+        return np.stack([
+            cr * cp * cy + sr * sp * sy,
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy,
+        ], axis=-1)
+
+    @staticmethod
+    def ParaEixoAngulo(q):
+        """
+        Converte quaterniões unitários em eixo e ângulo de rotação.
+
+        Parâmetros:
+            q (array): Quaterniões (..., 4).
+
+        Retorna:
+            tuple: (eixos, angulos), com eixos unitários (..., 3) e ângulos em radianos, em [0, pi] (...).
+            Para rotações nulas o eixo devolvido é (1, 0, 0).
+        """
+        q = Quaternioes.Normalizar(q)
+        # q e -q representam a mesma rotação: usar a parte escalar não negativa
+        q = np.where(q[..., :1] < 0, -q, q)
+        senos = np.linalg.norm(q[..., 1:], axis=-1)
+        angulos = 2 * np.arctan2(senos, q[..., 0])
+
+        eixos = np.zeros(q.shape[:-1] + (3,), dtype=np.float64)
+        eixos[..., 0] = 1.0
+        naoNulos = senos > 0
+        eixos[naoNulos] = q[..., 1:][naoNulos] / senos[naoNulos][..., None]
+        return eixos, angulos
+
+    @staticmethod
+    def DeEixoAngulo(eixos, angulos):
+        """
+        Converte eixos e ângulos de rotação em quaterniões unitários.
+
+        Parâmetros:
+            eixos (array): Eixos de rotação (..., 3); não precisam de ser unitários.
+            angulos (array): Ângulos em radianos (...).
+
+        Retorna:
+            np.ndarray: Quaterniões (..., 4).
+        """
+        eixos = Quaternioes.Normalizar(eixos)
+        metades = np.asarray(angulos, dtype=np.float64)[..., None] / 2
+        return np.concatenate([np.cos(metades), np.sin(metades) * eixos], axis=-1)
@@ -0,0 +1,137 @@
+import numpy as np
+
+class ResumoFluxo:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe ResumoFluxo no âmbito da u.c. TOMSA
+
+    Reduções de uma trajetória e dos seus dados de temperatura calculadas por pedaços, à
+    medida que os ficheiros de log são lidos (ver LeituraFluxo), sem guardar as colunas: a
+    memória usada não depende do tamanho dos ficheiros. Cada pedaço é reduzido com operações
+    vetorizadas e combinado com os anteriores:
+        - número de pontos, duração e limites (caixa) das posições;
+        - distância percorrida, com o segmento entre o último ponto de um pedaço e o primeiro
+          do seguinte;
+        - mínimo, máximo, média e variância das temperaturas, pelo algoritmo de Welford na
+          forma que junta dois conjuntos (Chan et al.), numericamente estável.
+    Os pontos são tomados pela ordem dos ficheiros, por isso o resultado é igual ao de
+    Cinematica.Resumo para ficheiros ordenados por tempo (ver Integridade).
+
+    Atributos:
+        _countPoses (int): Número de poses.
+        _primeiroTempo, _ultimoTempo (int): Instantes da primeira e da última pose (None se ainda não houver).
+        _ultimaPosicao (np.ndarray): Última posição recebida (None se ainda não houver).
+        _comprimento (float): Distância percorrida, em metros.
+        _minimo, _maximo (np.ndarray): Limites das posições.
+        _countTemperaturas (int): Número de temperaturas finitas.
+        _media (float): Média das temperaturas.
+        _m2 (float): Soma dos quadrados dos desvios à média das temperaturas.
+        _temperaturaMinima, _temperaturaMaxima (float): Extremos das temperaturas.
+    """
+
+    def __init__(self) -> None:
+        self._countPoses = 0
+        self._primeiroTempo = None
+        self._ultimoTempo = None
+        self._ultimaPosicao = None
+        self._comprimento = 0.0
+        self._minimo = np.full(3, np.inf)
+        self._maximo = np.full(3, -np.inf)
+        self._countTemperaturas = 0
+        self._media = 0.0
+        self._m2 = 0.0
+        self._temperaturaMinima = np.inf
+        self._temperaturaMaxima = -np.inf
+
+    def AcrescentarPoses(self, colunas):
+        """
+        Acrescenta um pedaço de poses.
+
+        Parâmetros:
+            colunas (dict): Colunas lidas por LeitorLogPose (tempoNs, posicoes, ...).
+        """
+        tempoNs = colunas['tempoNs']
+        posicoes = np.asarray(colunas['posicoes'], dtype=np.float64).reshape(-1, 3)
+        if len(tempoNs) == 0:
+            return
+
+        if self._primeiroTempo is None:
+            self._primeiroTempo = int(tempoNs[0])
+        self._ultimoTempo = int(tempoNs[-1])
+        self._countPoses += len(tempoNs)
+
+        if self._ultimaPosicao is not None:
+            posicoes = np.vstack([self._ultimaPosicao, posicoes])
+        self._comprimento += float(np.sum(np.linalg.norm(np.diff(posicoes, axis=0), axis=1)))
+        self._ultimaPosicao = posicoes[-1].copy()
+        self._minimo = np.minimum(self._minimo, posicoes.min(axis=0))
+        self._maximo = np.maximum(self._maximo, posicoes.max(axis=0))
+
+    def AcrescentarTemperaturas(self, colunas):
+        """
+        Acrescenta um pedaço de temperaturas; os valores não finitos são ignorados.
+
+        Parâmetros:
+            colunas (dict): Colunas lidas por LeitorLogTemperatura (temperaturas, ...).
+        """
+        temperaturas = np.asarray(colunas['temperaturas'], dtype=np.float64)
+        temperaturas = temperaturas[np.isfinite(temperaturas)]
+        n = len(temperaturas)
+        if n == 0:
+            return
+
+        # Junção das estatísticas do pedaço com as acumuladas
+        media = float(temperaturas.mean())
+        m2 = float(np.sum((temperaturas - media) ** 2))
+        total = self._countTemperaturas + n
+        delta = media - self._media
+        self._media += delta * n / total
+        self._m2 += m2 + delta ** 2 * self._countTemperaturas * n / total
+        self._countTemperaturas = total
+        self._temperaturaMinima = min(self._temperaturaMinima, float(temperaturas.min()))
+        self._temperaturaMaxima = max(self._temperaturaMaxima, float(temperaturas.max()))
+
+    def Resumo(self):
+        """
+        Retorna:
+            dict: numeroPontos, duracao (s), comprimento (m), rapidezMedia (m/s), caixaMinima e
+            caixaMaxima (x, y, z em metros), como em Cinematica.Resumo, e, com temperaturas,
+            numeroTemperaturas, temperaturaMinima, temperaturaMaxima, temperaturaMedia e
+            temperaturaVariancia (variância amostral; NaN com uma só temperatura).
+        """
+        resumo = {'numeroPontos': self._countPoses}
+        if self._countPoses:
+            duracao = (self._ultimoTempo - self._primeiroTempo) / 1e9
+            resumo.update({
+                'duracao': duracao,
+                'comprimento': self._comprimento,
+                'rapidezMedia': self._comprimento / duracao if duracao > 0 else float('nan'),
+                'caixaMinima': self._minimo.tolist(),
+                'caixaMaxima': self._maximo.tolist(),
+            })
+        if self._countTemperaturas:
+            resumo.update({
+                'numeroTemperaturas': self._countTemperaturas,
+                'temperaturaMinima': self._temperaturaMinima,
+                'temperaturaMaxima': self._temperaturaMaxima,
+                'temperaturaMedia': self._media,
+                'temperaturaVariancia': self._m2 / (self._countTemperaturas - 1) if self._countTemperaturas > 1 else float('nan'),
+            })
+        return resumo
+
+    @property
+    def countPoses(self):
+        """
+        Retorna:
+            int: Número de poses.
+        """
+        return self._countPoses
+
+    @property
+    def countTemperaturas(self):
+        """
+        Retorna:
+            int: Número de temperaturas finitas.
+        """
+        return self._countTemperaturas
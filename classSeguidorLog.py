@@ -0,0 +1,125 @@
+import os
+import re
+from classFicheiroLog import FicheiroLog
+
+class SeguidorLog:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe SeguidorLog no âmbito da u.c. TOMSA
+
+    Leitura incremental de um ficheiro de log que continua a crescer (por exemplo, durante
+    um voo). O seguidor guarda a posição no ficheiro e o leitor, que mantém a disposição das
+    mensagens inferida na primeira leitura; cada chamada de LerNovas lê apenas os bytes
+    acrescentados desde a chamada anterior e devolve as mensagens completas. Uma mensagem
+    está completa quando é seguida do início de outra ou da linha separadora "---"; uma
+    mensagem incompleta no fim do ficheiro fica guardada até ser completada.
+
+    Se o ficheiro diminuir de tamanho ou for substituído (rotação do log), a leitura
+    recomeça do início do novo ficheiro. Os ficheiros comprimidos não são suportados, por
+    não poderem ser lidos a partir de uma posição intermédia.
+
+    Atributos:
+        _leitor (LeitorLog): Leitor do tipo de mensagem do ficheiro.
+        _pathFile (str): Caminho do ficheiro de log.
+        _posicao (int): Posição, no ficheiro, do fim dos bytes já lidos.
+        _resto (bytes): Bytes lidos que ainda não formam uma mensagem completa.
+        _identificador (tuple): Dispositivo e inode do ficheiro lido (para detetar a substituição).
+        _maximoBytes (int): Número máximo de bytes lidos em cada chamada de LerNovas.
+    """
+
+    # Linha separadora no fim de cada mensagem
+    _PADRAO_SEPARADOR = re.compile(rb'(?<![^\r\n])[ \t]*---[ \t]*\r?\n')
+
+    def __init__(self, leitor, pathFile, desdeInicio=True, maximoBytes=16 * 1024 * 1024) -> None:
+        """
+        Parâmetros:
+            leitor (LeitorLog): Leitor do tipo de mensagem do ficheiro.
+            pathFile (str): Caminho do ficheiro de log.
+            desdeInicio (bool): Se falso, ignora o conteúdo já existente e lê apenas as mensagens novas.
+            maximoBytes (int): Número máximo de bytes lidos em cada chamada de LerNovas.
+
+        Exceções:
+            IOError: Se o ficheiro estiver comprimido.
+        """
+        if FicheiroLog.Compressao(pathFile) is not None:
+            raise IOError(f"O ficheiro {pathFile} está comprimido e não pode ser seguido.")
+        self._leitor = leitor
+        self._pathFile = pathFile
+        self._resto = b''
+        self._maximoBytes = maximoBytes
+        estado = os.stat(pathFile)
+        self._identificador = (estado.st_dev, estado.st_ino)
+        self._posicao = 0 if desdeInicio else estado.st_size
+
+    def LerNovas(self):
+        """
+        Lê as mensagens completas acrescentadas ao ficheiro desde a última chamada (no máximo
+        _maximoBytes bytes; o restante fica para a chamada seguinte).
+
+        Retorna:
+            tuple: (colunas, countPontosValidos, countPontosTotal), como LeitorLog.LerFicheiro,
+            ou None se não houver mensagens completas novas.
+        """
+        try:
+            estado = os.stat(self._pathFile)
+        except FileNotFoundError:
+            # Durante a rotação o ficheiro pode não existir por instantes
+            return None
+        if (estado.st_dev, estado.st_ino) != self._identificador or estado.st_size < self._posicao:
+            # Ficheiro substituído ou truncado: recomeçar do início
+            self._identificador = (estado.st_dev, estado.st_ino)
+            self._posicao = 0
+            self._resto = b''
+        if estado.st_size == self._posicao:
+            return None
+
+        with open(self._pathFile, 'rb') as f:
+            f.seek(self._posicao)
+            novos = f.read(min(estado.st_size - self._posicao, self._maximoBytes))
+        self._posicao += len(novos)
+
+        dados = self._resto + novos if self._resto else novos
+        corte = self.FimMensagens(dados)
+        self._resto = dados[corte:]
+        if len(self._resto) > self._maximoBytes:
+            # Sem início de mensagem nem separador: não é uma mensagem, descartar
+            self._resto = b''
+        if corte == 0:
+            return None
+        return self._leitor.Ler(dados, 0, corte)
+
+    def FimMensagens(self, dados):
+        """
+        Procura o fim da última mensagem completa de um buffer.
+
+        Parâmetros:
+            dados (bytes): Buffer a procurar, a começar no início de uma mensagem.
+
+        Retorna:
+            int: Posição a seguir à última mensagem completa (0 se não houver nenhuma).
+        """
+        ultima = self._leitor.UltimaMensagem(dados)
+        separador = None
+        for separador in self._PADRAO_SEPARADOR.finditer(dados, ultima):
+            pass
+        if separador is not None:
+            # A última mensagem já terminou
+            return separador.end()
+        return ultima
+
+    @property
+    def posicao(self):
+        """
+        Retorna:
+            int: Posição, no ficheiro, do fim dos bytes já lidos.
+        """
+        return self._posicao
+
+    @property
+    def pendentes(self):
+        """
+        Retorna:
+            int: Número de bytes lidos que aguardam o resto da mensagem.
+        """
+        return len(self._resto)
@@ -0,0 +1,191 @@
+import numpy as np
+from classQuaternioes import Quaternioes
+
+class Sincronizacao:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe Sincronizacao no âmbito da u.c. TOMSA
+
+    Sincronização dos dados de uma trajetória e de temperatura, amostrados em relógios
+    ligeiramente diferentes, por reamostragem de ambos nos mesmos instantes: uma grade
+    de tempo comum (Grade) ou os instantes de uma das séries (NosInstantesPose,
+    NosInstantesTemperatura). Em cada instante pedido são procuradas as duas amostras
+    de cada série que o rodeiam e:
+        - as posições são interpoladas linearmente;
+        - as orientações são interpoladas por SLERP (Quaternioes.Slerp);
+        - as temperaturas são a média das duas amostras com pesos proporcionais ao peso
+          linear e inversamente proporcionais à variância de cada uma (uma amostra com
+          variância menor pesa mais); a variância devolvida é a dessa média. Se alguma
+          das variâncias não for positiva, são usados só os pesos lineares.
+    O resultado é uma tabela por colunas, calculada em poucas operações vetorizadas. Por
+    agora só é usada na exportação (exportar --sincronizar, Exportacao do tipo
+    'sincronizacao'); a figura (Trajetoria.PlotTemperaturas) e o resumo continuam a associar a
+    cada pose a temperatura mais próxima no tempo, dentro de --tolerancia (AssociacaoTemporal),
+    sem interpolar.
+
+    Os instantes fora do intervalo de uma série, ou entre duas amostras mais afastadas do
+    que intervaloMaximo, não são interpolados: os valores ficam NaN e a coluna validos é falsa.
+
+    Atributos:
+        _tempoPose (np.ndarray): Instantes das poses, ordenados (int64, N).
+        _posicoes (np.ndarray): Posições pela mesma ordem (float64, Nx3).
+        _quaternioes (np.ndarray): Orientações pela mesma ordem (float64, Nx4).
+        _tempoTemperatura (np.ndarray): Instantes das temperaturas, ordenados (int64, M); None sem temperatura.
+        _temperaturas (np.ndarray): Temperaturas pela mesma ordem (float64, M).
+        _variancias (np.ndarray): Variâncias pela mesma ordem (float64, M).
+        _intervaloMaximo (int): Distância máxima, em nanosegundos, entre as duas amostras interpoladas (None sem limite).
+    """
+
+    def __init__(self, trajetoria, temperatura=None, intervaloMaximo=None) -> None:
+        ordem = trajetoria.IndiceTempo().ordem
+        selecao = slice(None) if ordem is None else ordem
+        self._tempoPose = trajetoria.tempoNs[selecao]
+        self._posicoes = trajetoria.posicoes[selecao]
+        self._quaternioes = trajetoria.quaternioes[selecao]
+
+        self._tempoTemperatura = None
+        if temperatura is not None:
+            ordem = temperatura.IndiceTempo().ordem
+            selecao = slice(None) if ordem is None else ordem
+            self._tempoTemperatura = temperatura.tempoNs[selecao]
+            self._temperaturas = temperatura.temperaturas[selecao]
+            self._variancias = temperatura.variancias[selecao]
+        self._intervaloMaximo = intervaloMaximo
+
+    def Grade(self, passoNs, inicio=None, fim=None):
+        """
+        Grade de instantes igualmente espaçados no intervalo comum às séries.
+
+        Parâmetros:
+            passoNs (int): Intervalo entre instantes, em nanosegundos.
+            inicio (int): Primeiro instante (por omissão, o início do intervalo comum).
+            fim (int): Último instante possível (por omissão, o fim do intervalo comum).
+
+        Retorna:
+            np.ndarray: Instantes da grade (int64); vazio se as séries não se sobrepuserem.
+
+        Exceções:
+            ValueError: Se o passo não for positivo.
+        """
+        if passoNs <= 0:
+            raise ValueError("O passo da grade tem de ser positivo")
+        series = [self._tempoPose] + ([self._tempoTemperatura] if self._tempoTemperatura is not None else [])
+        if any(len(tempos) == 0 for tempos in series):
+            return np.empty(0, dtype=np.int64)
+        if inicio is None:
+            inicio = max(int(tempos[0]) for tempos in series)
+        if fim is None:
+            fim = min(int(tempos[-1]) for tempos in series)
+        if fim < inicio:
+            return np.empty(0, dtype=np.int64)
+        return np.arange(inicio, fim + 1, int(passoNs), dtype=np.int64)
+
+    def NaGrade(self, passoNs, inicio=None, fim=None):
+        """
+        Reamostra as séries numa grade de tempo comum (ver Grade e Reamostrar).
+
+        Retorna:
+            dict: Tabela sincronizada, como em Reamostrar.
+        """
+        return self.Reamostrar(self.Grade(passoNs, inicio, fim))
+
+    def NosInstantesPose(self):
+        """
+        Retorna:
+            dict: Tabela sincronizada nos instantes das poses, como em Reamostrar.
+        """
+        return self.Reamostrar(self._tempoPose)
+
+    def NosInstantesTemperatura(self):
+        """
+        Retorna:
+            dict: Tabela sincronizada nos instantes das temperaturas, como em Reamostrar.
+
+        Exceções:
+            ValueError: Se não houver dados de temperatura.
+        """
+        if self._tempoTemperatura is None:
+            raise ValueError("A sincronização não tem dados de temperatura")
+        return self.Reamostrar(self._tempoTemperatura)
+
+    def Reamostrar(self, tempoNs):
+        """
+        Interpola as séries nos instantes dados.
+
+        Parâmetros:
+            tempoNs (array): Instantes em nanosegundos (int64, K), por qualquer ordem.
+
+        Retorna:
+            dict: Colunas tempoNs (int64, K), posicoes (Kx3), quaternioes (Kx4), temperaturas e
+            variancias (K; NaN sem dados de temperatura) e validos (bool, K), verdadeiro nos instantes
+            em que todas as séries foram interpoladas.
+        """
+        tempoNs = np.asarray(tempoNs, dtype=np.int64)
+        tabela = {'tempoNs': tempoNs}
+
+        esquerda, direita, fracoes, validos = self._Vizinhos(self._tempoPose, tempoNs)
+        posicoes = self._posicoes[esquerda] + fracoes[:, None] * (self._posicoes[direita] - self._posicoes[esquerda])
+        quaternioes = Quaternioes.Slerp(self._quaternioes[esquerda], self._quaternioes[direita], fracoes)
+        posicoes[~validos] = np.nan
+        quaternioes[~validos] = np.nan
+        tabela['posicoes'] = posicoes
+        tabela['quaternioes'] = quaternioes
+
+        if self._tempoTemperatura is not None:
+            esquerda, direita, fracoes, validosTemperatura = self._Vizinhos(self._tempoTemperatura, tempoNs)
+            temperaturas, variancias = self._MediaPesada(esquerda, direita, fracoes)
+            temperaturas[~validosTemperatura] = np.nan
+            variancias[~validosTemperatura] = np.nan
+            tabela['temperaturas'] = temperaturas
+            tabela['variancias'] = variancias
+            validos = validos & validosTemperatura
+        else:
+            # Sem dados de temperatura as colunas existem na mesma, para a tabela ter sempre o mesmo esquema
+            tabela['temperaturas'] = np.full(len(tempoNs), np.nan)
+            tabela['variancias'] = np.full(len(tempoNs), np.nan)
+
+        tabela['validos'] = validos
+        return tabela
+
+    def _Vizinhos(self, tempos, consultas):
+        """
+        Amostras que rodeiam cada instante consultado, numa série ordenada.
+
+        Retorna:
+            tuple: (esquerda, direita, fracoes, validos): índices das duas amostras, fração do
+            intervalo entre elas (0 na da esquerda) e se o instante pode ser interpolado.
+        """
+        n = len(tempos)
+        if n == 0:
+            vazio = np.zeros(len(consultas), dtype=np.intp)
+            return vazio, vazio, np.zeros(len(consultas)), np.zeros(len(consultas), dtype=bool)
+
+        esquerda = np.clip(np.searchsorted(tempos, consultas, side='right') - 1, 0, max(n - 2, 0))
+        direita = np.minimum(esquerda + 1, n - 1)
+        intervalos = tempos[direita] - tempos[esquerda]
+        fracoes = (consultas - tempos[esquerda]) / np.where(intervalos == 0, 1, intervalos)
+        fracoes = np.clip(np.where(intervalos == 0, 0.0, fracoes), 0.0, 1.0)
+
+        validos = (consultas >= tempos[0]) & (consultas <= tempos[-1])
+        if self._intervaloMaximo is not None:
+            validos &= intervalos <= self._intervaloMaximo
+        return esquerda, direita, fracoes, validos
+
+    def _MediaPesada(self, esquerda, direita, fracoes):
+        """Média das temperaturas das duas amostras, pesada pela fração e pelo inverso da variância, e a sua variância."""
+        varianciasEsquerda = self._variancias[esquerda]
+        varianciasDireita = self._variancias[direita]
+        pesoEsquerda = 1 - fracoes
+        pesoDireita = fracoes.copy()
+
+        comVariancia = (varianciasEsquerda > 0) & (varianciasDireita > 0)
+        pesoEsquerda[comVariancia] /= varianciasEsquerda[comVariancia]
+        pesoDireita[comVariancia] /= varianciasDireita[comVariancia]
+        total = pesoEsquerda + pesoDireita
+        pesoEsquerda /= total
+        pesoDireita /= total
+
+        temperaturas = pesoEsquerda * self._temperaturas[esquerda] + pesoDireita * self._temperaturas[direita]
+        variancias = pesoEsquerda ** 2 * varianciasEsquerda + pesoDireita ** 2 * varianciasDireita
+        return temperaturas, variancias
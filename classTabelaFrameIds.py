@@ -0,0 +1,74 @@
+import sys
+import numpy as np
+
+class TabelaFrameIds:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe TabelaFrameIds no âmbito da u.c. TOMSA
+
+    Tabela de interning dos frame_id. Cada frame_id distinto é guardado uma única vez
+    e as amostras passam a referenciá-lo através de um código inteiro.
+
+    Atributos:
+        _nomes (list): Lista dos frame_id distintos, indexada pelo código.
+        _codigos (dict): Dicionário frame_id -> código.
+    """
+
+    def __init__(self, nomes=None) -> None:
+        self._nomes = []
+        self._codigos = {}
+        for nome in nomes or []:
+            self.Codigo(nome)
+
+    def __len__(self):
+        return len(self._nomes)
+
+    def __getitem__(self, codigo):
+        return self._nomes[codigo]
+
+    def __str__(self):
+        return f"TabelaFrameIds({self._nomes})"
+
+    def Codigo(self, nome):
+        """
+        Retorna o código de um frame_id, acrescentando-o à tabela se ainda não existir.
+
+        Parâmetros:
+            nome (str): frame_id.
+
+        Retorna:
+            int: Código do frame_id.
+        """
+        codigo = self._codigos.get(nome)
+        if codigo is None:
+            nome = sys.intern(nome)
+            codigo = len(self._nomes)
+            self._codigos[nome] = codigo
+            self._nomes.append(nome)
+        return codigo
+
+    def Fundir(self, outra, codigos):
+        """
+        Acrescenta os frame_id de outra tabela a esta e traduz os códigos correspondentes.
+
+        Parâmetros:
+            outra (TabelaFrameIds ou list): Tabela (ou lista de nomes) a que os códigos se referem.
+            codigos (np.ndarray): Códigos na numeração da outra tabela.
+
+        Retorna:
+            np.ndarray: Códigos na numeração desta tabela (int32).
+        """
+        nomes = outra.nomes if isinstance(outra, TabelaFrameIds) else outra
+        mapa = np.array([self.Codigo(nome) for nome in nomes], dtype=np.int32)
+        if len(mapa) == 0:
+            return np.asarray(codigos, dtype=np.int32)
+        return mapa[np.asarray(codigos, dtype=np.intp)]
+
+    @property
+    def nomes(self):
+        """
+        Retorna:
+            list: Lista dos frame_id distintos, indexada pelo código.
+        """
+        return self._nomes
@@ -1,6 +1,13 @@
-from classTempo import Tempo
-from classHeader import Header
-from classTemperatureWithHeader import TempratureWithHeader
+import numpy as np
+from classExportacao import Exportacao
+from classIndiceTempo import IndiceTempo
+from classIntegridade import Integridade
+from classIntercalacaoTemporal import IntercalacaoTemporal
+from classLeitorLog import LeitorLog
+from classLeitorLogTemperatura import LeitorLogTemperatura
+from classPerfilador import Perfilador
+from classTabelaFrameIds import TabelaFrameIds
+from classVistaPontos import VistaPontosTemperatura
 
 class Temperatura:
     """
@@ -8,131 +15,367 @@ class Temperatura:
 
     @info: exemplo de classe Temperatura no âmbito da u.c. TOMSA
 
-    Representa os dados de temperatura de um veículo, compostos por múltiplos objetos TempratureWithHeader.
+    Representa os dados de temperatura de um veículo. As medições são guardadas por colunas;
+    a propriedade pontosTemperatura continua a devolver objetos TempratureWithHeader, construídos a pedido.
+    As medições podem vir de várias fontes (por exemplo, uma por sonda), identificadas pela coluna fontes.
 
     Atributos:
-        _pontosTemperatura (list): Lista de objetos TempratureWithHeader que representam os pontos de temperatura ao longo do tempo.
+        _seq (np.ndarray): Sequência de cada medição (int64, N).
+        _tempoNs (np.ndarray): Instante de cada medição em nanosegundos (int64, N).
+        _frameIdCodigos (np.ndarray): Código do frame_id de cada medição (int32, N).
+        _frameIds (TabelaFrameIds): Tabela dos frame_id distintos.
+        _temperaturas (np.ndarray): Temperatura de cada medição (float64, N).
+        _variancias (np.ndarray): Variância de cada medição (float64, N).
+        _fontes (np.ndarray): Índice, em nomesFontes, da fonte de cada medição (int32, N).
+        _nomesFontes (list): Nome (caminho do ficheiro) de cada fonte lida.
+        _ordenado (bool): Verdadeiro se se sabe que os instantes não diminuem (ver Integridade).
+        _indiceTempo (IndiceTempo): Índice ordenado dos instantes (construído a pedido; None se ainda não existir).
         _nome (str): Nome dos dados de temperatura.
     """
 
-    def __init__(self) -> None:      
-        self._pontosTemperatura = []
+    def __init__(self) -> None:
+        self._seq = np.empty(0, dtype=np.int64)
+        self._tempoNs = np.empty(0, dtype=np.int64)
+        self._frameIdCodigos = np.empty(0, dtype=np.int32)
+        self._frameIds = TabelaFrameIds()
+        self._temperaturas = np.empty(0, dtype=np.float64)
+        self._variancias = np.empty(0, dtype=np.float64)
+        self._fontes = np.empty(0, dtype=np.int32)
+        self._nomesFontes = []
         self._nome = ""
+        self._ordenado = False
+        self._indiceTempo = None
 
-    def ReadLogTempratura(self, pathFile):
-        """Lê um arquivo de log de temperatura e adiciona à lista de objetos TempratureWithHeader"""
-        header_data = {}
-        countTemperaturas = 0
-        countPontosValidos = 0
-        temperatura = None
-        variancia = None
-        flagHeader = False
-
-        with open(pathFile, 'r') as f:
-            for index, line in enumerate(f, start=1):
-                line = line.strip()                
-                # Ignorar linhas vazias ou inválidas
-                if not line:
-                    continue
-
-                try:
-                    # Iniciar a leitura de um novo header
-                    if line.startswith("header:"):
-                        countTemperaturas += 1
-                        flagHeader = True
-                        header_data = {}
-                        tempo = Tempo()
-                        temperatura = None
-                        variancia = None
-
-                    # Processar dados do header
-                    if flagHeader:
-                        if line.startswith("frame_id:"):
-                            header_data['frame_id'] = line.split(":")[1].strip()
-                        elif line.startswith("seq:"):
-                            try:
-                                header_data['seq'] = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-                        elif line.startswith("nsecs:"):
-                            try:
-                                tempo.nsecs = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-                        elif line.startswith("secs:"):
-                            try:
-                                tempo.secs = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-                        elif line.startswith("temperature:"):
-                            try:
-                                temperatura = float(line.split(":")[1].strip())
-                            except ValueError:
-                                continue
-                        elif line.startswith("variance:"):
-                            try:
-                                variancia = float(line.split(":")[1].strip())
-                            except ValueError:
-                                continue
-
-                    # Verificar se temos todos os dados necessários para criar um ponto de temperatura
-                    if (header_data and hasattr(tempo, 'nsecs') and hasattr(tempo, 'secs') 
-                        and temperatura is not None 
-                        and variancia is not None  
-                        and "frame_id" in header_data 
-                        and "seq" in header_data):
-
-                        try:
-                            # Criar objetos correspondentes para a temperatura
-                            header = Header(header_data['seq'], tempo, header_data['frame_id'])
-                            novaTemperatura = TempratureWithHeader(header, temperatura, variancia)
-                            self._pontosTemperatura.append(novaTemperatura)
-                            countPontosValidos += 1  # Incrementar contagem de pontos válidos
-
-                            # Imprimir o ponto recém-adicionado
-                            # print(novaTemperatura)
-                        except Exception:
-                            # Ignorar este ponto e continuar com o próximo
-                            continue
-
-                        # Resetar variáveis temporárias
-                        header_data = {}
-                        tempo = Tempo()
-                        temperatura = None
-                        variancia = None
-                        flagHeader = False
-
-                except (ValueError, KeyError, AttributeError):
-                    # Reiniciar as variáveis temporárias para ignorar o ponto atual
-                    header_data = {}
-                    tempo = Tempo()
-                    temperatura = None
-                    variancia = None
-                    flagHeader = False
-                    continue
+    def __len__(self):
+        return len(self._tempoNs)
+
+    def AcrescentarColunas(self, seq, tempoNs, frameIdCodigos, frameIds, temperaturas, variancias, fontes=None, ordenado=False):
+        """
+        Acrescenta medições, dadas por colunas, ao fim dos dados de temperatura.
+
+        Parâmetros:
+            seq (array): Sequência de cada medição (N).
+            tempoNs (array): Instante de cada medição em nanosegundos (N).
+            frameIdCodigos (array): Código do frame_id de cada medição, na numeração de frameIds (N).
+            frameIds (TabelaFrameIds ou list): Tabela dos frame_id a que os códigos se referem.
+            temperaturas (array): Temperatura de cada medição (N).
+            variancias (array): Variância de cada medição (N).
+            fontes (array): Índice da fonte de cada medição (N); por omissão, 0.
+            ordenado (bool): Verdadeiro se se sabe que os instantes dados não diminuem (default = False).
+        """
+        codigos = self._frameIds.Fundir(frameIds, frameIdCodigos)
+        self._indiceTempo = None
+        self._ordenado = ordenado and (len(self._tempoNs) == 0 or len(tempoNs) == 0
+                                       or (self._ordenado and tempoNs[0] >= self._tempoNs[-1]))
+        if fontes is None:
+            fontes = np.zeros(len(codigos), dtype=np.int32)
+
+        if len(self._tempoNs) == 0:
+            self._seq = np.asarray(seq, dtype=np.int64)
+            self._tempoNs = np.asarray(tempoNs, dtype=np.int64)
+            self._frameIdCodigos = codigos
+            self._temperaturas = np.asarray(temperaturas, dtype=np.float64)
+            self._variancias = np.asarray(variancias, dtype=np.float64)
+            self._fontes = np.asarray(fontes, dtype=np.int32)
+        else:
+            self._seq = np.concatenate([self._seq, np.asarray(seq, dtype=np.int64)])
+            self._tempoNs = np.concatenate([self._tempoNs, np.asarray(tempoNs, dtype=np.int64)])
+            self._frameIdCodigos = np.concatenate([self._frameIdCodigos, codigos])
+            self._temperaturas = np.concatenate([self._temperaturas, np.asarray(temperaturas, dtype=np.float64)])
+            self._variancias = np.concatenate([self._variancias, np.asarray(variancias, dtype=np.float64)])
+            self._fontes = np.concatenate([self._fontes, np.asarray(fontes, dtype=np.int32)])
+
+    def ReadLogTempratura(self, pathFile, processos=1, cache=None, ordenar=False):
+        """
+        Lê um arquivo de log de temperatura e acrescenta as medições válidas às colunas
+        e verifica a sua integridade (lacunas de seq, duplicadas e instantes fora de ordem; ver Integridade)
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de log.
+            processos (int): Número de processos usados na leitura de ficheiros grandes (default = 1).
+            cache (CacheLogs): Cache das colunas lidas; se não for dada, o ficheiro é sempre lido.
+            ordenar (bool): Ordenar as medições por tempo e remover as duplicadas (default = False).
+        """
+        leitor = LeitorLogTemperatura()
+        with Perfilador.Etapa('lerTemperatura') as etapa:
+            if cache is not None:
+                colunas, countPontosValidos, countTemperaturas = cache.LerFicheiro(leitor, pathFile, processos)
+            else:
+                colunas, countPontosValidos, countTemperaturas = leitor.LerFicheiro(pathFile, processos)
+            etapa.itens = countTemperaturas
+
+        with Perfilador.Etapa('integridade', len(colunas['tempoNs'])):
+            integridade = Integridade(pathFile)
+            integridade.Acrescentar(colunas['seq'], colunas['tempoNs'])
+            countDuplicadas = 0
+            if ordenar:
+                selecao, countDuplicadas = Integridade.Ordenar(colunas['tempoNs'], colunas['seq'])
+                if countDuplicadas or not integridade.ordenado:
+                    colunas = {nome: coluna if nome == 'frameIds' else coluna[selecao] for nome, coluna in colunas.items()}
+            self.AcrescentarColunas(**colunas, fontes=np.full(len(colunas['tempoNs']), len(self._nomesFontes), dtype=np.int32),
+                                    ordenado=ordenar or integridade.ordenado)
+            self._nomesFontes.append(pathFile)
 
         # Imprimir resumo dos pontos lidos
         print(f"Temperaturas do ficheiro {self._nome}, número de pontos válidos: {countPontosValidos} de {countTemperaturas}")
+        print(integridade.Relatorio())
+        if ordenar and (countDuplicadas or not integridade.ordenado):
+            print(f"Medições ordenadas por tempo, {countDuplicadas} duplicadas removidas")
 
         return
-    
+
+    def ReadLogsTemperatura(self, pathFiles, processos=1, cache=None, ordenar=False):
+        """
+        Lê vários ficheiros de log de temperatura (por exemplo, um por sonda), cada um ordenado por
+        tempo, e acrescenta as medições válidas de todos às colunas, intercaladas por ordem de tempo
+        (ver IntercalacaoTemporal). A coluna fontes indica o ficheiro de cada medição. Os ficheiros
+        são lidos por pedaços, sem ter nenhum deles todo em memória durante a intercalação, e a
+        integridade de cada um é verificada à medida que os pedaços são lidos (ver Integridade).
+
+        Parâmetros:
+            pathFiles (list): Caminhos dos ficheiros de log.
+            processos (int): Número de processos usados na leitura, quando há um só ficheiro (default = 1).
+            cache (CacheLogs): Cache das colunas lidas; se for dada, as colunas de cada ficheiro são
+                lidas da cache (mapeadas em memória) e percorridas por pedaços.
+            ordenar (bool): Ordenar as medições por tempo e remover as duplicadas de cada ficheiro (default = False).
+        """
+        if len(pathFiles) == 1:
+            self.ReadLogTempratura(pathFiles[0], processos, cache, ordenar)
+            return
+
+        with Perfilador.Etapa('lerTemperatura') as etapa:
+            fontes = []
+            integridades = [Integridade(pathFile) for pathFile in pathFiles]
+            for pathFile, integridade in zip(pathFiles, integridades):
+                leitor = LeitorLogTemperatura()
+                if cache is not None:
+                    pedacos = self._PedacosColunas(cache.LerFicheiro(leitor, pathFile, processos))
+                else:
+                    pedacos = leitor.LerPedacos(pathFile)
+                fontes.append(integridade.Verificar(pedacos))
+            intercalacao = IntercalacaoTemporal(fontes)
+            pedacos = [(colunas, 0, 0) for colunas in intercalacao]
+            countDuplicadas = 0
+            if pedacos:
+                colunas = LeitorLog.Juntar(pedacos)[0]
+                # A intercalação de ficheiros ordenados fica ordenada
+                ordenado = all(integridade.ordenado for integridade in integridades)
+                if ordenar:
+                    selecao, countDuplicadas = Integridade.Ordenar(colunas['tempoNs'], colunas['seq'], grupos=colunas['fontes'])
+                    if countDuplicadas or not ordenado:
+                        colunas = {nome: coluna if nome == 'frameIds' else coluna[selecao] for nome, coluna in colunas.items()}
+                colunas['fontes'] = colunas['fontes'] + len(self._nomesFontes)
+                self.AcrescentarColunas(**colunas, ordenado=ordenar or ordenado)
+            self._nomesFontes.extend(pathFiles)
+            etapa.itens = sum(total for _, total in intercalacao.contagens)
+
+        # Imprimir resumo dos pontos lidos de cada ficheiro
+        for pathFile, integridade, (countPontosValidos, countTemperaturas) in zip(pathFiles, integridades, intercalacao.contagens):
+            print(f"Temperaturas do ficheiro {pathFile}, número de pontos válidos: {countPontosValidos} de {countTemperaturas}")
+            print(integridade.Relatorio())
+        if countDuplicadas:
+            print(f"{countDuplicadas} medições duplicadas removidas")
+
+    @staticmethod
+    def _PedacosColunas(resultado, linhasPorPedaco=1_000_000):
+        """Divide as colunas já lidas de um ficheiro (countPontosValidos, countPontosTotal) em pedaços, como LeitorLog.LerPedacos."""
+        colunas, countPontosValidos, countPontosTotal = resultado
+        n = len(colunas['tempoNs'])
+        for inicio in range(0, max(n, 1), linhasPorPedaco):
+            pedaco = {nome: coluna[inicio:inicio + linhasPorPedaco] for nome, coluna in colunas.items() if nome != 'frameIds'}
+            pedaco['frameIds'] = colunas['frameIds']
+            # As contagens do ficheiro vão com o primeiro pedaço
+            yield (pedaco, countPontosValidos, countPontosTotal) if inicio == 0 else (pedaco, 0, 0)
+
+    def Exportar(self, pathFile, linhasPorGrupo=Exportacao.LINHAS_POR_GRUPO):
+        """
+        Exporta as colunas para um ficheiro Parquet (.parquet, requer pyarrow) ou NumPy (.npz).
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de saída; o formato é dado pela extensão.
+            linhasPorGrupo (int): Número máximo de linhas de cada grupo de linhas do Parquet.
+        """
+        with Exportacao(pathFile, 'temperatura', linhasPorGrupo) as exportacao:
+            exportacao.Acrescentar(self._Selecionar(slice(None)))
+
+    def Importar(self, pathFile):
+        """
+        Acrescenta às colunas as medições de um ficheiro criado por Exportar. Cada fonte do
+        ficheiro passa a ser uma fonte nova, com o nome "<ficheiro>:<índice da fonte no ficheiro>".
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro (.parquet ou .npz).
+
+        Exceções:
+            ValueError: Se o ficheiro não contiver dados de temperatura.
+        """
+        tipo, colunas = Exportacao.Carregar(pathFile)
+        if tipo != 'temperatura':
+            raise ValueError(f"O ficheiro {pathFile} contém dados de {tipo}, não de temperatura")
+        fontes = colunas.pop('fontes', None)
+        countFontes = int(fontes.max()) + 1 if fontes is not None and len(fontes) else 1
+        if fontes is not None:
+            fontes = fontes + len(self._nomesFontes)
+        else:
+            fontes = np.full(len(colunas['tempoNs']), len(self._nomesFontes), dtype=np.int32)
+        self.AcrescentarColunas(**colunas, fontes=fontes)
+        self._nomesFontes.extend(f"{pathFile}:{fonte}" for fonte in range(countFontes))
+
+    def IndiceTempo(self):
+        """
+        Retorna:
+            IndiceTempo: Índice ordenado dos instantes dos dados de temperatura, construído no primeiro acesso
+            e guardado até as colunas serem alteradas.
+        """
+        if self._indiceTempo is None:
+            self._indiceTempo = IndiceTempo(self._tempoNs, self._ordenado)
+        return self._indiceTempo
+
+    def SliceTime(self, t0, t1):
+        """
+        Seleciona as medições com instante t no intervalo t0 <= t < t1, em O(log N).
+
+        Parâmetros:
+            t0 (int): Início do intervalo, em nanosegundos.
+            t1 (int): Fim (exclusivo) do intervalo, em nanosegundos.
+
+        Retorna:
+            dict: Colunas das medições selecionadas, por ordem de tempo, no formato aceite por
+            AcrescentarColunas. Se os instantes estiverem ordenados, as colunas são vistas (sem cópia).
+        """
+        return self._Selecionar(self.IndiceTempo().Intervalo(t0, t1))
+
+    def At(self, t):
+        """
+        Seleciona as medições com instante exatamente igual a t, em O(log N).
+
+        Parâmetros:
+            t (int): Instante em nanosegundos.
+
+        Retorna:
+            dict: Colunas das medições selecionadas, como em SliceTime.
+        """
+        return self._Selecionar(self.IndiceTempo().Intervalo(t, t + 1))
+
+    def Nearest(self, t):
+        """
+        Procura a medição com o instante mais próximo de t, em O(log N).
+
+        Parâmetros:
+            t (int): Instante em nanosegundos.
+
+        Retorna:
+            int: Índice da medição nas colunas, ou None se não houver medições.
+        """
+        return self.IndiceTempo().MaisProximo(t)
+
+    def _Selecionar(self, selecao):
+        """Aplica uma seleção (slice ou array de índices) a todas as colunas."""
+        return {
+            'seq': self._seq[selecao],
+            'tempoNs': self._tempoNs[selecao],
+            'frameIdCodigos': self._frameIdCodigos[selecao],
+            'temperaturas': self._temperaturas[selecao],
+            'variancias': self._variancias[selecao],
+            'fontes': self._fontes[selecao],
+            'frameIds': self._frameIds,
+        }
+
     @property
     def pontosTemperatura(self):
         """
         Retorna:
-            list: Lista de objetos TempratureWithHeader que representam os pontos de temperatura ao longo do tempo.
+            VistaPontosTemperatura: Vista, com interface de lista, de objetos TempratureWithHeader construídos a pedido a partir das colunas.
         """
-        return self._pontosTemperatura
+        return VistaPontosTemperatura(self)
 
     @pontosTemperatura.setter
     def pontosTemperatura(self, pontos):
         """
-        Define a lista de pontos de temperatura.
+        Define a lista de pontos de temperatura, substituindo as colunas existentes.
 
         Parâmetros:
             pontos (list): Lista de objetos TempratureWithHeader.
         """
-        self._pontosTemperatura = pontos
+        frameIds = TabelaFrameIds()
+        self._indiceTempo = None
+        self._seq = np.array([t.header.seq for t in pontos], dtype=np.int64)
+        self._tempoNs = np.array([t.header.stamp.tempoNs for t in pontos], dtype=np.int64)
+        self._frameIdCodigos = np.array([frameIds.Codigo(t.header.frame_id) for t in pontos], dtype=np.int32)
+        self._frameIds = frameIds
+        self._temperaturas = np.array([t.temperatura for t in pontos], dtype=np.float64)
+        self._variancias = np.array([t.variancia for t in pontos], dtype=np.float64)
+        self._fontes = np.zeros(len(self._tempoNs), dtype=np.int32)
+        self._ordenado = False
+
+    @property
+    def ordenado(self):
+        """
+        Retorna:
+            bool: Verdadeiro se se sabe que os instantes das medições não diminuem.
+        """
+        return self._ordenado
+
+    @property
+    def seq(self):
+        """
+        Retorna:
+            np.ndarray: Sequência de cada medição (int64, N).
+        """
+        return self._seq
+
+    @property
+    def tempoNs(self):
+        """
+        Retorna:
+            np.ndarray: Instante de cada medição em nanosegundos (int64, N).
+        """
+        return self._tempoNs
+
+    @property
+    def frameIdCodigos(self):
+        """
+        Retorna:
+            np.ndarray: Código do frame_id de cada medição (int32, N).
+        """
+        return self._frameIdCodigos
+
+    @property
+    def frameIds(self):
+        """
+        Retorna:
+            TabelaFrameIds: Tabela dos frame_id distintos, indexada pelo código.
+        """
+        return self._frameIds
+
+    @property
+    def temperaturas(self):
+        """
+        Retorna:
+            np.ndarray: Temperatura de cada medição (float64, N).
+        """
+        return self._temperaturas
+
+    @property
+    def variancias(self):
+        """
+        Retorna:
+            np.ndarray: Variância de cada medição (float64, N).
+        """
+        return self._variancias
+
+    @property
+    def fontes(self):
+        """
+        Retorna:
+            np.ndarray: Índice, em nomesFontes, da fonte de cada medição (int32, N).
+        """
+        return self._fontes
+
+    @property
+    def nomesFontes(self):
+        """
+        Retorna:
+            list: Nome (caminho do ficheiro) de cada fonte lida.
+        """
+        return self._nomesFontes
@@ -15,6 +15,8 @@ class TempratureWithHeader:
     - _variancia: Valor da variância, indicando a precisão da temperatura
     """
     
+    __slots__ = ('_header', '_temperatura', '_variancia')
+
     def __init__(self, header: Header, temperatura, variancia):
         self._header = header
         self._temperatura = temperatura
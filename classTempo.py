@@ -1,5 +1,3 @@
-import numpy as np
-
 class Tempo:
     """
     @author: Paulo Cruz e Daniel Peixoto
@@ -13,9 +11,11 @@ class Tempo:
         _nsecs (int): Número de nanosegundos.
     """
     
-    def __init__(self):
-        self._secs: int
-        self._nsecs: int
+    __slots__ = ('_secs', '_nsecs')
+
+    def __init__(self, secs=0, nsecs=0):
+        self._secs = secs
+        self._nsecs = nsecs
 
     def __str__(self):
         return f"sec: {self._secs}, nsec: {self._nsecs}"
@@ -55,3 +55,21 @@ class Tempo:
             nsecs (int): Número de nanosegundos.
         """
         self._nsecs = nsecs
+
+    @property
+    def tempoNs(self):
+        """
+        Retorna:
+            int: Instante exato em nanosegundos (secs * 1_000_000_000 + nsecs), sem arredondamentos de vírgula flutuante.
+        """
+        return self._secs * 1_000_000_000 + self._nsecs
+
+    @tempoNs.setter
+    def tempoNs(self, tempoNs):
+        """
+        Define o instante a partir de um valor em nanosegundos.
+
+        Parâmetros:
+            tempoNs (int): Instante em nanosegundos.
+        """
+        self._secs, self._nsecs = divmod(int(tempoNs), 1_000_000_000)
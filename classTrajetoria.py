@@ -1,13 +1,18 @@
-from matplotlib import pyplot as plt
+import os
 import numpy as np
-from classHeader import Header
-from classOrientacao import Orientacao
-from classPONTO import Ponto
-from classPose import Pose
-from classPoseWithHeader import PoseWithHeader
-from classTempo import Tempo
-from classTemperatureWithHeader import TempratureWithHeader
-from scipy.interpolate import CubicSpline
+from classAssociacaoTemporal import AssociacaoTemporal
+from classDecimacao import Decimacao
+from classExportacao import Exportacao
+from classIndiceEspacial import IndiceEspacial
+from classIndiceTempo import IndiceTempo
+from classIntegridade import Integridade
+from classInterpolacaoArco import InterpolacaoArco
+from classLeitorLogPose import LeitorLogPose
+from classPerfilador import Perfilador
+from classQuaternioes import Quaternioes
+from classTabelaFrameIds import TabelaFrameIds
+from classTemperatura import Temperatura
+from classVistaPontos import VistaPontos
 
 class Trajetoria:
     """
@@ -15,371 +20,341 @@ class Trajetoria:
 
     @info: exemplo de classe Trajetoria no âmbito da u.c. TOMSA
 
-    Representa a trajetória de um veículo, composta por múltiplos objetos PoseWithHeader.
+    Representa a trajetória de um veículo. Os pontos são guardados por colunas
+    (uma estrutura de arrays) em vez de uma lista de objetos PoseWithHeader;
+    a propriedade pontos continua a devolver objetos PoseWithHeader, construídos a pedido.
 
     Atributos:
-        _pontos (list): Lista de objetos PoseWithHeader que representam os pontos da trajetória.
+        _seq (np.ndarray): Sequência de cada ponto (int64, N).
+        _tempoNs (np.ndarray): Instante de cada ponto em nanosegundos (int64, N).
+        _frameIdCodigos (np.ndarray): Código do frame_id de cada ponto (int32, N).
+        _frameIds (TabelaFrameIds): Tabela dos frame_id distintos.
+        _posicoes (np.ndarray): Posições x, y, z (float64, Nx3).
+        _quaternioes (np.ndarray): Orientações q_0 (w), q_1 (x), q_2 (y), q_3 (z) (float64, Nx4).
+        _ordenado (bool): Verdadeiro se se sabe que os instantes não diminuem (ver Integridade).
+        _indiceTempo (IndiceTempo): Índice ordenado dos instantes (construído a pedido; None se ainda não existir).
+        _indiceEspacial (IndiceEspacial): Índice espacial das posições (construído a pedido; None se ainda não existir).
         _nome (str): Nome da trajetória.
         _freqMostragem (int): Intervalo de amostragem para a visualização dos vetores de orientação.
+        _orcamentoPontos (int): Número máximo de pontos desenhados por série (0 desliga a decimação).
+        _interpolacao (InterpolacaoArco): Interpolação das temperaturas ao longo da trajetória.
     """
     
-    def __init__(self, freqMostragem=1):
+    def __init__(self, freqMostragem=1, orcamentoPontos=50000, interpolacao=None):
         """Inicializa os atributos da classe"""
-        self._pontos = []
+        self._seq = np.empty(0, dtype=np.int64)
+        self._tempoNs = np.empty(0, dtype=np.int64)
+        self._frameIdCodigos = np.empty(0, dtype=np.int32)
+        self._frameIds = TabelaFrameIds()
+        self._posicoes = np.empty((0, 3), dtype=np.float64)
+        self._quaternioes = np.empty((0, 4), dtype=np.float64)
         self._nome = ""
+        self._ordenado = False
+        self._indiceTempo = None
+        self._indiceEspacial = None
         self._freqMostragem = freqMostragem
+        self._orcamentoPontos = orcamentoPontos
+        self._interpolacao = interpolacao if interpolacao is not None else InterpolacaoArco()
 
-    def ReadLogTrajetoria(self, pathFile):
-        """Lê um arquivo de log de trajetória e adiciona à lista de pontos com objetos PoseWithHeader"""
-        headerData = {}
-        positionData = {}
-        orientationData = {}
-        countPontosTotal = 0
-        countPontosValidos = 0
-        tempo = None
-        flagHeader, flagPosition, flagOrientation = False, False, False
-
-        with open(pathFile, 'r') as file:
-            for index, line in enumerate(file, start=1):
-                line = line.strip()
-                
-                # Ignorar linhas vazias ou inválidas
-                if not line:
-                    continue
+    def AcrescentarColunas(self, seq, tempoNs, frameIdCodigos, frameIds, posicoes, quaternioes, ordenado=False):
+        """
+        Acrescenta pontos, dados por colunas, ao fim da trajetória.
 
-                try:
-                    # Iniciar a leitura do header, posição ou orientação
-                    if line.startswith("header:"):
-                        countPontosTotal += 1
-                        flagHeader = True
-                        flagPosition = False
-                        flagOrientation = False
-                        tempo = Tempo()
-                        headerData = {}
-                    elif line.startswith("position:"):
-                        flagHeader = False
-                        flagPosition = True
-                        flagOrientation = False
-                        positionData = {}
-                    elif line.startswith("orientation:"):
-                        flagHeader = False
-                        flagPosition = False
-                        flagOrientation = True
-                        orientationData = {}
-
-                    # Processar dados do header
-                    if flagHeader:
-                        if line.startswith("seq:"):
-                            try:
-                                headerData['seq'] = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-                        elif line.startswith("frame_id:"):
-                            headerData['frame_id'] = line.split(":")[1].strip()
-                        elif line.startswith("secs:"):
-                            try:
-                                tempo.secs = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-                        elif line.startswith("nsecs:"):
-                            try:
-                                tempo.nsecs = int(line.split(":")[1].strip())
-                            except ValueError:
-                                flagHeader = False
-                                continue
-
-                    # Processar dados de posição (position)
-                    if flagPosition:
-                        if line.startswith("x:"):
-                            try:
-                                positionData['x'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagPosition = False
-                                continue
-                        elif line.startswith("y:"):
-                            try:
-                                positionData['y'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagPosition = False
-                                continue
-                        elif line.startswith("z:"):
-                            try:
-                                positionData['z'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagPosition = False
-                                continue
-
-                    # Processar dados de orientação (orientation)
-                    if flagOrientation:
-                        if line.startswith("x:"):
-                            try:
-                                orientationData['x'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagOrientation = False
-                                continue
-                        elif line.startswith("y:"):
-                            try:
-                                orientationData['y'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagOrientation = False
-                                continue
-                        elif line.startswith("z:"):
-                            try:
-                                orientationData['z'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagOrientation = False
-                                continue
-                        elif line.startswith("w:"):
-                            try:
-                                orientationData['w'] = float(line.split(":")[1].strip())
-                            except ValueError:
-                                flagOrientation = False
-                                continue
-
-                    # Verificar se temos uma pose completa (header, position, orientation)
-                    if (headerData and 'seq' in headerData and 'frame_id' in headerData 
-                        and hasattr(tempo, 'secs') and hasattr(tempo, 'nsecs')
-                        and 'x' in positionData and 'y' in positionData and 'z' in positionData
-                        and 'x' in orientationData and 'y' in orientationData and 'z' in orientationData and 'w' in orientationData):
-
-                        try:
-                            # Criar objetos correspondentes para a pose
-                            header = Header(headerData['seq'], tempo, headerData['frame_id'])
-                            position = Ponto(positionData['x'], positionData['y'], positionData['z'])
-                            orientation = Orientacao(orientationData['w'], orientationData['x'], orientationData['y'], orientationData['z'])
-                            pose = Pose(position, orientation)
-
-                            # Armazenar a pose na lista de poses
-                            novoPonto = PoseWithHeader(header, pose)
-                            self._pontos.append(novoPonto)
-                            countPontosValidos += 1  # Incrementar contagem de pontos válidos
-
-                            # Imprimir o ponto recém-adicionado
-                            # print(novoPonto)
-                        except Exception:
-                            # Ignorar este ponto e continuar com o próximo
-                            continue
-
-                        # Reiniciar os dicionários para o próximo ponto
-                        headerData = {}
-                        positionData = {}
-                        orientationData = {}
-                        flagHeader = False
-                        flagPosition = False
-                        flagOrientation = False
-
-                except (ValueError, KeyError, AttributeError):
-                    # Reiniciar os dicionários e flags para ignorar o ponto atual
-                    headerData = {}
-                    positionData = {}
-                    orientationData = {}
-                    flagHeader = False
-                    flagPosition = False
-                    flagOrientation = False
-                    continue
+        Parâmetros:
+            seq (array): Sequência de cada ponto (N).
+            tempoNs (array): Instante de cada ponto em nanosegundos (N).
+            frameIdCodigos (array): Código do frame_id de cada ponto, na numeração de frameIds (N).
+            frameIds (TabelaFrameIds ou list): Tabela dos frame_id a que os códigos se referem.
+            posicoes (array): Posições x, y, z (Nx3).
+            quaternioes (array): Quaterniões q_0, q_1, q_2, q_3 (Nx4).
+            ordenado (bool): Verdadeiro se se sabe que os instantes dados não diminuem (default = False).
+        """
+        codigos = self._frameIds.Fundir(frameIds, frameIdCodigos)
+        self._indiceTempo = None
+        self._indiceEspacial = None
+        self._ordenado = ordenado and (len(self._tempoNs) == 0 or len(tempoNs) == 0
+                                       or (self._ordenado and tempoNs[0] >= self._tempoNs[-1]))
+        posicoes = np.asarray(posicoes, dtype=np.float64).reshape(-1, 3)
+        quaternioes = np.asarray(quaternioes, dtype=np.float64).reshape(-1, 4)
+
+        if len(self._tempoNs) == 0:
+            self._seq = np.asarray(seq, dtype=np.int64)
+            self._tempoNs = np.asarray(tempoNs, dtype=np.int64)
+            self._frameIdCodigos = codigos
+            self._posicoes = posicoes
+            self._quaternioes = quaternioes
+        else:
+            self._seq = np.concatenate([self._seq, np.asarray(seq, dtype=np.int64)])
+            self._tempoNs = np.concatenate([self._tempoNs, np.asarray(tempoNs, dtype=np.int64)])
+            self._frameIdCodigos = np.concatenate([self._frameIdCodigos, codigos])
+            self._posicoes = np.concatenate([self._posicoes, posicoes])
+            self._quaternioes = np.concatenate([self._quaternioes, quaternioes])
+
+    def ReadLogTrajetoria(self, pathFile, processos=1, cache=None, ordenar=False):
+        """
+        Lê um arquivo de log de trajetória e acrescenta os pontos válidos às colunas da trajetória
+        e verifica a sua integridade (lacunas de seq, duplicadas e instantes fora de ordem; ver Integridade)
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de log.
+            processos (int): Número de processos usados na leitura de ficheiros grandes (default = 1).
+            cache (CacheLogs): Cache das colunas lidas; se não for dada, o ficheiro é sempre lido.
+            ordenar (bool): Ordenar os pontos por tempo e remover os duplicados (default = False).
+        """
+        leitor = LeitorLogPose()
+        with Perfilador.Etapa('lerPose') as etapa:
+            if cache is not None:
+                colunas, countPontosValidos, countPontosTotal = cache.LerFicheiro(leitor, pathFile, processos)
+            else:
+                colunas, countPontosValidos, countPontosTotal = leitor.LerFicheiro(pathFile, processos)
+            etapa.itens = countPontosTotal
+
+        with Perfilador.Etapa('integridade', len(colunas['tempoNs'])):
+            integridade = Integridade(pathFile)
+            integridade.Acrescentar(colunas['seq'], colunas['tempoNs'])
+            countDuplicados = 0
+            if ordenar:
+                selecao, countDuplicados = Integridade.Ordenar(colunas['tempoNs'], colunas['seq'])
+                if countDuplicados or not integridade.ordenado:
+                    colunas = {nome: coluna if nome == 'frameIds' else coluna[selecao] for nome, coluna in colunas.items()}
+            self.AcrescentarColunas(**colunas, ordenado=ordenar or integridade.ordenado)
 
         # Imprimir resumo dos pontos lidos
         print(f"Trajetórias do ficheiro {self._nome}, número de pontos válidos: {countPontosValidos} de {countPontosTotal}")
+        print(integridade.Relatorio())
+        if ordenar and (countDuplicados or not integridade.ordenado):
+            print(f"Pontos ordenados por tempo, {countDuplicados} duplicados removidos")
 
         return
 
-    def PlotTrajetoria(self, pontosTemperatura=None):
-        """Desenha a trajetória em 3D, com os eixos de orientação e temperaturas, se existirem."""
-        # Cria o gráfico 3D
-        figura = plt.figure()
-        eixo = figura.add_subplot(111, projection='3d')
+    def Exportar(self, pathFile, linhasPorGrupo=Exportacao.LINHAS_POR_GRUPO):
+        """
+        Exporta as colunas para um ficheiro Parquet (.parquet, requer pyarrow) ou NumPy (.npz).
 
-        # Chama os métodos auxiliares para criar a trajetória base, as orientações e as temperaturas
-        self.PlotTrajetoriaBase(eixo)
-        self.PlotOrientacoes(eixo)
-        if pontosTemperatura:
-            self.PlotTemperaturas(eixo, pontosTemperatura)
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de saída; o formato é dado pela extensão.
+            linhasPorGrupo (int): Número máximo de linhas de cada grupo de linhas do Parquet.
+        """
+        with Exportacao(pathFile, 'trajetoria', linhasPorGrupo) as exportacao:
+            exportacao.Acrescentar(self._Selecionar(slice(None)))
 
-        # Definir rótulos e legenda
-        eixo.set_xlabel('Eixo X (metros)')
-        eixo.set_ylabel('Eixo Y (metros)')
-        eixo.set_zlabel('Eixo Z (metros)')
-        eixo.set_title(f"Trajetória com Vetores de Orientação: {self._nome}")
-        eixo.legend()  # Exibir a legenda com os elementos adicionados
+    def Importar(self, pathFile):
+        """
+        Acrescenta às colunas os pontos de um ficheiro criado por Exportar.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro (.parquet ou .npz).
+
+        Exceções:
+            ValueError: Se o ficheiro não contiver dados de trajetória.
+        """
+        tipo, colunas = Exportacao.Carregar(pathFile)
+        if tipo != 'trajetoria':
+            raise ValueError(f"O ficheiro {pathFile} contém dados de {tipo}, não de trajetória")
+        self.AcrescentarColunas(**colunas)
+
+    # Elevação e azimute da câmara de cada vista (None mantém a vista 3D por omissão do matplotlib)
+    VISTAS = {
+        '3d': None,
+        'topo': (90, -90),
+        'lado': (0, -90),
+    }
+
+    def PlotTrajetoria(self, temperatura=None, tolerancia=5000):
+        """Desenha a trajetória em 3D, com os eixos de orientação e temperaturas, se existirem."""
+        from matplotlib import pyplot as plt
+
+        self.CriarFigura(temperatura, tolerancia)
 
         # Mostrar o gráfico
-        plt.show()
+        with Perfilador.Etapa('mostrar'):
+            plt.show()
 
-    def PlotTrajetoriaBase(self, eixo):
-        """Desenha a linha que conecta os pontos da trajetória no gráfico 3D."""
-        # Extrair os pontos (posição) da trajetória
-        valoresX = [p.pose.posicao.x for p in self._pontos]
-        valoresY = [p.pose.posicao.y for p in self._pontos]
-        valoresZ = [p.pose.posicao.z for p in self._pontos]
+    def CriarFigura(self, temperatura=None, tolerancia=5000, vista='3d', interativo=True, tamanho=None):
+        """
+        Cria a figura da trajetória em 3D, com os eixos de orientação e temperaturas, se existirem, sem a mostrar.
 
-        # Desenha a linha conectando os pontos da trajetória
-        eixo.plot(valoresX, valoresY, valoresZ, color='skyblue', label='Trajetória')
+        Parâmetros:
+            temperatura (Temperatura): Dados de temperatura a associar aos pontos (opcional).
+            tolerancia (int): Diferença máxima, em nanosegundos, entre uma pose e a temperatura associada.
+            vista (str): Vista da câmara, uma das chaves de VISTAS (default = '3d').
+            interativo (bool): Se verdadeiro, liga a informação da temperatura ao movimento do cursor.
+            tamanho (tuple): Largura e altura da figura em polegadas (opcional).
 
-    def PlotOrientacoes(self, eixo):
-        """Adiciona vetores de orientação em pontos específicos da trajetória com base na frequência de amostragem."""
-        countPrint = 0
+        Retorna:
+            Figure: Figura criada.
+        """
+        from matplotlib import pyplot as plt
 
-        for index, ponto in enumerate(self._pontos):
-            # Adiciona orientação com base na frequência de amostragem
-            if index % self._freqMostragem == 0:
-                posicao = ponto.pose.posicao
-                orientacao = ponto.pose.orientacao
-                
-                 # Extrai componentes do quaterniao
-                componentes = np.array([orientacao.q_0, orientacao.q_1, orientacao.q_2, orientacao.q_3])
+        with Perfilador.Etapa('criarFigura'):
+            # Cria o gráfico 3D
+            figura = plt.figure(figsize=tamanho)
+            eixo = figura.add_subplot(111, projection='3d')
 
-                # Normaliza o quartenião
-                normalizacaoQuarteniao = componentes / np.linalg.norm(componentes)
+            # Chama os métodos auxiliares para criar a trajetória base, as orientações e as temperaturas
+            self.PlotTrajetoriaBase(eixo)
+            self.PlotOrientacoes(eixo)
+            if temperatura is not None and len(temperatura):
+                self.PlotTemperaturas(eixo, temperatura, tolerancia, interativo)
 
-                # Validar quartenião
-                if ( np.linalg.norm(normalizacaoQuarteniao), 1.0):
+            # Definir rótulos e legenda
+            eixo.set_xlabel('Eixo X (metros)')
+            eixo.set_ylabel('Eixo Y (metros)')
+            eixo.set_zlabel('Eixo Z (metros)')
+            eixo.set_title(f"Trajetória com Vetores de Orientação: {self._nome}")
+            eixo.legend()  # Exibir a legenda com os elementos adicionados
 
-                    # Reconstrói a orientação normalizada como um objeto Orientacao
-                    orientacaoNormalizada = Orientacao(*normalizacaoQuarteniao)
+            if self.VISTAS[vista] is not None:
+                eixo.view_init(*self.VISTAS[vista])
 
-                    # Extrai a matriz de rotação a partir do quaternião normalizado
-                    matrizRotacao = orientacaoNormalizada.RotationMatrix()
+        return figura
 
-                    # Extrai a matriz de rotação a partir dos quaterniões
-                    matrizRotacao = orientacao.RotationMatrix()
+    def GuardarFiguras(self, pathFile, temperatura=None, tolerancia=5000, vistas=('3d',), dpi=100, tamanho=None):
+        """
+        Guarda a figura da trajetória em ficheiro, uma por vista, sem janelas nem eventos de interação.
+        O formato (PNG, SVG, PDF, ...) é dado pela extensão de pathFile. Com mais do que uma vista,
+        o nome de cada ficheiro recebe o sufixo da vista (por exemplo voo_topo.png).
 
-                    # Vetores dos eixos locais (X, Y, Z) após aplicação da matriz de rotação e multiplicados por um fator de escala
-                    vetorX = matrizRotacao[:, 0] * 0.1  # Vetor X (vermelho)
-                    vetorY = matrizRotacao[:, 1] * 0.1  # Vetor Y (verde)
-                    vetorZ = matrizRotacao[:, 2] * 0.1  # Vetor Z (azul)
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de saída.
+            temperatura (Temperatura): Dados de temperatura a associar aos pontos (opcional).
+            tolerancia (int): Diferença máxima, em nanosegundos, entre uma pose e a temperatura associada.
+            vistas (list): Vistas a guardar, chaves de VISTAS (default = ('3d',)).
+            dpi (int): Resolução das imagens (default = 100).
+            tamanho (tuple): Largura e altura das figuras em polegadas (opcional).
 
-                    # Desenha os vetores de orientação no ponto atual
-                    eixo.quiver(posicao.x, posicao.y, posicao.z, vetorX[0], vetorX[1], vetorX[2], color='r', normalize=False)
-                    eixo.quiver(posicao.x, posicao.y, posicao.z, vetorY[0], vetorY[1], vetorY[2], color='g', normalize=False)
-                    eixo.quiver(posicao.x, posicao.y, posicao.z, vetorZ[0], vetorZ[1], vetorZ[2], color='b', normalize=False)
-                    countPrint += 1
+        Retorna:
+            list: Caminhos dos ficheiros escritos.
+        """
+        from matplotlib import pyplot as plt
+
+        base, extensao = os.path.splitext(pathFile)
+        ficheiros = []
+        for vista in vistas:
+            figura = self.CriarFigura(temperatura, tolerancia, vista, interativo=False, tamanho=tamanho)
+            ficheiro = pathFile if len(vistas) == 1 else f"{base}_{vista}{extensao}"
+            with Perfilador.Etapa('savefig'):
+                figura.savefig(ficheiro, dpi=dpi)
+            plt.close(figura)
+            ficheiros.append(ficheiro)
+        return ficheiros
+
+    def PlotTrajetoriaBase(self, eixo):
+        """Desenha a linha que conecta os pontos da trajetória no gráfico 3D, decimada até ao orçamento de pontos."""
+        with Perfilador.Etapa('trajetoriaBase', len(self._posicoes)):
+            # Escolhe os pontos que preservam a forma da trajetória
+            posicoes = self._posicoes[Decimacao.LTTB(self._posicoes, self._orcamentoPontos)]
 
-        print(f"Número de orientações impressas: {countPrint}")
+            # Desenha a linha conectando os pontos (posição) da trajetória
+            eixo.plot(posicoes[:, 0], posicoes[:, 1], posicoes[:, 2], color='skyblue', label='Trajetória')
+
+    def PlotOrientacoes(self, eixo):
+        """
+        Adiciona vetores de orientação em pontos específicos da trajetória com base na frequência de amostragem.
+        Os vetores de todos os pontos são calculados de uma só vez e desenhados com um único quiver por eixo.
+        """
+        with Perfilador.Etapa('orientacoes') as etapa:
+            # Pontos escolhidos com base na frequência de amostragem
+            posicoes = self._posicoes[::self._freqMostragem]
+            countPrint = len(posicoes)
+            etapa.itens = countPrint
+
+            # Matrizes de rotação de todos os pontos, a partir dos quaterniões
+            matrizesRotacao = Quaternioes.MatrizesRotacao(self._quaternioes[::self._freqMostragem])
+
+            # Vetores dos eixos locais (X, Y, Z) após aplicação da matriz de rotação e multiplicados por um fator de escala
+            for coluna, cor, rotulo in ((0, 'r', 'Vetor X'), (1, 'g', 'Vetor Y'), (2, 'b', 'Vetor Z')):
+                vetores = matrizesRotacao[:, :, coluna] * 0.1
+                if countPrint == 0:
+                    # Criar vetores apenas para a legenda
+                    eixo.quiver(0, 0, 0, 0, 0, 0, color=cor, label=rotulo)
+                    continue
+                eixo.quiver(posicoes[:, 0], posicoes[:, 1], posicoes[:, 2],
+                            vetores[:, 0], vetores[:, 1], vetores[:, 2], color=cor, normalize=False, label=rotulo)
 
-        # Criar vetores apenas para a legenda
-        eixo.quiver(0, 0, 0, 0, 0, 0, color='r', label='Vetor X')
-        eixo.quiver(0, 0, 0, 0, 0, 0, color='g', label='Vetor Y')
-        eixo.quiver(0, 0, 0, 0, 0, 0, color='b', label='Vetor Z')
+            print(f"Número de orientações impressas: {countPrint}")
 
-        # Exibir a legenda
-        eixo.legend(loc='upper right', fontsize='small')
+            # Exibir a legenda
+            eixo.legend(loc='upper right', fontsize='small')
 
     
-    def PlotTemperaturas(self, eixo, pontosTemperatura=None):
-        """Adiciona as temperaturas aos pontos da trajetória e realiza interpolação cúbica para suavizar a visualização."""
-        if pontosTemperatura is None:
-            return
+    def PlotTemperaturas(self, eixo, temperatura=None, tolerancia=5000, interativo=True):
+        """
+        Adiciona as temperaturas aos pontos da trajetória e interpola-as ao longo do percurso para suavizar a
+        visualização (ver InterpolacaoArco). Cada pose recebe a temperatura mais próxima no tempo, se a diferença
+        não exceder a tolerância (em nanosegundos).
+        A informação da temperatura sob o cursor só é ligada se interativo for verdadeiro.
+        """
+        from matplotlib import pyplot as plt
 
-        # Extrair os timestamps das poses
-        poseNanoSegs = [p.header.stamp.secs * 1e9 + p.header.stamp.nsecs for p in self._pontos]
-
-        # Extrair os valores de temperatura e respetivos timestamps
-        temperaturas = [t.temperatura for t in pontosTemperatura]
-        temperaturaNanoSegs = [t.header.stamp.secs * 1e9 + t.header.stamp.nsecs for t in pontosTemperatura]
-
-        pontosFiltrados = []
-
-        # Plotar cada ponto da trajetória e associar a temperatura mais próxima
-        for i, poseNs in enumerate(poseNanoSegs):
-            pontoAtual = self._pontos[i]
-
-            # Encontrar a temperatura mais próxima em termos de tempo
-            diferencasTempo = [abs(tempNs - poseNs) for tempNs in temperaturaNanoSegs]
-
-            # Verificar se existe uma temperatura suficientemente próxima para associar
-            if diferencasTempo:
-                minDiferenca = min(diferencasTempo)
-                indiceTempMaisProxima = diferencasTempo.index(minDiferenca)
-
-                # Definir um limite para considerar uma temperatura próxima
-                limiteTempo = 5000  
-
-                if minDiferenca <= limiteTempo:
-                    # Armazena a informação da temperatura para futura exibição
-                    pontosFiltrados.append({
-                        'x': pontoAtual.pose.posicao.x,
-                        'y': pontoAtual.pose.posicao.y,
-                        'z': pontoAtual.pose.posicao.z,
-                        'temperatura': temperaturas[indiceTempMaisProxima]
-                    })
-
-        temperaturasInterpoladas = []
-        xInterpolados, yInterpolados, zInterpolados = [], [], []
-
-        # Interpolação de temperatura e posições
-        for i in range(len(pontosFiltrados) - 1):
-            ponto1 = pontosFiltrados[i]
-            ponto2 = pontosFiltrados[i + 1]
-            if (ponto1['x'] == ponto2['x'] and 
-                ponto1['y'] == ponto2['y'] and 
-                ponto1['z'] == ponto2['z']):
-                continue
-
-            # Obter as temperaturas associadas aos pontos P1 e P2
-            temp1 = ponto1['temperatura']
-            temp2 = ponto2['temperatura']
-
-            # Converter os pontos em arrays numpy para operações de vetor
-            ponto1Arr = np.array([ponto1['x'], ponto1['y'], ponto1['z']])
-            ponto2Arr = np.array([ponto2['x'], ponto2['y'], ponto2['z']])
-
-            # Definir as temperaturas para a interpolação
-            temperaturas = [temp1, temp2]
-
-            # Definir a distância entre P1 e P2
-            distancias = [0, np.linalg.norm(ponto2Arr - ponto1Arr)]
-
-            # Criar a spline cúbica para a temperatura ao longo da distância
-            
-            splineCubic = CubicSpline(distancias, temperaturas)
-
-            # Definir os pontos de interpolação ao longo da linha entre P1 e P2
-            distInterpolada = np.linspace(0, distancias[1], 10)
-            tempInterpolada = splineCubic(distInterpolada)
-
-            # Adicionar os pontos interpolados para exibição futura
-            for dist in distInterpolada:
-                pontoInterpolado = ponto1Arr + (dist / distancias[1]) * (ponto2Arr - ponto1Arr)
-                xInterpolados.append(pontoInterpolado[0])
-                yInterpolados.append(pontoInterpolado[1])
-                zInterpolados.append(pontoInterpolado[2])
-                temperaturasInterpoladas.append(tempInterpolada[np.where(distInterpolada == dist)][0])
-
-        # Criar o scatter plot dos pontos originais e interpolados
-        dispersaoOriginal = eixo.scatter(
-            [p['x'] for p in pontosFiltrados], 
-            [p['y'] for p in pontosFiltrados], 
-            [p['z'] for p in pontosFiltrados],
-            c=[p['temperatura'] for p in pontosFiltrados], 
-            cmap='autumn', 
-            marker='o', 
-            edgecolor='black', 
-            s=50,  # Tamanho maior para destacar
-            label='Pontos Originais'
-        )
-
-        dispersaoInterpolada = eixo.scatter(
-            xInterpolados, 
-            yInterpolados, 
-            zInterpolados, 
-            c=temperaturasInterpoladas, 
-            cmap='viridis', 
-            marker='x', 
-            s=20,  # Tamanho menor para interpolados
-            label='Pontos Interpolados'
-        )
-
-        # Adicionar uma barra de cores para representar as temperaturas
-        barraCores = plt.colorbar(dispersaoInterpolada, ax=eixo, shrink=0.5, aspect=10)
-        barraCores.set_label('Temperatura (°C)')
+        if temperatura is None:
+            return
+        if not isinstance(temperatura, Temperatura):
+            # Lista de objetos TempratureWithHeader
+            pontosTemperatura = temperatura
+            temperatura = Temperatura()
+            temperatura.pontosTemperatura = list(pontosTemperatura)
+
+        with Perfilador.Etapa('associacao', len(self._tempoNs)):
+            # Associar a cada pose a temperatura mais próxima no tempo, dentro da tolerância
+            associacao = AssociacaoTemporal(tolerancia)
+            indices, mascara = associacao.Associar(self._tempoNs, temperatura.tempoNs, temperatura.ordenado)
+            posicoesFiltradas = self._posicoes[mascara]
+            temperaturasFiltradas = temperatura.temperaturas[indices[mascara]]
+
+        with Perfilador.Etapa('interpolacao', len(temperaturasFiltradas)):
+            # Uma única interpolação ao longo do comprimento de arco de todos os pontos associados
+            posicoesInterpoladas, temperaturasInterpoladas = self._interpolacao.Interpolar(
+                posicoesFiltradas, temperaturasFiltradas, self._tempoNs[mascara])
+            xInterpolados, yInterpolados, zInterpolados = posicoesInterpoladas.T
+
+        with Perfilador.Etapa('artistas'):
+            # Decimar os pontos até ao orçamento, preservando os extremos de temperatura
+            indicesOriginais = Decimacao.MinMax(temperaturasFiltradas, self._orcamentoPontos)
+            posicoesFiltradas = posicoesFiltradas[indicesOriginais]
+            temperaturasFiltradas = temperaturasFiltradas[indicesOriginais]
+            indicesInterpolados = Decimacao.MinMax(temperaturasInterpoladas, self._orcamentoPontos)
+            xInterpolados = xInterpolados[indicesInterpolados]
+            yInterpolados = yInterpolados[indicesInterpolados]
+            zInterpolados = zInterpolados[indicesInterpolados]
+            temperaturasInterpoladas = temperaturasInterpoladas[indicesInterpolados]
+
+            # Criar o scatter plot dos pontos originais e interpolados
+            dispersaoOriginal = eixo.scatter(
+                posicoesFiltradas[:, 0],
+                posicoesFiltradas[:, 1],
+                posicoesFiltradas[:, 2],
+                c=temperaturasFiltradas,
+                cmap='autumn', 
+                marker='o', 
+                edgecolor='black', 
+                s=50,  # Tamanho maior para destacar
+                label='Pontos Originais'
+            )
+
+            dispersaoInterpolada = eixo.scatter(
+                xInterpolados, 
+                yInterpolados, 
+                zInterpolados, 
+                c=temperaturasInterpoladas, 
+                cmap='viridis', 
+                marker='x', 
+                s=20,  # Tamanho menor para interpolados
+                label='Pontos Interpolados'
+            )
+
+            # Adicionar uma barra de cores para representar as temperaturas
+            barraCores = plt.colorbar(dispersaoInterpolada, ax=eixo, shrink=0.5, aspect=10)
+            barraCores.set_label('Temperatura (°C)')
 
         # Definir os rótulos dos eixos
         eixo.set_xlabel('Eixo X (metros)')
         eixo.set_ylabel('Eixo Y (metros)')
         eixo.set_zlabel('Eixo Z (metros)')
 
+        if not interativo:
+            return
+
         # Configuração inicial do título da figura para exibir os dados ao passar o cursor
         fig = eixo.figure
         fig.suptitle("Passe o cursor sobre os pontos para ver a temperatura", fontsize=12)
@@ -388,7 +363,7 @@ class Trajetoria:
             # Obter o índice do ponto mais próximo
             indicePonto = infoIndice["ind"][0]
             if graficoDispersao == dispersaoOriginal:
-                texto = f"Original - Temperatura: {pontosFiltrados[indicePonto]['temperatura']:.2f}°C"
+                texto = f"Original - Temperatura: {temperaturasFiltradas[indicePonto]:.2f}°C"
             else:
                 texto = f"Interpolado - Temperatura: {temperaturasInterpoladas[indicePonto]:.2f}°C"
             fig.suptitle(texto, fontsize=12)
@@ -409,24 +384,185 @@ class Trajetoria:
 
         # Ligar a função de hover ao evento de movimento do cursor
         fig.canvas.mpl_connect("motion_notify_event", PassarCursor)
-        plt.show()
 
 
 
+    def IndiceTempo(self):
+        """
+        Retorna:
+            IndiceTempo: Índice ordenado dos instantes da trajetória, construído no primeiro acesso
+            e guardado até as colunas serem alteradas.
+        """
+        if self._indiceTempo is None:
+            self._indiceTempo = IndiceTempo(self._tempoNs, self._ordenado)
+        return self._indiceTempo
+
+    def SliceTime(self, t0, t1):
+        """
+        Seleciona os pontos com instante t no intervalo t0 <= t < t1, em O(log N).
+
+        Parâmetros:
+            t0 (int): Início do intervalo, em nanosegundos.
+            t1 (int): Fim (exclusivo) do intervalo, em nanosegundos.
+
+        Retorna:
+            dict: Colunas dos pontos selecionados, por ordem de tempo, no formato aceite por
+            AcrescentarColunas. Se os instantes estiverem ordenados, as colunas são vistas (sem cópia).
+        """
+        return self._Selecionar(self.IndiceTempo().Intervalo(t0, t1))
+
+    def At(self, t):
+        """
+        Seleciona os pontos com instante exatamente igual a t, em O(log N).
+
+        Parâmetros:
+            t (int): Instante em nanosegundos.
+
+        Retorna:
+            dict: Colunas dos pontos selecionados, como em SliceTime.
+        """
+        return self._Selecionar(self.IndiceTempo().Intervalo(t, t + 1))
+
+    def Nearest(self, t):
+        """
+        Procura o ponto com o instante mais próximo de t, em O(log N).
+
+        Parâmetros:
+            t (int): Instante em nanosegundos.
+
+        Retorna:
+            int: Índice do ponto nas colunas, ou None se não houver pontos.
+        """
+        return self.IndiceTempo().MaisProximo(t)
+
+    def IndiceEspacial(self):
+        """
+        Retorna:
+            IndiceEspacial: Índice espacial (KD-tree) das posições, construído no primeiro acesso
+            e guardado até as colunas serem alteradas.
+        """
+        if self._indiceEspacial is None:
+            self._indiceEspacial = IndiceEspacial(self._posicoes)
+        return self._indiceEspacial
+
+    def VizinhosMaisProximos(self, pontos, k=1):
+        """
+        Procura os k pontos da trajetória mais próximos de cada ponto dado (ver IndiceEspacial.MaisProximos).
+
+        Retorna:
+            tuple: (distancias, indices) dos pontos da trajetória.
+        """
+        return self.IndiceEspacial().MaisProximos(pontos, k)
+
+    def PontosNoRaio(self, ponto, raio):
+        """
+        Procura os pontos da trajetória a uma distância de ponto não superior a raio (em metros).
+
+        Retorna:
+            np.ndarray: Índices dos pontos, por ordem crescente.
+        """
+        return self.IndiceEspacial().NoRaio(ponto, raio)
+
+    def PontosNaCaixa(self, minimo, maximo):
+        """
+        Procura os pontos da trajetória dentro da caixa alinhada com os eixos [minimo, maximo].
+
+        Retorna:
+            np.ndarray: Índices dos pontos, por ordem crescente.
+        """
+        return self.IndiceEspacial().NaCaixa(minimo, maximo)
+
+    def _Selecionar(self, selecao):
+        """Aplica uma seleção (slice ou array de índices) a todas as colunas."""
+        return {
+            'seq': self._seq[selecao],
+            'tempoNs': self._tempoNs[selecao],
+            'frameIdCodigos': self._frameIdCodigos[selecao],
+            'posicoes': self._posicoes[selecao],
+            'quaternioes': self._quaternioes[selecao],
+            'frameIds': self._frameIds,
+        }
+
     @property
     def pontos(self):
         """
         Retorna:
-            list: Lista de objetos PoseWithHeader que representam os pontos da trajetória.
+            VistaPontos: Vista, com interface de lista, de objetos PoseWithHeader construídos a pedido a partir das colunas.
         """
-        return self._pontos
+        return VistaPontos(self)
     
     @pontos.setter
     def pontos(self, pontos):
         """
-        Define a lista de pontos da trajetória.
+        Define os pontos da trajetória, substituindo as colunas existentes.
 
         Parâmetros:
             pontos (list): Lista de objetos PoseWithHeader.
         """
-        self._pontos = pontos
+        frameIds = TabelaFrameIds()
+        self._indiceTempo = None
+        self._indiceEspacial = None
+        self._ordenado = False
+        self._seq = np.array([p.header.seq for p in pontos], dtype=np.int64)
+        self._tempoNs = np.array([p.header.stamp.tempoNs for p in pontos], dtype=np.int64)
+        self._frameIdCodigos = np.array([frameIds.Codigo(p.header.frame_id) for p in pontos], dtype=np.int32)
+        self._frameIds = frameIds
+        self._posicoes = np.array([(p.pose.posicao.x, p.pose.posicao.y, p.pose.posicao.z) for p in pontos], dtype=np.float64).reshape(-1, 3)
+        self._quaternioes = np.array([(p.pose.orientacao.q_0, p.pose.orientacao.q_1, p.pose.orientacao.q_2, p.pose.orientacao.q_3)
+                                      for p in pontos], dtype=np.float64).reshape(-1, 4)
+
+    @property
+    def ordenado(self):
+        """
+        Retorna:
+            bool: Verdadeiro se se sabe que os instantes dos pontos não diminuem.
+        """
+        return self._ordenado
+
+    @property
+    def seq(self):
+        """
+        Retorna:
+            np.ndarray: Sequência de cada ponto (int64, N).
+        """
+        return self._seq
+
+    @property
+    def tempoNs(self):
+        """
+        Retorna:
+            np.ndarray: Instante de cada ponto em nanosegundos (int64, N).
+        """
+        return self._tempoNs
+
+    @property
+    def frameIdCodigos(self):
+        """
+        Retorna:
+            np.ndarray: Código do frame_id de cada ponto (int32, N).
+        """
+        return self._frameIdCodigos
+
+    @property
+    def frameIds(self):
+        """
+        Retorna:
+            TabelaFrameIds: Tabela dos frame_id distintos, indexada pelo código.
+        """
+        return self._frameIds
+
+    @property
+    def posicoes(self):
+        """
+        Retorna:
+            np.ndarray: Posições x, y, z (float64, Nx3).
+        """
+        return self._posicoes
+
+    @property
+    def quaternioes(self):
+        """
+        Retorna:
+            np.ndarray: Quaterniões q_0 (w), q_1 (x), q_2 (y), q_3 (z) (float64, Nx4).
+        """
+        return self._quaternioes
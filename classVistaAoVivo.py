@@ -0,0 +1,247 @@
+import os
+import numpy as np
+from classAssociacaoTemporal import AssociacaoTemporal
+from classDecimacaoIncremental import DecimacaoIncremental
+from classPerfilador import Perfilador
+from classQuaternioes import Quaternioes
+
+class VistaAoVivo:
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe VistaAoVivo no âmbito da u.c. TOMSA
+
+    Figura 3D da trajetória atualizada à medida que chegam poses e temperaturas novas (ver
+    SeguidorLog). Os elementos gráficos são criados uma vez e depois só os seus dados são
+    substituídos. Os pontos desenhados de cada série são mantidos por DecimacaoIncremental,
+    por isso a memória e o custo de cada atualização ficam limitados pelo orçamento de
+    pontos, qualquer que seja a duração do voo; a posição e a orientação atuais são sempre
+    desenhadas, mesmo quando o último ponto recebido não é um dos pontos mantidos. Pela mesma
+    razão é usada para desenhar ficheiros lidos por pedaços (ver LeituraFluxo).
+
+    Cada pose recebe a temperatura mais próxima no tempo, dentro da tolerância, tal como em
+    Trajetoria.PlotTemperaturas. Como as temperaturas chegam ao longo do tempo, uma pose só
+    é associada quando já não pode chegar nenhuma temperatura dentro da tolerância (a última
+    temperatura recebida é posterior ao instante da pose mais a tolerância); até lá fica
+    pendente. Só são guardadas as temperaturas recentes que ainda podem ser associadas.
+
+    Atributos:
+        _nome (str): Nome da trajetória.
+        _freqMostragem (int): Intervalo, em poses, entre os vetores de orientação desenhados.
+        _associacao (AssociacaoTemporal): Associação das poses às temperaturas.
+        _trajeto (DecimacaoIncremental): Posições da linha da trajetória.
+        _orientacoes (DecimacaoIncremental): Posições e vetores dos eixos de orientação desenhados.
+        _temperaturas (DecimacaoIncremental): Posições e temperaturas das poses associadas.
+        _countPoses (int): Número de poses recebidas.
+        _ultimaPose (tuple): Instante, posição e quaternião da última pose recebida (None se ainda não houver).
+        _pendentes (tuple): Instantes e posições das poses por associar.
+        _recentes (tuple): Instantes e valores das temperaturas recentes.
+        _minimo, _maximo (np.ndarray): Limites das posições recebidas.
+        _artistas (dict): Elementos gráficos da figura (None até CriarFigura).
+    """
+
+    # Número máximo de eixos de orientação desenhados
+    MAXIMO_ORIENTACOES = 2000
+    # Número máximo de poses pendentes e de temperaturas recentes guardadas (se um dos logs parar de crescer)
+    MAXIMO_PENDENTES = 100000
+
+    def __init__(self, nome="", freqMostragem=1, orcamentoPontos=50000, tolerancia=5000) -> None:
+        capacidade = orcamentoPontos if orcamentoPontos > 0 else 50000
+        self._nome = nome
+        self._freqMostragem = max(1, freqMostragem)
+        self._associacao = AssociacaoTemporal(tolerancia)
+        self._trajeto = DecimacaoIncremental(capacidade)
+        self._orientacoes = DecimacaoIncremental(min(capacidade, self.MAXIMO_ORIENTACOES))
+        self._temperaturas = DecimacaoIncremental(capacidade)
+        self._countPoses = 0
+        self._ultimaPose = None
+        self._pendentes = (np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64))
+        self._recentes = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        self._minimo = np.full(3, np.inf)
+        self._maximo = np.full(3, -np.inf)
+        self._artistas = None
+
+    def AcrescentarPoses(self, colunas):
+        """
+        Acrescenta poses recebidas.
+
+        Parâmetros:
+            colunas (dict): Colunas lidas por LeitorLogPose (tempoNs, posicoes, quaternioes, ...).
+        """
+        tempoNs = colunas['tempoNs']
+        posicoes = colunas['posicoes']
+        quaternioes = colunas['quaternioes']
+        k = len(tempoNs)
+        if k == 0:
+            return
+
+        self._trajeto.Acrescentar(posicoes=posicoes)
+        self._minimo = np.minimum(self._minimo, posicoes.min(axis=0))
+        self._maximo = np.maximum(self._maximo, posicoes.max(axis=0))
+
+        # Eixos de orientação nas poses múltiplas de freqMostragem, contadas desde o início
+        selecao = np.flatnonzero((self._countPoses + np.arange(k)) % self._freqMostragem == 0)
+        if len(selecao):
+            vetores = Quaternioes.MatrizesRotacao(quaternioes[selecao]) * 0.1
+            self._orientacoes.Acrescentar(posicoes=posicoes[selecao], vetores=vetores)
+        self._countPoses += k
+        self._ultimaPose = (tempoNs[-1], posicoes[-1].copy(), quaternioes[-1].copy())
+
+        pendentesTempo, pendentesPosicoes = self._pendentes
+        self._pendentes = (np.concatenate([pendentesTempo, tempoNs])[-self.MAXIMO_PENDENTES:],
+                           np.concatenate([pendentesPosicoes, posicoes])[-self.MAXIMO_PENDENTES:])
+        self._Associar()
+
+    def AcrescentarTemperaturas(self, colunas):
+        """
+        Acrescenta temperaturas recebidas.
+
+        Parâmetros:
+            colunas (dict): Colunas lidas por LeitorLogTemperatura (tempoNs, temperaturas, ...).
+        """
+        if len(colunas['tempoNs']) == 0:
+            return
+        temposRecentes, valoresRecentes = self._recentes
+        self._recentes = (np.concatenate([temposRecentes, colunas['tempoNs']])[-self.MAXIMO_PENDENTES:],
+                          np.concatenate([valoresRecentes, colunas['temperaturas']])[-self.MAXIMO_PENDENTES:])
+        self._Associar()
+
+    def _Associar(self):
+        """Associa as poses pendentes cuja temperatura já não pode mudar e descarta as temperaturas antigas."""
+        pendentesTempo, pendentesPosicoes = self._pendentes
+        temposRecentes, valoresRecentes = self._recentes
+        if len(pendentesTempo) == 0 or len(temposRecentes) == 0:
+            return
+        tolerancia = self._associacao.tolerancia
+
+        # Uma temperatura futura chega depois da última recebida e fica fora da tolerância destas poses
+        prontas = pendentesTempo < temposRecentes.max() - tolerancia
+        if prontas.any():
+            indices, mascara = self._associacao.Associar(pendentesTempo[prontas], temposRecentes)
+            self._temperaturas.Acrescentar(posicoes=pendentesPosicoes[prontas][mascara],
+                                           temperaturas=valoresRecentes[indices[mascara]])
+            self._pendentes = (pendentesTempo[~prontas], pendentesPosicoes[~prontas])
+
+        # Só as temperaturas que ainda podem ser associadas às poses pendentes ou futuras
+        inicio = self._ultimaPose[0] if len(self._pendentes[0]) == 0 else self._pendentes[0].min()
+        manter = temposRecentes >= inicio - tolerancia
+        manter[-1] = True
+        self._recentes = (temposRecentes[manter], valoresRecentes[manter])
+
+    def CriarFigura(self, tamanho=None):
+        """
+        Cria a figura e os elementos gráficos, ainda sem dados.
+
+        Parâmetros:
+            tamanho (tuple): Largura e altura da figura em polegadas (opcional).
+
+        Retorna:
+            Figure: Figura criada.
+        """
+        from matplotlib import pyplot as plt
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+        figura = plt.figure(figsize=tamanho)
+        eixo = figura.add_subplot(111, projection='3d')
+        linha, = eixo.plot([], [], [], color='skyblue', label='Trajetória')
+        atual, = eixo.plot([], [], [], 'o', color='black', markersize=6, label='Posição atual')
+        eixosOrientacao = []
+        for cor, rotulo in (('r', 'Vetor X'), ('g', 'Vetor Y'), ('b', 'Vetor Z')):
+            colecao = Line3DCollection([[(0, 0, 0), (0, 0, 0)]], colors=cor, label=rotulo)
+            eixo.add_collection3d(colecao)
+            eixosOrientacao.append(colecao)
+        dispersao = eixo.scatter([], [], [], c=[], cmap='autumn', marker='o', edgecolor='black', s=30, label='Temperaturas')
+        barraCores = plt.colorbar(dispersao, ax=eixo, shrink=0.5, aspect=10)
+        barraCores.set_label('Temperatura (°C)')
+
+        eixo.set_xlabel('Eixo X (metros)')
+        eixo.set_ylabel('Eixo Y (metros)')
+        eixo.set_zlabel('Eixo Z (metros)')
+        eixo.set_title(f"Trajetória com Vetores de Orientação: {self._nome}")
+        eixo.legend(loc='upper right', fontsize='small')
+
+        self._artistas = {'eixo': eixo, 'linha': linha, 'atual': atual,
+                          'orientacoes': eixosOrientacao, 'dispersao': dispersao}
+        return figura
+
+    def Atualizar(self):
+        """Substitui os dados dos elementos gráficos pelos pontos mantidos; o custo é limitado pelo orçamento de pontos."""
+        if self._artistas is None or self._ultimaPose is None:
+            return
+        artistas = self._artistas
+        with Perfilador.Etapa('atualizarFigura', len(self._trajeto)):
+            posicoes = self._trajeto.Coluna('posicoes')
+            _, ultimaPosicao, ultimoQuaterniao = self._ultimaPose
+            artistas['linha'].set_data_3d(np.append(posicoes[:, 0], ultimaPosicao[0]),
+                                          np.append(posicoes[:, 1], ultimaPosicao[1]),
+                                          np.append(posicoes[:, 2], ultimaPosicao[2]))
+            artistas['atual'].set_data_3d([ultimaPosicao[0]], [ultimaPosicao[1]], [ultimaPosicao[2]])
+
+            # Eixos de orientação mantidos e os da pose atual
+            origens = np.vstack([self._orientacoes.Coluna('posicoes').reshape(-1, 3), ultimaPosicao])
+            vetores = np.concatenate([self._orientacoes.Coluna('vetores').reshape(-1, 3, 3),
+                                      Quaternioes.MatrizesRotacao(ultimoQuaterniao[None, :]) * 0.1])
+            for coluna, colecao in enumerate(artistas['orientacoes']):
+                colecao.set_segments(np.stack([origens, origens + vetores[:, :, coluna]], axis=1))
+
+            if len(self._temperaturas):
+                posicoesTemperatura = self._temperaturas.Coluna('posicoes')
+                temperaturas = self._temperaturas.Coluna('temperaturas')
+                dispersao = artistas['dispersao']
+                dispersao._offsets3d = (posicoesTemperatura[:, 0], posicoesTemperatura[:, 1], posicoesTemperatura[:, 2])
+                dispersao.set_array(temperaturas)
+                dispersao.set_clim(temperaturas.min(), temperaturas.max())
+
+            # Os eixos 3D não se ajustam sozinhos aos dados novos
+            margem = np.maximum((self._maximo - self._minimo) * 0.05, 0.1)
+            eixo = artistas['eixo']
+            eixo.set_xlim(self._minimo[0] - margem[0], self._maximo[0] + margem[0])
+            eixo.set_ylim(self._minimo[1] - margem[1], self._maximo[1] + margem[1])
+            eixo.set_zlim(self._minimo[2] - margem[2], self._maximo[2] + margem[2])
+            eixo.figure.canvas.draw_idle()
+
+    def GuardarFiguras(self, pathFile, vistas=('3d',), dpi=100, tamanho=None):
+        """
+        Guarda a figura com os pontos recebidos, uma por vista, como Trajetoria.GuardarFiguras.
+
+        Parâmetros:
+            pathFile (str): Caminho do ficheiro de saída; o formato é dado pela extensão.
+            vistas (list): Vistas a guardar, chaves de Trajetoria.VISTAS (default = ('3d',)).
+            dpi (int): Resolução das imagens (default = 100).
+            tamanho (tuple): Largura e altura das figuras em polegadas (opcional).
+
+        Retorna:
+            list: Caminhos dos ficheiros escritos.
+        """
+        from matplotlib import pyplot as plt
+        from classTrajetoria import Trajetoria
+
+        figura = self.CriarFigura(tamanho)
+        self.Atualizar()
+        base, extensao = os.path.splitext(pathFile)
+        ficheiros = []
+        for vista in vistas:
+            # A mesma figura serve todas as vistas: a vista 3D repõe a câmara por omissão do matplotlib
+            self._artistas['eixo'].view_init(*(Trajetoria.VISTAS[vista] or (30, -60)))
+            ficheiro = pathFile if len(vistas) == 1 else f"{base}_{vista}{extensao}"
+            with Perfilador.Etapa('savefig'):
+                figura.savefig(ficheiro, dpi=dpi)
+            ficheiros.append(ficheiro)
+        plt.close(figura)
+        return ficheiros
+
+    @property
+    def countPoses(self):
+        """
+        Retorna:
+            int: Número de poses recebidas.
+        """
+        return self._countPoses
+
+    @property
+    def countTemperaturas(self):
+        """
+        Retorna:
+            int: Número de poses associadas a uma temperatura.
+        """
+        return self._temperaturas.total
@@ -0,0 +1,83 @@
+from collections.abc import Sequence
+from classHeader import Header
+from classOrientacao import Orientacao
+from classPONTO import Ponto
+from classPose import Pose
+from classPoseWithHeader import PoseWithHeader
+from classTempo import Tempo
+from classTemperatureWithHeader import TempratureWithHeader
+
+class VistaPontos(Sequence):
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe VistaPontos no âmbito da u.c. TOMSA
+
+    Vista preguiçosa sobre as colunas de uma Trajetoria. Comporta-se como uma lista
+    de objetos PoseWithHeader, mas cada objeto só é construído quando o respetivo
+    índice é acedido. Os objetos devolvidos são cópias: alterá-los não altera as colunas.
+
+    Atributos:
+        _trajetoria (Trajetoria): Trajetória cujas colunas são lidas.
+    """
+
+    def __init__(self, trajetoria) -> None:
+        self._trajetoria = trajetoria
+
+    def __len__(self):
+        return len(self._trajetoria.tempoNs)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fora dos limites da trajetória")
+
+        trajetoria = self._trajetoria
+        tempo = Tempo(*divmod(int(trajetoria.tempoNs[indice]), 1_000_000_000))
+        header = Header(int(trajetoria.seq[indice]), tempo, trajetoria.frameIds[int(trajetoria.frameIdCodigos[indice])])
+
+        x, y, z = trajetoria.posicoes[indice].tolist()
+        q_0, q_1, q_2, q_3 = trajetoria.quaternioes[indice].tolist()
+        pose = Pose(Ponto(x, y, z), Orientacao(q_0, q_1, q_2, q_3))
+
+        return PoseWithHeader(header, pose)
+
+
+class VistaPontosTemperatura(Sequence):
+    """
+    @author: Paulo Cruz e Daniel Peixoto
+
+    @info: exemplo de classe VistaPontosTemperatura no âmbito da u.c. TOMSA
+
+    Vista preguiçosa sobre as colunas de uma Temperatura. Comporta-se como uma lista
+    de objetos TempratureWithHeader, construídos apenas quando o respetivo índice é acedido.
+    Os objetos devolvidos são cópias: alterá-los não altera as colunas.
+
+    Atributos:
+        _temperatura (Temperatura): Dados de temperatura cujas colunas são lidas.
+    """
+
+    def __init__(self, temperatura) -> None:
+        self._temperatura = temperatura
+
+    def __len__(self):
+        return len(self._temperatura.tempoNs)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fora dos limites dos dados de temperatura")
+
+        temperatura = self._temperatura
+        tempo = Tempo(*divmod(int(temperatura.tempoNs[indice]), 1_000_000_000))
+        header = Header(int(temperatura.seq[indice]), tempo, temperatura.frameIds[int(temperatura.frameIdCodigos[indice])])
+
+        return TempratureWithHeader(header, float(temperatura.temperaturas[indice]), float(temperatura.variancias[indice]))
@@ -0,0 +1,47 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações da classe Decimacao no âmbito da u.c. TOMSA
+
+Executar com: python -m pytest test_decimacao.py
+"""
+import sys
+import numpy as np
+import pytest
+from classDecimacao import Decimacao
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 10, 101])
+def test_minmax_orcamento(n):
+    valores = np.sin(np.arange(n) * 0.7) * np.arange(n)
+    for orcamento in range(1, n + 3):
+        indices = Decimacao.MinMax(valores, orcamento)
+        assert len(indices) <= orcamento
+        assert np.all(np.diff(indices) > 0)
+        if n > 1:
+            assert indices[0] == 0
+            if orcamento >= 2:
+                assert indices[-1] == n - 1
+    # Orçamento nulo ou negativo desliga a decimação
+    assert len(Decimacao.MinMax(valores, 0)) == n
+
+
+def test_minmax_extremos():
+    valores = np.zeros(100)
+    valores[37] = 5.0
+    valores[62] = -3.0
+    indices = Decimacao.MinMax(valores, 6)
+    assert 37 in indices and 62 in indices
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 10, 101])
+def test_lttb_orcamento(n):
+    posicoes = np.column_stack([np.arange(n), np.cos(np.arange(n) * 0.3), np.zeros(n)])
+    for orcamento in range(1, n + 3):
+        indices = Decimacao.LTTB(posicoes, orcamento)
+        assert len(indices) <= orcamento
+        assert np.all(np.diff(indices) > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
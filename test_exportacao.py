@@ -0,0 +1,72 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações do subcomando exportar no âmbito da u.c. TOMSA
+
+Executar com: python -m pytest test_exportacao.py
+"""
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from classExportacao import Exportacao
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(PASTA, '24tomsa_grupo01.py')
+
+
+def Exportar(destino, *argumentos):
+    """Executa o subcomando exportar e devolve o resultado do processo."""
+    return subprocess.run([sys.executable, SCRIPT, 'exportar', '--destino', str(destino), '--semCache', *argumentos],
+                          cwd=PASTA, capture_output=True, text=True)
+
+
+def Formatos():
+    """Formatos de exportação disponíveis (o Parquet só com o pacote pyarrow)."""
+    formatos = ['npz']
+    try:
+        import pyarrow  # noqa: F401
+        formatos.append('parquet')
+    except ImportError:
+        pass
+    return formatos
+
+
+@pytest.mark.parametrize('formato', Formatos())
+@pytest.mark.parametrize('comTemperatura', [True, False])
+def test_sincronizar(tmp_path, formato, comTemperatura):
+    argumentos = ['--logPose', 'logs/drone1.txt', '--formato', formato, '--sincronizar', '0.1']
+    if comTemperatura:
+        argumentos += ['--logTemp', 'logs/temperature_drone.txt']
+    resultado = Exportar(tmp_path, *argumentos)
+    assert resultado.returncode == 0, resultado.stderr
+
+    tipo, colunas = Exportacao.Carregar(str(tmp_path / f"drone1_sincronizado.{formato}"))
+    assert tipo == 'sincronizacao'
+    n = len(colunas['tempoNs'])
+    assert n > 0
+    assert colunas['posicoes'].shape == (n, 3)
+    assert colunas['temperaturas'].shape == (n,)
+    if comTemperatura:
+        assert np.isfinite(colunas['temperaturas'][colunas['validos']]).all()
+    else:
+        # Sem temperatura as colunas existem, com NaN, e a validade depende só das poses
+        assert np.isnan(colunas['temperaturas']).all()
+        assert np.isnan(colunas['variancias']).all()
+        assert colunas['validos'].all()
+
+
+def test_ajuda_indica_exportar():
+    # O subcomando é tratado antes do argparse, por isso a ajuda principal tem de o indicar
+    resultado = subprocess.run([sys.executable, SCRIPT, '--help'], cwd=PASTA, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    assert 'exportar --help' in resultado.stdout
+
+    resultado = subprocess.run([sys.executable, SCRIPT, 'exportar', '--help'], cwd=PASTA, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    assert 'usage: 24tomsa_grupo01.py exportar' in resultado.stdout
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,42 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações das importações no âmbito da u.c. TOMSA
+
+O matplotlib e o SciPy só são importados nos caminhos que desenham ou interpolam, para que
+ler, resumir ou exportar os logs (e --help) não pague o seu tempo de importação. Cada módulo
+é importado num processo novo, para que as importações de um não escondam as de outro.
+
+Executar com: python -m pytest test_imports.py
+"""
+import glob
+import os
+import subprocess
+import sys
+import pytest
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PACOTES_PESADOS = ('matplotlib', 'mpl_toolkits', 'scipy')
+
+# Modelos e leitores (classX.py) e o script da linha de comando, que começa por um dígito
+MODULOS = sorted(os.path.basename(path) for path in glob.glob(os.path.join(PASTA, 'class*.py'))) + ['24tomsa_grupo01.py']
+
+VERIFICACAO = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location('modulo', sys.argv[1])
+modulo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(modulo)
+print(' '.join(nome for nome in sys.modules if nome.split('.')[0] in sys.argv[2:]))
+"""
+
+
+@pytest.mark.parametrize('modulo', MODULOS)
+def test_importacao_sem_pacotes_pesados(modulo):
+    resultado = subprocess.run([sys.executable, '-c', VERIFICACAO, modulo, *PACOTES_PESADOS],
+                               cwd=PASTA, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.split() == [], f"{modulo} importa {resultado.stdout.strip()} ao ser importado"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
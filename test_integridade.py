@@ -0,0 +1,123 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações da classe Integridade no âmbito da u.c. TOMSA
+
+Executar com: python -m pytest test_integridade.py
+"""
+import sys
+import numpy as np
+import pytest
+from classIntegridade import Integridade
+
+
+def OrdenarForcaBruta(tempoNs, seq, grupos=None):
+    """Mantém a primeira mensagem de cada (instante, seq, grupo) e ordena por tempo e, em empate, pela posição original."""
+    grupos = [0] * len(tempoNs) if grupos is None else grupos
+    vistas = set()
+    manter = []
+    for i, chave in enumerate(zip(tempoNs, seq, grupos)):
+        if chave not in vistas:
+            vistas.add(chave)
+            manter.append(i)
+    manter = np.array(manter, dtype=np.int64)
+    ordem = np.lexsort((manter, np.asarray(tempoNs, dtype=np.int64)[manter]))
+    return manter[ordem], len(tempoNs) - len(manter)
+
+
+def Contagens(integridade):
+    return (integridade.count, integridade.lacunas, integridade.duplicadas, integridade._recuosSeq,
+            integridade.foraDeOrdem, integridade._temposRepetidos, integridade.quebras, integridade._maioresLacunas)
+
+
+def test_ordenar_duplicadas_nao_seguidas():
+    # A mensagem 4 repete a 1 e a 5 repete a 0, com outras mensagens pelo meio
+    tempoNs = [30, 10, 20, 10, 10, 30, 20]
+    seq = [3, 1, 2, 5, 1, 3, 2]
+    selecao, countDuplicadas = Integridade.Ordenar(tempoNs, seq)
+    np.testing.assert_array_equal(selecao, [1, 3, 2, 0])
+    assert countDuplicadas == 3
+
+    # Sem deduplicar, só a ordenação estável
+    selecao, countDuplicadas = Integridade.Ordenar(tempoNs, seq, deduplicar=False)
+    np.testing.assert_array_equal(selecao, [1, 3, 4, 2, 6, 0, 5])
+    assert countDuplicadas == 0
+
+
+def test_ordenar_grupos():
+    # O mesmo instante e seq em grupos diferentes não é duplicado
+    tempoNs = [10, 10, 10, 10]
+    seq = [1, 1, 1, 1]
+    selecao, countDuplicadas = Integridade.Ordenar(tempoNs, seq, grupos=[0, 1, 0, 1])
+    np.testing.assert_array_equal(selecao, [0, 1])
+    assert countDuplicadas == 2
+
+
+@pytest.mark.parametrize('semente', range(20))
+def test_ordenar_forca_bruta(semente):
+    gerador = np.random.default_rng(semente)
+    n = int(gerador.integers(0, 60))
+    tempoNs = gerador.integers(0, 8, n)
+    seq = gerador.integers(0, 4, n)
+    grupos = gerador.integers(0, 2, n)
+    for comGrupos in [False, True]:
+        esperado, countEsperado = OrdenarForcaBruta(tempoNs.tolist(), seq.tolist(), grupos.tolist() if comGrupos else None)
+        selecao, countDuplicadas = Integridade.Ordenar(tempoNs, seq, grupos=grupos if comGrupos else None)
+        np.testing.assert_array_equal(selecao, esperado)
+        assert countDuplicadas == countEsperado
+    # Sem deduplicar, igual a uma ordenação lexicográfica por tempo e posição original
+    selecao, _ = Integridade.Ordenar(tempoNs, seq, deduplicar=False)
+    np.testing.assert_array_equal(selecao, np.lexsort((np.arange(n), tempoNs)))
+
+
+SEQ = [0, 1, 2, 2, 5, 6, 4, 7, 7, 8, 20, 21]
+TEMPOS = [0, 10, 20, 20, 30, 40, 35, 50, 50, 60, 500, 510]
+
+
+def test_contagens():
+    integridade = Integridade("teste", intervaloMaximo=100)
+    integridade.Acrescentar(SEQ, TEMPOS)
+    assert integridade.count == 12
+    # Saltos 2->5 (2 em falta), 4->7 (2 em falta) e 8->20 (11 em falta)
+    assert integridade.lacunas == (3, 15)
+    assert integridade._maioresLacunas == [(8, 20), (2, 5), (4, 7)]
+    # Só contam as duplicadas seguidas (2 e 7); 6->4 é um recuo de seq e 40->35 um instante fora de ordem
+    assert integridade.duplicadas == 2
+    assert integridade._recuosSeq == 1
+    assert integridade.foraDeOrdem == 1
+    assert not integridade.ordenado
+    assert integridade._temposRepetidos == 0
+    assert integridade.quebras == 1
+    assert integridade._maiorIntervalo == 440
+
+    # O mesmo instante com outro seq é um instante repetido, não uma duplicada
+    integridade = Integridade()
+    integridade.Acrescentar([1, 2, 1], [10, 10, 20])
+    assert (integridade.duplicadas, integridade._temposRepetidos, integridade._recuosSeq) == (0, 1, 1)
+
+
+@pytest.mark.parametrize('tamanho', [1, 2, 3, 5])
+def test_contagens_por_pedacos(tamanho):
+    # Por pedaços, a última mensagem de um pedaço é comparada com a primeira do seguinte
+    inteiro = Integridade(intervaloMaximo=100)
+    inteiro.Acrescentar(SEQ, TEMPOS)
+    pedacos = Integridade(intervaloMaximo=100)
+    for inicio in range(0, len(SEQ), tamanho):
+        pedacos.Acrescentar(SEQ[inicio:inicio + tamanho], TEMPOS[inicio:inicio + tamanho])
+    pedacos.Acrescentar([], [])
+    assert Contagens(pedacos) == Contagens(inteiro)
+
+
+def test_quebras_pela_mediana():
+    # Sem intervaloMaximo, é FATOR_QUEBRA vezes a mediana dos intervalos positivos do primeiro pedaço
+    integridade = Integridade()
+    integridade.Acrescentar([0, 1, 2, 3], [0, 10, 20, 30])
+    integridade.Acrescentar([4, 5], [81, 200])
+    assert integridade._intervaloMaximo == 50
+    assert integridade.quebras == 2
+    assert integridade.lacunas == (0, 0)
+    assert "2 quebras" in integridade.Relatorio()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,106 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações da classe IntercalacaoTemporal no âmbito da u.c. TOMSA
+
+Executar com: python -m pytest test_intercalacao.py
+"""
+import sys
+import numpy as np
+import pytest
+from classIntercalacaoTemporal import IntercalacaoTemporal
+
+
+def Pedacos(tempos, fonte, tamanho, frameId='mapa'):
+    """Divide os instantes de uma fonte em pedaços de colunas, como os de LeitorLog.LerPedacos."""
+    tempos = np.asarray(tempos, dtype=np.int64)
+    pedacos = []
+    for inicio in range(0, len(tempos), tamanho):
+        parte = tempos[inicio:inicio + tamanho]
+        colunas = {
+            'tempoNs': parte,
+            'valores': fonte * 1000 + np.arange(inicio, inicio + len(parte), dtype=np.int64),
+            'frameIds': [frameId],
+            'frameIdCodigos': np.zeros(len(parte), dtype=np.int32),
+        }
+        pedacos.append((colunas, len(parte), len(parte) + 1))
+    return pedacos
+
+
+def Intercalar(fontes, tamanho):
+    """Intercala as fontes e junta os pedaços num só dicionário de colunas."""
+    intercalacao = IntercalacaoTemporal([Pedacos(tempos, fonte, tamanho, f"mapa{fonte % 2}")
+                                         for fonte, tempos in enumerate(fontes)])
+    partes = list(intercalacao)
+    nomes = ['tempoNs', 'valores', 'fontes', 'frameIdCodigos']
+    colunas = {nome: np.concatenate([parte[nome] for parte in partes]) if partes else np.zeros(0, dtype=np.int64)
+               for nome in nomes}
+    frameIds = partes[-1]['frameIds'] if partes else None
+    return colunas, frameIds, intercalacao.contagens
+
+
+def Esperado(fontes):
+    """Intercalação por força bruta: ordem por tempo, depois pela fonte e pela ordem dentro da fonte."""
+    tempos, fontesMensagens, posicoes = [], [], []
+    for fonte, temposFonte in enumerate(fontes):
+        tempos += list(temposFonte)
+        fontesMensagens += [fonte] * len(temposFonte)
+        posicoes += range(len(temposFonte))
+    tempos = np.array(tempos, dtype=np.int64)
+    fontesMensagens = np.array(fontesMensagens, dtype=np.int64)
+    posicoes = np.array(posicoes, dtype=np.int64)
+    ordem = np.lexsort((posicoes, fontesMensagens, tempos))
+    return tempos[ordem], fontesMensagens[ordem] * 1000 + posicoes[ordem], fontesMensagens[ordem]
+
+
+FONTES = {
+    'empates': [[0, 10, 10, 20, 30], [10, 10, 20, 40], [10, 20, 20, 30]],
+    'vazias': [[], [5, 15, 25], [], [0, 15, 30], []],
+    'todasVazias': [[], []],
+    'umaFonte': [[1, 2, 2, 3, 8]],
+    'mesmoInstante': [[7, 7, 7], [7, 7], [7]],
+}
+
+
+@pytest.mark.parametrize('tamanho', [1, 2, 3, 100])
+@pytest.mark.parametrize('caso', sorted(FONTES))
+def test_intercalacao(caso, tamanho):
+    fontes = FONTES[caso]
+    colunas, frameIds, contagens = Intercalar(fontes, tamanho)
+    tempos, valores, fontesMensagens = Esperado(fontes)
+    np.testing.assert_array_equal(colunas['tempoNs'], tempos)
+    # Em empate, as mensagens ficam pela ordem das fontes e, na mesma fonte, pela ordem original
+    np.testing.assert_array_equal(colunas['valores'], valores)
+    np.testing.assert_array_equal(colunas['fontes'], fontesMensagens)
+    assert contagens == [(len(tempos), len(tempos) + -(-len(tempos) // tamanho)) for tempos in fontes]
+    if len(tempos):
+        nomes = [frameIds[codigo] for codigo in colunas['frameIdCodigos']]
+        assert nomes == [f"mapa{fonte % 2}" for fonte in fontesMensagens]
+
+
+@pytest.mark.parametrize('semente', range(5))
+def test_intercalacao_aleatoria(semente):
+    # Muitos empates entre e dentro das fontes, com pedaços de tamanhos diferentes
+    gerador = np.random.default_rng(semente)
+    fontes = [np.sort(gerador.integers(0, 20, gerador.integers(0, 30))) for _ in range(4)]
+    for tamanho in [1, 2, 5, 7]:
+        colunas, _, _ = Intercalar(fontes, tamanho)
+        tempos, valores, _ = Esperado(fontes)
+        np.testing.assert_array_equal(colunas['tempoNs'], tempos)
+        np.testing.assert_array_equal(colunas['valores'], valores)
+
+
+def test_pedacos_vazios():
+    # Pedaços vazios no meio de uma fonte são saltados sem a terminar
+    vazio = ({'tempoNs': np.zeros(0, dtype=np.int64), 'valores': np.zeros(0, dtype=np.int64),
+              'frameIds': [], 'frameIdCodigos': np.zeros(0, dtype=np.int32)}, 0, 2)
+    fonte0 = Pedacos([0, 10], 0, 1)
+    fonte1 = Pedacos([5, 15], 1, 1)
+    intercalacao = IntercalacaoTemporal([[vazio, fonte0[0], vazio, vazio, fonte0[1]], [fonte1[0], vazio, fonte1[1], vazio]])
+    tempos = np.concatenate([parte['tempoNs'] for parte in intercalacao])
+    np.testing.assert_array_equal(tempos, [0, 5, 10, 15])
+    assert intercalacao.contagens == [(2, 10), (2, 8)]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
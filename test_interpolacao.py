@@ -0,0 +1,71 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações da classe InterpolacaoArco no âmbito da u.c. TOMSA
+
+Executar com: python -m pytest test_interpolacao.py
+"""
+import sys
+import numpy as np
+import pytest
+from scipy.interpolate import CubicSpline
+from classInterpolacaoArco import InterpolacaoArco
+
+
+def InterpolarOriginal(posicoes, temperaturas):
+    """Interpolação segmento a segmento do PlotTemperaturas original (spline cúbica de dois nós, 10 pontos)."""
+    temperaturasInterpoladas = []
+    pontosInterpolados = []
+    for i in range(len(posicoes) - 1):
+        ponto1Arr = np.asarray(posicoes[i], dtype=np.float64)
+        ponto2Arr = np.asarray(posicoes[i + 1], dtype=np.float64)
+        if np.array_equal(ponto1Arr, ponto2Arr):
+            continue
+        distancias = [0, np.linalg.norm(ponto2Arr - ponto1Arr)]
+        splineCubic = CubicSpline(distancias, [temperaturas[i], temperaturas[i + 1]])
+        distInterpolada = np.linspace(0, distancias[1], 10)
+        tempInterpolada = splineCubic(distInterpolada)
+        for dist in distInterpolada:
+            pontosInterpolados.append(ponto1Arr + (dist / distancias[1]) * (ponto2Arr - ponto1Arr))
+            temperaturasInterpoladas.append(tempInterpolada[np.where(distInterpolada == dist)][0])
+    return np.array(pontosInterpolados).reshape(-1, 3), np.array(temperaturasInterpoladas)
+
+
+def Percurso(semente, n=40):
+    """Percurso com posições repetidas (seguidas, no início e no fim) e temperaturas diferentes em cada amostra."""
+    gerador = np.random.default_rng(semente)
+    posicoes = np.cumsum(gerador.normal(size=(n, 3)), axis=0)
+    repetidas = gerador.random(n) < 0.3
+    repetidas[[1, n - 1]] = True
+    for i in np.flatnonzero(repetidas):
+        posicoes[i] = posicoes[i - 1]
+    return posicoes, 20 + gerador.normal(size=n)
+
+
+@pytest.mark.parametrize('semente', range(10))
+def test_linear_igual_ao_original(semente):
+    posicoes, temperaturas = Percurso(semente)
+    esperadasPosicoes, esperadasTemperaturas = InterpolarOriginal(posicoes, temperaturas)
+    obtidasPosicoes, obtidasTemperaturas = InterpolacaoArco('linear').Interpolar(posicoes, temperaturas)
+    np.testing.assert_allclose(obtidasPosicoes, esperadasPosicoes, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(obtidasTemperaturas, esperadasTemperaturas, rtol=0, atol=1e-9)
+
+
+def test_posicao_repetida():
+    # A segunda amostra repete a posição da primeira: o segmento seguinte parte da temperatura da última
+    posicoes = [[0, 0, 0], [0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 0, 0]]
+    temperaturas = [10.0, 20.0, 30.0, 40.0, 50.0]
+    _, valores = InterpolacaoArco('linear', amostrasSegmento=2).Interpolar(posicoes, temperaturas)
+    np.testing.assert_array_equal(valores, [20.0, 30.0, 30.0, 40.0])
+    for metodo in ['pchip', 'cubica']:
+        _, valores = InterpolacaoArco(metodo, amostrasSegmento=2).Interpolar(posicoes, temperaturas)
+        np.testing.assert_allclose(valores, [20.0, 30.0, 30.0, 50.0])
+
+
+def test_poucos_pontos():
+    posicoes, valores = InterpolacaoArco('linear').Interpolar([[1, 2, 3], [1, 2, 3]], [1.0, 2.0])
+    assert posicoes.shape == (0, 3) and valores.shape == (0,)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
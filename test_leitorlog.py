@@ -0,0 +1,361 @@
+"""
+@author: Paulo Cruz e Daniel Peixoto
+
+@info: verificações dos leitores rápidos de logs no âmbito da u.c. TOMSA
+
+Os leitores rápidos são comparados, mensagem a mensagem, com os leitores linha a linha
+originais (reproduzidos aqui como referência) em logs gerados com erros aleatórios.
+
+Executar com: python -m pytest test_leitorlog.py
+"""
+import bz2
+import gzip
+import lzma
+import sys
+import numpy as np
+import pytest
+from classFicheiroLog import FicheiroLog
+from classGeradorLogs import GeradorLogs
+from classLeitorLogPose import LeitorLogPose
+from classLeitorLogTemperatura import LeitorLogTemperatura
+
+
+class Tempo:
+    """Instante de uma mensagem, como no leitor original (hasattr indica se secs/nsecs foram lidos)."""
+
+
+def LerPoseOriginal(pathFile, heranca=True):
+    """
+    Leitor de logs de pose original (Trajetoria.ReadLogTrajetoria antes dos leitores rápidos).
+
+    Parâmetros:
+        pathFile (str): Caminho do ficheiro de log.
+        heranca (bool): Com False, o "header:" descarta também a posição e a orientação da mensagem
+            anterior (o leitor original só as descarta quando completa uma pose).
+
+    Retorna:
+        tuple: (poses, countPontosValidos, countPontosTotal), com cada pose um tuplo
+        (seq, tempoNs, frame_id, x, y, z, w, qx, qy, qz).
+    """
+    poses = []
+    headerData, positionData, orientationData = {}, {}, {}
+    countPontosTotal = 0
+    tempo = None
+    flagHeader, flagPosition, flagOrientation = False, False, False
+
+    with open(pathFile, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("header:"):
+                countPontosTotal += 1
+                flagHeader, flagPosition, flagOrientation = True, False, False
+                tempo = Tempo()
+                headerData = {}
+                if not heranca:
+                    positionData, orientationData = {}, {}
+            elif line.startswith("position:"):
+                flagHeader, flagPosition, flagOrientation = False, True, False
+                positionData = {}
+            elif line.startswith("orientation:"):
+                flagHeader, flagPosition, flagOrientation = False, False, True
+                orientationData = {}
+
+            chave, _, resto = line.partition(":")
+            valor = resto.split(":")[0].strip()
+            try:
+                if flagHeader and chave in ('seq', 'secs', 'nsecs'):
+                    if chave == 'seq':
+                        headerData['seq'] = int(valor)
+                    else:
+                        setattr(tempo, chave, int(valor))
+                elif flagHeader and chave == 'frame_id':
+                    headerData['frame_id'] = valor
+                elif flagPosition and chave in ('x', 'y', 'z'):
+                    positionData[chave] = float(valor)
+                elif flagOrientation and chave in ('x', 'y', 'z', 'w'):
+                    orientationData[chave] = float(valor)
+            except ValueError:
+                # Valor inválido: o resto da secção é ignorado
+                flagHeader, flagPosition, flagOrientation = False, False, False
+                continue
+
+            if ('seq' in headerData and 'frame_id' in headerData and hasattr(tempo, 'secs') and hasattr(tempo, 'nsecs')
+                    and len(positionData) == 3 and len(orientationData) == 4):
+                poses.append((headerData['seq'], tempo.secs * 1_000_000_000 + tempo.nsecs, headerData['frame_id'],
+                              positionData['x'], positionData['y'], positionData['z'],
+                              orientationData['w'], orientationData['x'], orientationData['y'], orientationData['z']))
+                headerData, positionData, orientationData = {}, {}, {}
+                flagHeader, flagPosition, flagOrientation = False, False, False
+    return poses, len(poses), countPontosTotal
+
+
+def LerTemperaturaOriginal(pathFile):
+    """
+    Leitor de logs de temperatura original (Temperatura.ReadLogTempratura antes dos leitores rápidos).
+
+    Retorna:
+        tuple: (temperaturas, countPontosValidos, countPontosTotal), com cada temperatura um tuplo
+        (seq, tempoNs, frame_id, temperatura, variancia).
+    """
+    temperaturas = []
+    headerData = {}
+    countPontosTotal = 0
+    tempo = None
+    temperatura = variancia = None
+    flagHeader = False
+
+    with open(pathFile, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("header:"):
+                countPontosTotal += 1
+                flagHeader = True
+                headerData = {}
+                tempo = Tempo()
+                temperatura = variancia = None
+
+            chave, _, resto = line.partition(":")
+            valor = resto.split(":")[0].strip()
+            if flagHeader:
+                try:
+                    if chave == 'seq':
+                        headerData['seq'] = int(valor)
+                    elif chave in ('secs', 'nsecs'):
+                        setattr(tempo, chave, int(valor))
+                    elif chave == 'frame_id':
+                        headerData['frame_id'] = valor
+                except ValueError:
+                    flagHeader = False
+                    continue
+                try:
+                    if chave == 'temperature':
+                        temperatura = float(valor)
+                    elif chave == 'variance':
+                        variancia = float(valor)
+                except ValueError:
+                    # Temperatura ou variância inválida: só o valor é ignorado
+                    continue
+
+            if ('seq' in headerData and 'frame_id' in headerData and hasattr(tempo, 'secs') and hasattr(tempo, 'nsecs')
+                    and temperatura is not None and variancia is not None):
+                temperaturas.append((headerData['seq'], tempo.secs * 1_000_000_000 + tempo.nsecs, headerData['frame_id'],
+                                     temperatura, variancia))
+                headerData = {}
+                tempo = Tempo()
+                temperatura = variancia = None
+                flagHeader = False
+    return temperaturas, len(temperaturas), countPontosTotal
+
+
+# Valores que os leitores originais aceitam, escritos de outras formas, e valores inválidos
+VALORES_ALTERNATIVOS = ['+5', '007', '1_0', '-0', '1E3', '.5', '5.', 'inf', '-nan', ' 12 ', '3: lixo']
+VALORES_INVALIDOS = ['', '?', 'abc', '1.2.3', '1e', '--1', '0x10', '1 2', '_1']
+
+
+def Fuzzar(pathOrigem, pathDestino, semente, taxa=0.3):
+    """
+    Escreve uma cópia de um log com erros aleatórios em cerca de uma fração taxa das mensagens:
+    valores inválidos ou escritos de outra forma, linhas em falta, repetidas (com outro valor),
+    trocadas ou em branco, espaços à volta, mensagens truncadas e "header:" repetidos.
+    """
+    rng = np.random.default_rng(semente)
+    with open(pathOrigem, 'rb') as f:
+        texto = f.read()
+    finalLinha = b'\r\n' if b'\r\n' in texto else b'\n'
+    mensagens = texto.split(b'header:')[1:]
+    partes = []
+    for mensagem in mensagens:
+        linhas = (b'header:' + mensagem).split(finalLinha)[:-1]
+        for _ in range(rng.integers(1, 3) if rng.random() < taxa else 0):
+            linhas = Corromper(linhas, rng)
+        partes.append(b''.join(linha + finalLinha for linha in linhas))
+    with open(pathDestino, 'wb') as f:
+        f.write(b''.join(partes))
+
+
+def Corromper(linhas, rng):
+    """Aplica um erro aleatório às linhas de uma mensagem."""
+    if not linhas:
+        return linhas
+    comValor = [i for i, linha in enumerate(linhas) if linha.partition(b':')[2].strip()]
+    i = int(rng.integers(len(linhas)))
+    erro = rng.integers(9)
+    if erro <= 1 and comValor:
+        j = comValor[rng.integers(len(comValor))]
+        valores = VALORES_INVALIDOS if erro == 0 else VALORES_ALTERNATIVOS
+        chave = linhas[j].partition(b':')[0]
+        linhas[j] = chave + b': ' + valores[rng.integers(len(valores))].encode()
+    elif erro == 2:
+        del linhas[i]
+    elif erro == 3 and comValor:
+        # Campo repetido, com outro valor, na linha seguinte
+        j = comValor[rng.integers(len(comValor))]
+        linhas.insert(j + 1, linhas[j].partition(b':')[0] + b': ' + str(rng.integers(100)).encode())
+    elif erro == 4:
+        linhas = linhas[:i]
+    elif erro == 5 and i + 1 < len(linhas):
+        linhas[i], linhas[i + 1] = linhas[i + 1], linhas[i]
+    elif erro == 6:
+        linhas.insert(i, [b'', b'   ', b'\t'][rng.integers(3)])
+    elif erro == 7:
+        linhas[i] = b' ' * int(rng.integers(3)) + linhas[i].strip() + b' \t'[:rng.integers(3)]
+    else:
+        linhas.insert(i, b'header:')
+    return linhas
+
+
+def Linhas(colunas):
+    """Converte as colunas de um leitor rápido numa lista de tuplos como os dos leitores originais."""
+    nomes = colunas['frameIds']
+    frameIds = [nomes[codigo] for codigo in colunas['frameIdCodigos'].tolist()]
+    if 'posicoes' in colunas:
+        valores = zip(colunas['posicoes'].tolist(), colunas['quaternioes'].tolist())
+        return [(seq, tempoNs, frameId, *posicao, *quaternio) for seq, tempoNs, frameId, (posicao, quaternio)
+                in zip(colunas['seq'].tolist(), colunas['tempoNs'].tolist(), frameIds, valores)]
+    return list(zip(colunas['seq'].tolist(), colunas['tempoNs'].tolist(), frameIds,
+                    colunas['temperaturas'].tolist(), colunas['variancias'].tolist()))
+
+
+def Iguais(linhas, referencia):
+    """Compara duas listas de mensagens, valor a valor (NaN é igual a NaN)."""
+    assert len(linhas) == len(referencia)
+    for i, (linha, esperada) in enumerate(zip(linhas, referencia)):
+        assert all(valor == outro or valor != valor and outro != outro for valor, outro in zip(linha, esperada)), \
+            f"mensagem {i}: {linha} != {esperada}"
+
+
+@pytest.mark.parametrize('tamanhoBloco', [8 * 1024 * 1024, 700])
+@pytest.mark.parametrize('semente', range(6))
+def test_fuzz_pose(tmp_path, semente, tamanhoBloco):
+    GeradorLogs(semente).EscreverPose(str(tmp_path / 'limpo.txt'), 300)
+    Fuzzar(str(tmp_path / 'limpo.txt'), str(tmp_path / 'log.txt'), semente)
+    poses, countValidos, countTotal = LerPoseOriginal(str(tmp_path / 'log.txt'), heranca=False)
+
+    colunas, countPontosValidos, countPontosTotal = LeitorLogPose(tamanhoBloco).LerFicheiro(str(tmp_path / 'log.txt'))
+    assert (countPontosValidos, countPontosTotal) == (countValidos, countTotal)
+    Iguais(Linhas(colunas), poses)
+
+
+@pytest.mark.parametrize('tamanhoBloco', [8 * 1024 * 1024, 700])
+@pytest.mark.parametrize('semente', range(6))
+def test_fuzz_temperatura(tmp_path, semente, tamanhoBloco):
+    GeradorLogs(semente).EscreverTemperatura(str(tmp_path / 'limpo.txt'), 300)
+    Fuzzar(str(tmp_path / 'limpo.txt'), str(tmp_path / 'log.txt'), semente)
+    temperaturas, countValidos, countTotal = LerTemperaturaOriginal(str(tmp_path / 'log.txt'))
+
+    leitor = LeitorLogTemperatura(tamanhoBloco)
+    colunas, countPontosValidos, countPontosTotal = leitor.LerFicheiro(str(tmp_path / 'log.txt'))
+    assert (countPontosValidos, countPontosTotal) == (countValidos, countTotal)
+    Iguais(Linhas(colunas), temperaturas)
+
+
+def MensagemPose(seq, x=1.5, posicao=None):
+    """Texto de uma mensagem de pose; posicao substitui as linhas da posição."""
+    if posicao is None:
+        posicao = [f"    x: {x}", "    y: 2.5", "    z: 3.5"]
+    return "\n".join([
+        "header: ", f"  seq: {seq}", "  stamp: ", "    secs: 1693405729", "    nsecs: 897180140",
+        "  frame_id: \"map\"", "pose: ", "  position: ", *posicao, "  orientation: ",
+        "    x: 0.0", "    y: 0.0", "    z: 0.0", "    w: 1.0", "---", ""])
+
+
+@pytest.mark.parametrize('posicaoRepetida', [0, 1, 5])
+def test_campo_repetido(tmp_path, posicaoRepetida):
+    # Num campo repetido prevalece o último valor, esteja a mensagem no início do ficheiro
+    # (de onde é inferida a disposição) ou não
+    mensagens = [MensagemPose(seq) for seq in range(8)]
+    mensagens[posicaoRepetida] = MensagemPose(posicaoRepetida, posicao=["    x: 1.0", "    x: 9.0", "    y: 2.5", "    z: 3.5"])
+    pathFile = tmp_path / 'log.txt'
+    pathFile.write_text("".join(mensagens))
+
+    poses, _, _ = LerPoseOriginal(str(pathFile))
+    colunas, countPontosValidos, countPontosTotal = LeitorLogPose().LerFicheiro(str(pathFile))
+    assert (countPontosValidos, countPontosTotal) == (8, 8)
+    assert colunas['posicoes'][posicaoRepetida, 0] == 9.0
+    Iguais(Linhas(colunas), poses)
+
+
+
+@pytest.mark.parametrize('tamanhoBloco', [8 * 1024 * 1024, 300])
+def test_contagens(tmp_path, tamanhoBloco):
+    # Válidas, truncada, sem uma linha, com um valor inválido e com seq/secs fora de int64
+    mensagens = [
+        MensagemPose(0),
+        MensagemPose(1).split("pose:")[0],
+        MensagemPose(2).replace("    y: 2.5\n", ""),
+        MensagemPose(3, x="1.2.3"),
+        MensagemPose(4),
+        MensagemPose(2 ** 63),
+        MensagemPose(6).replace("secs: 1693405729", f"secs: {2 ** 64}"),
+        MensagemPose(7),
+    ]
+    pathFile = tmp_path / 'log.txt'
+    pathFile.write_text("".join(mensagens))
+
+    colunas, countPontosValidos, countPontosTotal = LeitorLogPose(tamanhoBloco).LerFicheiro(str(pathFile))
+    assert (countPontosValidos, countPontosTotal) == (3, 8)
+    assert colunas['seq'].tolist() == [0, 4, 7]
+    # Os leitores originais aceitam inteiros de qualquer tamanho; as colunas são int64
+    poses, countValidos, countTotal = LerPoseOriginal(str(pathFile))
+    assert (countValidos, countTotal) == (5, 8)
+    Iguais(Linhas(colunas), [pose for pose in poses if -2 ** 63 <= pose[0] < 2 ** 63 and pose[1] < 2 ** 63])
+
+
+def test_sem_heranca(tmp_path):
+    # Uma mensagem com o header inválido e a pose completa, seguida de uma mensagem só com o header:
+    # o leitor original junta as duas numa pose, o leitor rápido lê cada mensagem por si
+    mensagens = [MensagemPose(0), MensagemPose(1).replace("seq: 1", "seq: ?"), MensagemPose(2).split("pose:")[0]]
+    pathFile = tmp_path / 'log.txt'
+    pathFile.write_text("".join(mensagens))
+
+    assert LerPoseOriginal(str(pathFile))[1:] == (2, 3)
+    assert LerPoseOriginal(str(pathFile), heranca=False)[1:] == (1, 3)
+    colunas, countPontosValidos, countPontosTotal = LeitorLogPose().LerFicheiro(str(pathFile))
+    assert (countPontosValidos, countPontosTotal) == (1, 3)
+    assert colunas['seq'].tolist() == [0]
+
+
+@pytest.mark.parametrize('classeLeitor, escrever', [(LeitorLogPose, 'EscreverPose'),
+                                                   (LeitorLogTemperatura, 'EscreverTemperatura')])
+def test_processos(tmp_path, monkeypatch, classeLeitor, escrever):
+    pathFile = str(tmp_path / 'log.txt')
+    getattr(GeradorLogs(1, taxaCorrupcao=0.05), escrever)(pathFile, 3000)
+    monkeypatch.setattr(classeLeitor, 'TAMANHO_MINIMO_PARALELO', 64 * 1024)
+
+    leitor = classeLeitor()
+    colunas, countPontosValidos, countPontosTotal = leitor.LerFicheiro(pathFile)
+    with open(pathFile, 'rb') as f:
+        assert len(leitor.Intervalos(f.read(), 4)) == 4
+    colunasParalelo, countValidosParalelo, countTotalParalelo = classeLeitor().LerFicheiro(pathFile, processos=4)
+    assert (countValidosParalelo, countTotalParalelo) == (countPontosValidos, countPontosTotal)
+    Iguais(Linhas(colunasParalelo), Linhas(colunas))
+
+
+MODULOS_COMPRESSAO = {'gzip': gzip, 'bz2': bz2, 'xz': lzma}
+
+
+@pytest.mark.parametrize('compressao', ['gzip', 'bz2', 'xz'])
+@pytest.mark.parametrize('classeLeitor, escrever', [(LeitorLogPose, 'EscreverPose'),
+                                                   (LeitorLogTemperatura, 'EscreverTemperatura')])
+def test_comprimidos(tmp_path, compressao, classeLeitor, escrever):
+    pathFile = str(tmp_path / 'log.txt')
+    getattr(GeradorLogs(2, taxaCorrupcao=0.05), escrever)(pathFile, 2000)
+    with open(pathFile, 'rb') as f:
+        dados = f.read()
+    with MODULOS_COMPRESSAO[compressao].open(pathFile + '.comprimido', 'wb') as f:
+        f.write(dados)
+    assert FicheiroLog.Compressao(pathFile + '.comprimido') == compressao
+
+    colunas, countPontosValidos, countPontosTotal = classeLeitor().LerFicheiro(pathFile)
+    # Pedaços pequenos, para que as mensagens fiquem divididas entre pedaços
+    resultado = classeLeitor(tamanhoBloco=4096).LerFicheiro(pathFile + '.comprimido')
+    assert resultado[1:] == (countPontosValidos, countPontosTotal)
+    Iguais(Linhas(resultado[0]), Linhas(colunas))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))